@@ -40,14 +40,19 @@ st.sidebar.info(f"현재 기준: **{min_mct}분** 이상 ~ **{max_ct}분** 이
 
 @st.cache_data
 def load_data(file):
-    return pd.read_csv(file)
+    df = pd.read_csv(file)
+    # 시간은 로드 시 한 번만 분 단위로 변환 (형식 오류는 <NA>)
+    df['STD_MIN'] = parse_time_column(df['STD'])
+    df['STA_MIN'] = parse_time_column(df['STA'])
+    return df
 
-def time_to_minutes(t_str):
-    try:
-        h, m = map(int, t_str.split(':'))
-        return h * 60 + m
-    except:
-        return None
+def parse_time_column(times):
+    """'HH:MM' 시간 컬럼을 분 단위 정수(Int64)로 일괄 변환. 형식 오류는 <NA> 로 남김"""
+    parts = times.astype(str).str.extract(r'^\s*(\d{1,2}):(\d{1,2})\s*$')
+    hours = pd.to_numeric(parts[0])
+    minutes = pd.to_numeric(parts[1])
+    valid = (hours < 24) & (minutes < 60)
+    return (hours * 60 + minutes).where(valid).astype('Int64')
 
 def analyze_connections(df, min_limit, max_limit):
     results = []
@@ -67,10 +72,10 @@ def analyze_connections(df, min_limit, max_limit):
         if not us_out.empty and not asia_in.empty:
             merged = pd.merge(us_out.assign(k=1), asia_in.assign(k=1), on='k', suffixes=('_ARR', '_DEP'))
             for _, row in merged.iterrows():
-                arr = time_to_minutes(row['STA_ARR'])
-                dep = time_to_minutes(row['STD_DEP'])
+                arr = row['STA_MIN_ARR']
+                dep = row['STD_MIN_DEP']
                 
-                if arr is not None and dep is not None:
+                if pd.notna(arr) and pd.notna(dep):
                     diff = dep - arr
                     if diff < 0: diff += 1440 # 다음날 연결
                     
@@ -95,10 +100,10 @@ def analyze_connections(df, min_limit, max_limit):
         if not asia_out.empty and not us_in.empty:
             merged = pd.merge(asia_out.assign(k=1), us_in.assign(k=1), on='k', suffixes=('_ARR', '_DEP'))
             for _, row in merged.iterrows():
-                arr = time_to_minutes(row['STA_ARR'])
-                dep = time_to_minutes(row['STD_DEP'])
+                arr = row['STA_MIN_ARR']
+                dep = row['STD_MIN_DEP']
                 
-                if arr is not None and dep is not None:
+                if pd.notna(arr) and pd.notna(dep):
                     diff = dep - arr
                     if diff < 0: diff += 1440
                     
@@ -129,6 +134,9 @@ uploaded_file = st.file_uploader("📂 데이터 파일 업로드 (CSV)", type="
 if uploaded_file is not None:
     df = load_data(uploaded_file)
     st.write(f"✅ 파일 로드 완료: 총 {len(df)}개 운항편")
+    invalid_count = int((df['STD_MIN'].isna() | df['STA_MIN'].isna()).sum())
+    if invalid_count:
+        st.warning(f"⚠️ 시간 형식 오류 {invalid_count}건은 분석에서 제외됩니다.")
     
     # 분석 버튼
     if st.button("🚀 분석 시작"):
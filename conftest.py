@@ -0,0 +1 @@
+"""pytest 가 저장소 루트를 sys.path 에 넣도록 두는 파일 (connection_counter 패키지를 설치 없이 import)"""
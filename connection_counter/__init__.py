@@ -0,0 +1,60 @@
+"""여객노선부 연결편 분석 엔진
+
+Streamlit 화면(networkconalver*.py)과 배치/CLI(python -m connection_counter)가 함께 사용한다.
+"""
+from .loader import (
+    load_data, detect_encoding, parse_time_column, unify_categories, find_invalid_times, read_bytes, file_sha256,
+    is_ssim_file, add_weekly_columns, load_ssim, load_xlsx, prepare_schedule, load_mct_rules,
+)
+from .engine import (
+    DEFAULT_HUB, analyze_connections_flexible, find_pairs, expand_pairs, pair_keys, build_pair_table, classify_status,
+    find_window_pairs, count_disconnect_pairs, weekly_pairs,
+)
+from .weekly import is_weekly
+from .mct import MctRules, assign_mct
+from .compare import compare_schedules, compare_flights
+from .pair_cache import PairTableCache, selection_key
+from .hubs import find_hub_pairs, build_hub_pair_table, partition_by_hub
+from .itinerary import (
+    build_itineraries, itinerary_keys, expand_itineraries, transfer_edges, DEFAULT_MAX_CONNECTIONS,
+)
+from .od_index import ODIndex, OD_COLUMNS
+from .detail import DetailView, PAGE_SIZES, DEFAULT_PAGE_SIZE, page_count
+from .cube import SummaryCube, CUBE_KEYS, HIST_BIN_MINUTES
+from .export import (
+    EXPORT_FORMATS, available_formats, export_file_name, format_from_path, frame_chunks, pair_chunks,
+    write_export, export_to_tempfile, remove_export, ExportFiles,
+)
+from .charts import (
+    CHART_MAX_ROWS, TOP_N_COLORS, CONN_BIN_MINUTES, HOUR_BIN, top_n_labels, scatter_points, hour_grid, histogram_bins,
+)
+from .report import (
+    EXCEL_MAX_ROWS, REPORT_MIME, excel_available, write_excel_report, excel_report_to_tempfile,
+    analysis_report_sheets, comparison_report_sheets,
+)
+from .disk_cache import DiskCache, cached_load_data
+from .sweep import sweep_connections, scenario_conn_minutes, ct_range
+from .timeline import ScheduleTimeline
+
+__all__ = [
+    'load_data', 'detect_encoding', 'parse_time_column', 'unify_categories', 'find_invalid_times', 'read_bytes', 'file_sha256',
+    'is_ssim_file', 'DEFAULT_HUB',
+    'analyze_connections_flexible', 'find_pairs', 'expand_pairs', 'pair_keys', 'build_pair_table', 'classify_status',
+    'find_window_pairs', 'count_disconnect_pairs', 'weekly_pairs',
+    'add_weekly_columns', 'is_weekly', 'load_ssim', 'load_xlsx', 'prepare_schedule',
+    'load_mct_rules', 'MctRules', 'assign_mct',
+    'PairTableCache', 'selection_key', 'DiskCache', 'cached_load_data',
+    'find_hub_pairs', 'build_hub_pair_table', 'partition_by_hub',
+    'build_itineraries', 'itinerary_keys', 'expand_itineraries', 'transfer_edges', 'DEFAULT_MAX_CONNECTIONS',
+    'ODIndex', 'OD_COLUMNS', 'DetailView', 'PAGE_SIZES', 'DEFAULT_PAGE_SIZE', 'page_count',
+    'SummaryCube', 'CUBE_KEYS', 'HIST_BIN_MINUTES',
+    'EXPORT_FORMATS', 'available_formats', 'export_file_name', 'format_from_path', 'frame_chunks', 'pair_chunks',
+    'write_export', 'export_to_tempfile', 'remove_export', 'ExportFiles',
+    'CHART_MAX_ROWS', 'TOP_N_COLORS', 'CONN_BIN_MINUTES', 'HOUR_BIN', 'top_n_labels', 'scatter_points', 'hour_grid',
+    'histogram_bins',
+    'EXCEL_MAX_ROWS', 'REPORT_MIME', 'excel_available', 'write_excel_report', 'excel_report_to_tempfile',
+    'analysis_report_sheets', 'comparison_report_sheets',
+    'compare_schedules', 'compare_flights',
+    'sweep_connections', 'scenario_conn_minutes', 'ct_range',
+    'ScheduleTimeline',
+]
@@ -0,0 +1,77 @@
+"""차트용 서버 측 집계
+
+Altair 는 차트 데이터를 행 단위 JSON 으로 브라우저에 보내고 기본 5000 행을 넘으면 그리지 않는다.
+행 수가 CHART_MAX_ROWS 이하이면 필요한 컬럼만 남긴 행을 그대로, 넘으면 구간/격자별 건수로 묶어서 넘긴다.
+색상은 많이 나오는 편명 TOP_N_COLORS 개만 구분하고 나머지는 OTHER_LABEL 로 합친다.
+"""
+import numpy as np
+import pandas as pd
+
+CHART_MAX_ROWS = 5000
+TOP_N_COLORS = 10
+OTHER_LABEL = '기타'
+# 집계 모드 구간: 연결 시간 (분), 허브 도착/출발 시각 (시)
+CONN_BIN_MINUTES = 15
+HOUR_BIN = 0.5
+
+
+def top_n_labels(values, n=TOP_N_COLORS, other=OTHER_LABEL):
+    """가장 많이 나오는 n 개 값만 남기고 나머지는 other 로 바꾼 문자열 Series"""
+    values = values.astype(str)
+    top = values.value_counts().index[:n]
+    return values.where(values.isin(top), other)
+
+
+def scatter_points(data, x, y, color, tooltip=(), y_bin=CONN_BIN_MINUTES, max_rows=CHART_MAX_ROWS, top_n=TOP_N_COLORS):
+    """(x, y) 산점도 데이터와 집계 여부
+
+    행 그대로일 때: x, y, tooltip 컬럼 + Color (color 상위 top_n, 나머지 OTHER_LABEL).
+    행이 max_rows 를 넘으면: (x, y 구간 시작, Color) 별 Count (y 는 y_bin 단위로 내림).
+    묶은 칸도 max_rows 를 넘으면 색상 구분 없이 (x, y 구간) 별로 묶는다 (Color = OTHER_LABEL).
+    """
+    colors = top_n_labels(data[color], top_n)
+    if len(data) <= max_rows:
+        columns = list(dict.fromkeys([x, y, *tooltip]))
+        return data[columns].assign(Color=colors.to_numpy()), False
+    binned = pd.DataFrame({
+        x: data[x].to_numpy(),
+        y: data[y].to_numpy(dtype=np.int64) // y_bin * y_bin,
+        'Color': colors.to_numpy(),
+    })
+    points = binned.groupby([x, y, 'Color'], observed=True).size().rename('Count').reset_index()
+    if len(points) > max_rows:
+        points = binned.groupby([x, y], observed=True).size().rename('Count').reset_index()
+        points['Color'] = OTHER_LABEL
+    return points, True
+
+
+def hour_grid(data, color, tooltip=(), hour_bin=HOUR_BIN, max_rows=CHART_MAX_ROWS, top_n=TOP_N_COLORS):
+    """허브 도착 시각 x 출발 시각 (Arr_Hour, Dep_Hour) 차트 데이터와 집계 여부
+
+    행 그대로일 때는 scatter_points 와 같다. 행이 max_rows 를 넘으면 hour_bin 시간 격자별 Count
+    (Arr_Hour, Dep_Hour 는 칸 시작, Arr_Hour_End, Dep_Hour_End 는 칸 끝) 로 묶는다.
+    """
+    if len(data) <= max_rows:
+        return scatter_points(data, 'Arr_Hour', 'Dep_Hour', color, tooltip, max_rows=max_rows, top_n=top_n)
+    arr = np.floor(data['Arr_Hour'].to_numpy(dtype=np.float64) / hour_bin) * hour_bin
+    dep = np.floor(data['Dep_Hour'].to_numpy(dtype=np.float64) / hour_bin) * hour_bin
+    grid = pd.DataFrame({'Arr_Hour': arr, 'Dep_Hour': dep}).groupby(['Arr_Hour', 'Dep_Hour']).size()
+    grid = grid.rename('Count').reset_index()
+    grid['Arr_Hour_End'] = grid['Arr_Hour'] + hour_bin
+    grid['Dep_Hour_End'] = grid['Dep_Hour'] + hour_bin
+    return grid, True
+
+
+def histogram_bins(values, max_bins=20):
+    """값 분포를 구간별 건수 (Bin_Start, Bin_End, Count) 로. 구간 폭은 1, 2, 5 x 10^k 중 max_bins 이하가 되는 값"""
+    values = pd.Series(values).dropna().to_numpy(dtype=np.float64)
+    if not len(values):
+        return pd.DataFrame({'Bin_Start': [], 'Bin_End': [], 'Count': []})
+    low, high = values.min(), values.max()
+    span = max(high - low, 1.0)
+    magnitude = 10 ** np.floor(np.log10(span / max_bins))
+    # 분 단위 정수 값이므로 구간 폭은 1 이상
+    width = max(next(step * magnitude for step in (1, 2, 5, 10) if span / (step * magnitude) <= max_bins), 1.0)
+    start = np.floor(values / width) * width
+    counts = pd.Series(start).value_counts().sort_index()
+    return pd.DataFrame({'Bin_Start': counts.index, 'Bin_End': counts.index + width, 'Count': counts.to_numpy()})
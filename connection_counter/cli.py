@@ -0,0 +1,239 @@
+"""배치 실행용 CLI
+
+    python -m connection_counter analyze schedule.csv --routes-a 미주노선 --routes-b 동남아노선
+    python -m connection_counter compare before.csv after.csv --routes-a 미주노선 --routes-b 동남아노선 -o out/
+    python -m connection_counter timeline w01.csv w02.csv w03.csv --routes-a 미주노선 --routes-b 동남아노선 -o out/
+    python -m connection_counter analyze schedule.csv --routes-a 미주노선 --routes-b 동남아노선 --hub ICN GMP PUS
+    python -m connection_counter analyze schedule.csv --routes-a 미주노선 --routes-b 동남아노선 --mct-rules mct.csv
+    python -m connection_counter itinerary schedule.ssim --hub ICN GMP PUS --origins JFK --max-connections 2
+"""
+import argparse
+import os
+import sys
+
+from .loader import load_data, load_mct_rules, find_invalid_times, file_sha256
+from .engine import find_pairs
+from .hubs import find_hub_pairs
+from .disk_cache import DiskCache, cached_load_data
+from .pair_cache import PairTableCache
+from .compare import compare_schedules, compare_flights
+from .timeline import ScheduleTimeline
+from .itinerary import DEFAULT_MAX_CONNECTIONS, build_itineraries, expand_itineraries
+from .cube import SummaryCube
+from .export import format_from_path, frame_chunks, pair_chunks, write_export
+from .report import write_excel_report, analysis_report_sheets, comparison_report_sheets
+
+
+def _add_group_args(parser):
+    parser.add_argument('--routes-a', nargs='+', required=True, help='그룹 A 노선 (ROUTE)')
+    parser.add_argument('--ops-a', nargs='+', help='그룹 A 항공사 (기본: 전체)')
+    parser.add_argument('--routes-b', nargs='+', required=True, help='그룹 B 노선 (ROUTE)')
+    parser.add_argument('--ops-b', nargs='+', help='그룹 B 항공사 (기본: 전체)')
+    _add_connection_args(parser)
+
+
+def _add_connection_args(parser):
+    parser.add_argument('--min-ct', type=int, default=60, help='Min CT (분, 기본 60)')
+    parser.add_argument('--max-ct', type=int, default=300, help='Max CT (분, 기본 300)')
+    parser.add_argument('--cache-dir', help='파싱/쌍 테이블 디스크 캐시 폴더 (지정 시 같은 파일은 재계산하지 않음)')
+    parser.add_argument('--hub', nargs='+', default=['ICN'],
+                        help='허브 공항 (기본 ICN). 여러 개면 공항별로 나누어 병렬 분석')
+    parser.add_argument('--mct-rules', help='공항/국내외/항공사별 MCT 규칙 CSV (맞는 규칙이 없는 연결은 --min-ct)')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m connection_counter', description='여객노선부 연결편 분석')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    analyze = sub.add_parser('analyze', help='단일 스케줄 연결 분석')
+    analyze.add_argument('schedule', help='스케줄 CSV, SSIM 또는 Excel (.xlsx) 경로')
+    _add_group_args(analyze)
+    analyze.add_argument('--engine', choices=['matrix', 'window'], default='matrix',
+                         help='matrix: 전체 쌍 / window: MCT 구간 안의 Connected 쌍만')
+    analyze.add_argument('--count-disconnect', action='store_true', help='window 모드에서 Disconnect 건수만 집계')
+    analyze.add_argument('--status', nargs='+', choices=['Connected', 'Disconnect'],
+                         help='저장할 상태 (기본: 전체)')
+    analyze.add_argument('-o', '--output', default='connection_analysis.csv', help='결과 파일 경로 (.csv, .csv.gz, .parquet)')
+    analyze.add_argument('--report', help='요약 표와 연결 리스트를 시트별로 담은 Excel 보고서 (.xlsx) 경로')
+
+    compare = sub.add_parser('compare', help='두 스케줄 비교 분석')
+    compare.add_argument('schedule1', help='스케줄 1 (기준/Before) CSV, SSIM 또는 Excel (.xlsx) 경로')
+    compare.add_argument('schedule2', help='스케줄 2 (비교/After) CSV, SSIM 또는 Excel (.xlsx) 경로')
+    _add_group_args(compare)
+    compare.add_argument('-o', '--output-dir', default='.', help='결과 CSV 저장 폴더')
+    compare.add_argument('--report', help='비교 요약과 변경 상세를 시트별로 담은 Excel 보고서 (.xlsx) 경로')
+
+    timeline = sub.add_parser('timeline', help='여러 스케줄 버전의 연결 변경 타임라인')
+    timeline.add_argument('schedules', nargs='+', help='스케줄 CSV, SSIM 또는 Excel (.xlsx) 경로 (오래된 버전부터 순서대로)')
+    _add_group_args(timeline)
+    timeline.add_argument('-o', '--output-dir', default='.', help='결과 CSV 저장 폴더')
+
+    itinerary = sub.add_parser('itinerary', help='다구간 여정 (허브 환승 최대 K회)')
+    itinerary.add_argument('schedule', help='스케줄 CSV, SSIM 또는 Excel (.xlsx) 경로')
+    _add_connection_args(itinerary)
+    itinerary.add_argument('--max-connections', type=int, default=DEFAULT_MAX_CONNECTIONS,
+                           help=f'최대 환승 횟수 (기본 {DEFAULT_MAX_CONNECTIONS})')
+    itinerary.add_argument('--max-total-conn', type=int, help='환승 대기 합계 상한 (분, 기본: 제한 없음)')
+    itinerary.add_argument('--origins', nargs='+', help='출발 공항 (기본: 전체)')
+    itinerary.add_argument('--destinations', nargs='+', help='최종 도착 공항 (기본: 전체)')
+    itinerary.add_argument('-o', '--output', default='itineraries.csv', help='결과 CSV 경로')
+    return parser
+
+
+def _report_invalid_times(df, label):
+    invalid_times = find_invalid_times(df)
+    if not invalid_times.empty:
+        print(f"[경고] {label}: 시간 형식 오류 {len(invalid_times)}건 (분석 제외)", file=sys.stderr)
+
+
+def _load(path, disk_cache, hub):
+    """(스케줄, 파일 해시). 디스크 캐시가 없으면 캐시 없이 바로 로드"""
+    if disk_cache is None:
+        return load_data(path, hub), file_sha256(path)
+    return cached_load_data(path, disk_cache, hub)
+
+
+def _mct_rules(args):
+    return load_mct_rules(args.mct_rules) if args.mct_rules else None
+
+
+def run_analyze(args):
+    disk_cache = DiskCache(args.cache_dir) if args.cache_dir else None
+    mct_rules = _mct_rules(args)
+    df, schedule_hash = _load(args.schedule, disk_cache, args.hub)
+    _report_invalid_times(df, args.schedule)
+    all_ops = sorted(df['OPS'].unique().tolist())
+    ops_a, ops_b = args.ops_a or all_ops, args.ops_b or all_ops
+
+    if disk_cache is not None and args.engine == 'matrix':
+        pairs = PairTableCache(disk_cache=disk_cache).analyze(
+            df, schedule_hash, args.min_ct, args.max_ct, args.routes_a, ops_a, args.routes_b, ops_b,
+            hub=args.hub, mct_rules=mct_rules
+        )
+    elif len(args.hub) > 1:
+        pairs = find_hub_pairs(
+            df, args.hub, args.min_ct, args.max_ct, args.routes_a, ops_a, args.routes_b, ops_b,
+            engine=args.engine, count_disconnect=args.count_disconnect, mct_rules=mct_rules
+        )
+    else:
+        pairs = find_pairs(
+            df, args.min_ct, args.max_ct, args.routes_a, ops_a, args.routes_b, ops_b,
+            engine=args.engine, count_disconnect=args.count_disconnect, hub=args.hub, mct_rules=mct_rules
+        )
+    if args.status:
+        pairs = pairs[pairs['Status'].isin(args.status)]
+    # 표시 문자열은 청크별로 펼쳐 바로 파일에 씀
+    write_export(pair_chunks(df, pairs), args.output, format_from_path(args.output))
+
+    print(f"{args.schedule}: {len(df)}편, 연결 쌍 {len(pairs)}건 -> {args.output}")
+    cube = SummaryCube(df, pairs)
+    print(cube.counts(['Direction']).to_string())
+    if len(args.hub) > 1:
+        print(cube.counts(['Via']).to_string())
+    if mct_rules is not None:
+        print(cube.counts(['MCT_Rule']).to_string())
+    disconnect_counts = pairs.attrs.get('disconnect_counts')
+    if disconnect_counts:
+        print(f"Disconnect (건수만 집계): {sum(disconnect_counts.values())}건")
+    if args.report:
+        write_excel_report(analysis_report_sheets(df, pairs, cube), args.report)
+        print(f"보고서 저장: {args.report}")
+    return 0
+
+
+def run_compare(args):
+    disk_cache = DiskCache(args.cache_dir) if args.cache_dir else None
+    df1, _ = _load(args.schedule1, disk_cache, args.hub)
+    df2, _ = _load(args.schedule2, disk_cache, args.hub)
+    _report_invalid_times(df1, args.schedule1)
+    _report_invalid_times(df2, args.schedule2)
+    all_ops = sorted(set(df1['OPS'].unique().tolist() + df2['OPS'].unique().tolist()))
+
+    conn_cmp = compare_schedules(
+        df1, df2, args.min_ct, args.max_ct,
+        args.routes_a, args.ops_a or all_ops, args.routes_b, args.ops_b or all_ops,
+        hub=args.hub, mct_rules=_mct_rules(args)
+    )
+    flt_cmp = compare_flights(df1, df2)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    outputs = {
+        'removed_flights.csv': flt_cmp['removed'],
+        'added_flights.csv': flt_cmp['added'],
+        'time_changed_flights.csv': flt_cmp['time_changed'],
+        'lost_connections.csv': conn_cmp['lost_connections'],
+        'new_connections.csv': conn_cmp['new_connections'],
+        'time_changes.csv': conn_cmp['time_changes'],
+    }
+    for name, frame in outputs.items():
+        write_export(frame_chunks(frame), os.path.join(args.output_dir, name), 'csv')
+
+    print(f"항공편: {flt_cmp['stats']}")
+    print(f"연결: {conn_cmp['stats']}")
+    print(f"결과 저장: {os.path.abspath(args.output_dir)}")
+    if args.report:
+        write_excel_report(comparison_report_sheets(conn_cmp, flt_cmp), args.report)
+        print(f"보고서 저장: {args.report}")
+    return 0
+
+
+def run_timeline(args):
+    if len(args.schedules) < 2:
+        raise ValueError("타임라인에는 스케줄 파일이 2개 이상 필요합니다.")
+    disk_cache = DiskCache(args.cache_dir) if args.cache_dir else None
+    versions = []
+    for path in args.schedules:
+        df, schedule_hash = _load(path, disk_cache, args.hub)
+        _report_invalid_times(df, path)
+        versions.append((os.path.basename(path), df, schedule_hash))
+    all_ops = sorted(set().union(*(df['OPS'].unique().tolist() for _, df, _ in versions)))
+
+    timeline = ScheduleTimeline(args.min_ct, args.max_ct,
+                                args.routes_a, args.ops_a or all_ops, args.routes_b, args.ops_b or all_ops,
+                                hub=args.hub, mct_rules=_mct_rules(args))
+    result = timeline.compare(versions)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    outputs = {
+        'timeline_summary.csv': result['summary'],
+        'timeline_changes.csv': result['changes'],
+        'timeline_time_changes.csv': result['time_changes'],
+    }
+    for name, frame in outputs.items():
+        write_export(frame_chunks(frame), os.path.join(args.output_dir, name), 'csv')
+
+    print(result['summary'].to_string(index=False))
+    print(f"결과 저장: {os.path.abspath(args.output_dir)}")
+    return 0
+
+
+def run_itinerary(args):
+    disk_cache = DiskCache(args.cache_dir) if args.cache_dir else None
+    df, _ = _load(args.schedule, disk_cache, args.hub)
+    _report_invalid_times(df, args.schedule)
+
+    itineraries = build_itineraries(
+        df, args.hub, args.max_connections, args.min_ct, args.max_ct, max_total_conn=args.max_total_conn,
+        mct_rules=_mct_rules(args), origins=args.origins, destinations=args.destinations
+    )
+    result_df = expand_itineraries(df, itineraries)
+    write_export(frame_chunks(result_df), args.output, 'csv')
+
+    print(f"{args.schedule}: {len(df)}편, 여정 {len(result_df)}건 -> {args.output}")
+    print(result_df.groupby(['Via', 'Connections'], observed=True).size().unstack(fill_value=0).to_string())
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command == 'analyze':
+            return run_analyze(args)
+        if args.command == 'timeline':
+            return run_timeline(args)
+        if args.command == 'itinerary':
+            return run_itinerary(args)
+        return run_compare(args)
+    except (OSError, ValueError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 1
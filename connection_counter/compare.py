@@ -0,0 +1,278 @@
+"""두 스케줄 비교 (연결 변경 / 항공편 변경)"""
+import numpy as np
+import pandas as pd
+
+from .loader import unify_categories, add_weekly_columns
+from .engine import DEFAULT_HUB, find_pairs, expand_pairs
+from .weekly import WEEKLY_COLUMNS, is_weekly
+
+# 같은 항공편을 식별하는 컬럼 조합 (연결은 도착편 편명/출발지 + 출발편 편명/도착지)
+FLIGHT_KEY_COLUMNS = ['OPS', 'FLT NO', 'ORGN', 'DEST']
+# 연결 생성에 영향을 주는 컬럼 (이 값이 모두 같은 행은 두 스케줄에서 같은 연결을 만든다)
+SIGNATURE_COLUMNS = ['OPS', 'FLT NO', 'ORGN', 'DEST', 'ROUTE', '구분', 'STD', 'STA', 'STD_MIN', 'STA_MIN']
+# 도착편/출발편 해시를 한 연결 해시로 섞는 상수 (순서가 바뀌면 다른 값)
+_HASH_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def key_hash(frame, columns):
+    """컬럼 조합의 64비트 해시 (행마다 문자열 키를 만드는 대신 집합 연산/조인에 사용)"""
+    if frame.empty:
+        return pd.Index([], dtype='uint64')
+    return pd.Index(pd.util.hash_pandas_object(frame[columns], index=False).to_numpy())
+
+
+def _flight_numbers(df):
+    return df['OPS'].astype(str) + df['FLT NO'].astype(str)
+
+
+def _side_hashes(df):
+    """행별 연결 키의 도착편 쪽 (편명+출발지) / 출발편 쪽 (편명+도착지) 해시"""
+    flt_no = _flight_numbers(df)
+    in_hash = key_hash(pd.DataFrame({'FLT': flt_no, 'AIRPORT': df['ORGN']}), ['FLT', 'AIRPORT']).to_numpy()
+    out_hash = key_hash(pd.DataFrame({'FLT': flt_no, 'AIRPORT': df['DEST']}), ['FLT', 'AIRPORT']).to_numpy()
+    return in_hash, out_hash
+
+
+def connection_hash(df, pairs):
+    """압축 쌍 테이블의 연결 해시 (도착편 편명+출발지, 출발편 편명+도착지). 해시는 항공편 단위로 한 번만 계산"""
+    in_hash, out_hash = _side_hashes(df)
+    in_rows = pairs['In_Row'].to_numpy()
+    out_rows = pairs['Out_Row'].to_numpy()
+    if len(in_rows) == 0:
+        return pd.Index([], dtype='uint64')
+    return pd.Index((in_hash[in_rows] * _HASH_MIX) ^ out_hash[out_rows])
+
+
+def connection_key(df, pairs):
+    """화면/CSV 용 연결 키 문자열 ('편명_편명_출발지_도착지'). 출력할 행에만 생성"""
+    flt_no = _flight_numbers(df).to_numpy()
+    in_rows = pairs['In_Row'].to_numpy()
+    out_rows = pairs['Out_Row'].to_numpy()
+    return pd.Series(flt_no[in_rows], index=pairs.index) + '_' + flt_no[out_rows] + '_' \
+        + df['ORGN'].astype(str).to_numpy()[in_rows] + '_' + df['DEST'].astype(str).to_numpy()[out_rows]
+
+
+def flight_key(frame):
+    """화면/CSV 용 항공편 키 문자열 ('OPS편명_출발지_도착지'). 출력할 행에만 생성"""
+    return _flight_numbers(frame) + '_' + frame['ORGN'].astype(str) + '_' + frame['DEST'].astype(str)
+
+
+def _touched_sides(side1, sig1, side2, sig2):
+    """연결 키 한쪽 (side) 별로 행 구성 (signature 다중집합) 이 달라진 side 해시 목록"""
+    counts1 = pd.DataFrame({'side': side1, 'sig': sig1}).value_counts()
+    counts2 = pd.DataFrame({'side': side2, 'sig': sig2}).value_counts()
+    diff = counts1.sub(counts2, fill_value=0)
+    return pd.Index(diff[diff != 0].index.get_level_values('side')).unique()
+
+
+def _row_map(sig1, sig2):
+    """스케줄1 행 -> 같은 signature 를 가진 스케줄2 행 위치 (같은 값이 여러 행이면 등장 순서로 대응, 없으면 -1)"""
+    left = pd.DataFrame({'sig': sig1})
+    left['occ'] = left.groupby('sig').cumcount()
+    right = pd.DataFrame({'sig': sig2})
+    right['occ'] = right.groupby('sig').cumcount()
+    right['row2'] = np.arange(len(right))
+    mapped = left.merge(right, on=['sig', 'occ'], how='left')['row2']
+    return mapped.fillna(-1).to_numpy(dtype=np.int64)
+
+
+def schedule_delta(df1, df2):
+    """두 스케줄 사이에 바뀐 항공편을 연결 키 단위로 표시
+
+    삭제/신규/시간 변경 항공편 (compare_flights) 뿐 아니라 노선/구분 변경, 같은 편명 중복 행의 증감까지
+    포함하도록 SIGNATURE_COLUMNS 다중집합이 달라진 (편명+출발지) / (편명+도착지) 를 변경으로 본다.
+    반환 dict: touched1/touched2 (스케줄별 (도착편 마스크, 출발편 마스크)), row_map (스케줄1 -> 스케줄2 행 위치)
+    """
+    columns = SIGNATURE_COLUMNS + (WEEKLY_COLUMNS if is_weekly(df1) and is_weekly(df2) else [])
+    sig1 = key_hash(df1, columns).to_numpy()
+    sig2 = key_hash(df2, columns).to_numpy()
+    in1, out1 = _side_hashes(df1)
+    in2, out2 = _side_hashes(df2)
+    touched_in = _touched_sides(in1, sig1, in2, sig2)
+    touched_out = _touched_sides(out1, sig1, out2, sig2)
+    return {
+        'touched1': (pd.Index(in1).isin(touched_in), pd.Index(out1).isin(touched_out)),
+        'touched2': (pd.Index(in2).isin(touched_in), pd.Index(out2).isin(touched_out)),
+        'row_map': _row_map(sig1, sig2),
+    }
+
+
+def _changed_connections(df, pairs, change_type):
+    changed = expand_pairs(df, pairs)
+    changed['Connection_Key'] = connection_key(df, pairs)
+    changed['Change_Type'] = change_type
+    return changed
+
+
+def _connection_times(df, pairs, suffix, with_key=False):
+    """연결 해시별 연결 시간/도착/출발 시각. with_key 면 Connection_Key 문자열도 (pairs 의 행 위치는 df 기준)"""
+    in_rows = pairs['In_Row'].to_numpy()
+    out_rows = pairs['Out_Row'].to_numpy()
+    times = pd.DataFrame({
+        'Connection_Hash': pairs['Connection_Hash'].to_numpy(),
+        f'Conn_Min_{suffix}': pairs['Conn_Min'].to_numpy(dtype=np.int64),
+        f'Arr_Time_{suffix}': df['STA'].to_numpy()[in_rows],
+        f'Dep_Time_{suffix}': df['STD'].to_numpy()[out_rows],
+    })
+    if with_key:
+        times.insert(0, 'Connection_Key', connection_key(df, pairs).to_numpy())
+    return times
+
+
+def compare_schedules(df1, df2, min_limit, max_limit, 
+                      group_a_routes, group_a_ops, 
+                      group_b_routes, group_b_ops,
+                      pairs1=None, hub=DEFAULT_HUB, mct_rules=None):
+    """두 스케줄의 연결 분석 결과를 비교
+
+    스케줄2 는 전체를 다시 분석하지 않고, schedule_delta 로 찾은 변경 항공편이 포함된 연결만 새로 계산한 뒤
+    나머지는 스케줄1 의 연결을 그대로 (스케줄2 행 위치로 바꿔) 사용한다.
+    pairs1 에 스케줄1 의 window 압축 쌍 테이블을 주면 (예: 이전 비교의 pairs2) 스케줄1 분석도 생략한다.
+    pairs1/pairs2 는 각 스케줄의 압축 쌍 테이블 (Connection_Hash 포함) 이며,
+    결과 컬럼과 Connection_Key 문자열은 사라진/새로운/시간 변경 연결에만 만든다.
+    mct_rules (MctRules) 를 주면 두 스케줄 모두 쌍별 규칙 MCT 로 연결을 판정한다.
+    """
+    df1, df2 = unify_categories(df1, df2)
+    # 한쪽만 운항 요일/기간 정보가 있거나 pairs1 이 주간 쌍 (Days) 이면 주간 정보가 없는 쪽을 매일 운항으로 채워
+    # 같은 주간 기준으로 비교 (타임라인에서 주간 버전 뒤에 매일 운항 버전만 이어지는 경우)
+    weekly = is_weekly(df1) or is_weekly(df2) or (pairs1 is not None and 'Days' in pairs1.columns)
+    for df in (df1, df2):
+        if weekly and not is_weekly(df):
+            add_weekly_columns(df)
+    # 매일 기준으로 만든 pairs1 은 주간 비교에 쓸 수 없으므로 스케줄1 을 다시 분석
+    if weekly and pairs1 is not None and 'Days' not in pairs1.columns:
+        pairs1 = None
+
+    # 스케줄1 분석 (비교는 Connected 쌍만 사용하므로 MCT 구간 탐색으로 충분)
+    if pairs1 is None:
+        pairs1 = find_pairs(df1, min_limit, max_limit, 
+                            group_a_routes, group_a_ops, 
+                            group_b_routes, group_b_ops,
+                            engine='window', hub=hub, mct_rules=mct_rules)
+    else:
+        pairs1 = pairs1[pairs1['Status'] == 'Connected'].copy()
+    if 'Connection_Hash' not in pairs1.columns:
+        pairs1['Connection_Hash'] = connection_hash(df1, pairs1)
+
+    # 스케줄2: 변경 항공편이 포함된 연결만 재계산하고 나머지는 스케줄1 연결을 재사용
+    delta = schedule_delta(df1, df2)
+    touched_in1, touched_out1 = delta['touched1']
+    affected_mask = touched_in1[pairs1['In_Row'].to_numpy()] | touched_out1[pairs1['Out_Row'].to_numpy()]
+    affected = pairs1[affected_mask]
+    kept = pairs1[~affected_mask].copy()
+    kept['In_Row'] = delta['row_map'][kept['In_Row'].to_numpy()].astype(np.int32)
+    kept['Out_Row'] = delta['row_map'][kept['Out_Row'].to_numpy()].astype(np.int32)
+
+    recomputed = find_pairs(df2, min_limit, max_limit, 
+                            group_a_routes, group_a_ops, 
+                            group_b_routes, group_b_ops,
+                            engine='window', touched=delta['touched2'], hub=hub, mct_rules=mct_rules)
+    recomputed['Connection_Hash'] = connection_hash(df2, recomputed)
+    pairs2 = pd.concat([kept, recomputed], ignore_index=True)
+
+    # 차이 분석 (해시 인덱스 집합 연산). 재사용한 연결은 양쪽에 똑같이 있으므로 변경분끼리만 비교
+    affected1 = pd.Index(affected['Connection_Hash']).unique()
+    affected2 = pd.Index(recomputed['Connection_Hash']).unique()
+    kept_counts = kept['Connection_Hash'].value_counts(sort=False)
+    total_conn_1 = len(kept_counts) + len(affected1)
+    total_conn_2 = total_conn_1 - len(affected1) + len(affected2)
+    only_in_1 = affected1.difference(affected2)  # 스케줄1에만 있는 연결
+    only_in_2 = affected2.difference(affected1)  # 스케줄2에만 있는 연결
+    common_affected = affected1.intersection(affected2)
+
+    # 상세 데이터프레임 생성 (변경된 연결만 결과 컬럼으로 펼침)
+    lost_connections = _changed_connections(
+        df1, affected[affected['Connection_Hash'].isin(only_in_1)], '🔴 스케줄2에서 사라짐')
+    new_connections = _changed_connections(
+        df2, recomputed[recomputed['Connection_Hash'].isin(only_in_2)], '🟢 스케줄2에서 새로 생김')
+
+    # 공통 연결의 시간 변화 분석 (해시 키로 조인): 재계산한 연결끼리 + 재사용 연결 중 같은 키가 여러 행인 경우
+    repeated_hashes = kept_counts.index[kept_counts.to_numpy() > 1]
+    repeated = kept[kept['Connection_Hash'].isin(repeated_hashes)] if len(repeated_hashes) else kept.iloc[:0]
+    # 재사용 연결 (repeated) 의 행 위치는 스케줄2 기준이므로 키 문자열도 각 쌍의 스케줄에서 만든 뒤 합침
+    common_df1 = pd.concat([
+        _connection_times(df1, affected[affected['Connection_Hash'].isin(common_affected)], 1, with_key=True),
+        _connection_times(df2, repeated, 1, with_key=True),
+    ], ignore_index=True)
+    common_df2 = pd.concat([
+        _connection_times(df2, recomputed[recomputed['Connection_Hash'].isin(common_affected)], 2),
+        _connection_times(df2, repeated, 2),
+    ], ignore_index=True)
+
+    time_changes = pd.merge(common_df1, common_df2, on='Connection_Hash')
+    time_changes['Time_Diff'] = time_changes['Conn_Min_2'] - time_changes['Conn_Min_1']
+    time_changes = time_changes[time_changes['Time_Diff'] != 0]  # 변화 있는 것만
+    time_changes = time_changes.drop(columns='Connection_Hash')
+
+    return {
+        'pairs1': pairs1,
+        'pairs2': pairs2,
+        'lost_connections': lost_connections,
+        'new_connections': new_connections,
+        'time_changes': time_changes,
+        'stats': {
+            'total_conn_1': total_conn_1,
+            'total_conn_2': total_conn_2,
+            'lost': len(only_in_1),
+            'new': len(only_in_2),
+            'common': total_conn_1 - len(only_in_1),
+            'time_changed': len(time_changes)
+        }
+    }
+
+
+def compare_flights(df1, df2):
+    """두 스케줄의 항공편 자체를 비교 (FLIGHT_KEY_COLUMNS 해시로 식별, Flight_Key 문자열은 결과 행에만 생성)"""
+
+    # 두 스케줄이 같은 category 사전을 쓰도록 맞춘 사본 (병합/비교가 코드 단위로 동작)
+    df1_copy, df2_copy = unify_categories(df1, df2)
+
+    hash1 = key_hash(df1_copy, FLIGHT_KEY_COLUMNS)
+    hash2 = key_hash(df2_copy, FLIGHT_KEY_COLUMNS)
+
+    flights1 = hash1.unique()
+    flights2 = hash2.unique()
+
+    only_in_1 = flights1.difference(flights2)
+    only_in_2 = flights2.difference(flights1)
+    common = flights1.intersection(flights2)
+
+    # 삭제된 항공편
+    removed_flights = df1_copy[hash1.isin(only_in_1)].copy()
+    removed_flights['Flight_Key'] = flight_key(removed_flights)
+    removed_flights['Change_Type'] = '🔴 삭제됨'
+
+    # 신규 항공편
+    added_flights = df2_copy[hash2.isin(only_in_2)].copy()
+    added_flights['Flight_Key'] = flight_key(added_flights)
+    added_flights['Change_Type'] = '🟢 신규'
+
+    # 시간 변경된 항공편
+    common_df1 = df1_copy[hash1.isin(common)][['STD', 'STA', 'STD_MIN', 'STA_MIN', 'OPS', 'FLT NO', 'ORGN', 'DEST', 'ROUTE', '구분']]
+    common_df1.insert(0, 'Flight_Hash', hash1[hash1.isin(common)])
+    common_df2 = df2_copy[hash2.isin(common)][['STD', 'STA', 'STD_MIN', 'STA_MIN']]
+    common_df2.insert(0, 'Flight_Hash', hash2[hash2.isin(common)])
+
+    merged = pd.merge(common_df1, common_df2, on='Flight_Hash', suffixes=('_OLD', '_NEW'))
+    # 분 단위 값으로 비교 ('9:05' 와 '09:05' 는 같은 시간), 형식 오류 시간만 원문으로 비교
+    std_changed = (merged['STD_MIN_OLD'] != merged['STD_MIN_NEW']).fillna(
+        merged['STD_OLD'].fillna('').astype(str).str.strip() != merged['STD_NEW'].fillna('').astype(str).str.strip())
+    sta_changed = (merged['STA_MIN_OLD'] != merged['STA_MIN_NEW']).fillna(
+        merged['STA_OLD'].fillna('').astype(str).str.strip() != merged['STA_NEW'].fillna('').astype(str).str.strip())
+    time_changed = merged[std_changed | sta_changed].drop(columns='Flight_Hash')
+    time_changed.insert(0, 'Flight_Key', flight_key(time_changed))
+    time_changed['Change_Type'] = '🟡 시간 변경'
+
+    return {
+        'removed': removed_flights,
+        'added': added_flights,
+        'time_changed': time_changed,
+        'stats': {
+            'total_1': len(flights1),
+            'total_2': len(flights2),
+            'removed': len(only_in_1),
+            'added': len(only_in_2),
+            'common': len(common),
+            'time_changed': len(time_changed)
+        }
+    }
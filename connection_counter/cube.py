@@ -0,0 +1,109 @@
+"""요약 큐브: 압축 쌍 테이블을 (방향, 노선/항공사, 허브, MCT 규칙, Status) 칸별 집계로 한 번에 줄인 것
+
+요약 표/차트는 상세 쌍 대신 큐브 칸 (수천 행 이하) 을 다시 묶어서 만든다.
+칸별 값: 쌍 수 (Count), Conn_Min 합계/최소/최대, HIST_BIN_MINUTES 분 단위 Conn_Min 히스토그램.
+"""
+import numpy as np
+import pandas as pd
+
+from .engine import STATUS_DTYPE
+
+CUBE_KEYS = ['Direction', 'Inbound_Route', 'Inbound_OPS', 'Outbound_Route', 'Outbound_OPS', 'Via', 'MCT_Rule', 'Status']
+CUBE_MEASURES = ['Count', 'Sum_Conn', 'Min_Conn', 'Max_Conn']
+# disconnect_counts (window 모드의 Disconnect 건수) 의 키
+DISCONNECT_KEYS = ['Direction', 'Inbound_Route', 'Inbound_OPS', 'Outbound_Route', 'Outbound_OPS']
+HIST_BIN_MINUTES = 30
+
+
+def _key_codes(df, pairs):
+    """큐브 키별 (정수 코드, 라벨). 노선/항공사/허브는 스케줄 컬럼 코드를 쌍의 행 위치로 가져옴"""
+    in_rows = pairs['In_Row'].to_numpy()
+    out_rows = pairs['Out_Row'].to_numpy()
+    columns = {}
+    for name, column, rows in [('Inbound_Route', 'ROUTE', in_rows), ('Inbound_OPS', 'OPS', in_rows),
+                               ('Outbound_Route', 'ROUTE', out_rows), ('Outbound_OPS', 'OPS', out_rows),
+                               ('Via', 'DEST', in_rows)]:
+        codes, labels = pd.factorize(df[column].to_numpy(dtype=object))
+        columns[name] = (codes[rows].astype(np.int64), labels)
+    for name in ['Direction', 'MCT_Rule', 'Status']:
+        if name in pairs.columns:
+            values = pairs[name].astype('category')
+            columns[name] = (values.cat.codes.to_numpy(dtype=np.int64), values.cat.categories)
+    return {name: columns[name] for name in CUBE_KEYS if name in columns}
+
+
+class SummaryCube:
+    """압축 쌍 테이블 (Status 포함) 의 칸별 집계
+
+    키를 혼합 진법 정수 하나로 묶어 칸 번호로 바꾼 뒤 (해시, 정렬 없음) bincount 로 쌍 수/합계/히스토그램을,
+    ufunc.at 으로 최소/최대를 구한다. window 모드의 Disconnect 건수 (attrs['disconnect_counts']) 는
+    노선/항공사 키로만 집계되어 있으므로 DISCONNECT_KEYS 안에서 묶을 때 Disconnect 열로 쓴다.
+    """
+
+    def __init__(self, df, pairs, bin_minutes=HIST_BIN_MINUTES):
+        codes = _key_codes(df, pairs)
+        self.keys = list(codes)
+        self.bin_minutes = bin_minutes
+        conn = pairs['Conn_Min'].to_numpy(dtype=np.int64)
+
+        # 코드 -1 (결측) 도 한 값으로 묶도록 +1 해서 자리값을 매김
+        key = np.zeros(len(pairs), dtype=np.int64)
+        for values, labels in codes.values():
+            key = key * (len(labels) + 1) + values + 1
+        cell, cell_keys = pd.factorize(key)
+        n_cells = len(cell_keys)
+
+        cells = {}
+        for name, (values, labels) in reversed(codes.items()):
+            cells[name] = pd.Categorical.from_codes(cell_keys % (len(labels) + 1) - 1, categories=labels)
+            cell_keys = cell_keys // (len(labels) + 1)
+        self.cells = pd.DataFrame(cells, columns=self.keys)
+        self.cells['Count'] = np.bincount(cell, minlength=n_cells)
+        self.cells['Sum_Conn'] = np.bincount(cell, weights=conn, minlength=n_cells).astype(np.int64)
+        low = np.full(n_cells, np.iinfo(np.int64).max)
+        high = np.full(n_cells, np.iinfo(np.int64).min)
+        np.minimum.at(low, cell, conn)
+        np.maximum.at(high, cell, conn)
+        self.cells['Min_Conn'] = low
+        self.cells['Max_Conn'] = high
+
+        bins = np.maximum(conn, 0) // bin_minutes
+        n_bins = int(bins.max()) + 1 if len(bins) else 0
+        self.hist = np.bincount(cell * n_bins + bins, minlength=n_cells * n_bins).reshape(n_cells, n_bins)
+
+        counts = pairs.attrs.get('disconnect_counts')
+        self.disconnect_counts = pd.Series(counts or {}, dtype='int64')
+        if counts:
+            self.disconnect_counts.index.names = DISCONNECT_KEYS
+
+    def counts(self, by):
+        """by 별 Status (Connected / Disconnect) 쌍 수 표"""
+        by = [name for name in by if name in self.keys]
+        table = self.cells.groupby(by + ['Status'], observed=True)['Count'].sum().unstack(fill_value=0)
+        table = table.reindex(columns=STATUS_DTYPE.categories, fill_value=0)
+        table.columns = list(STATUS_DTYPE.categories)
+        if not self.disconnect_counts.empty and set(by) <= set(DISCONNECT_KEYS):
+            table = table.drop(columns='Disconnect').join(
+                self.disconnect_counts.groupby(level=by).sum().rename('Disconnect'), how='outer'
+            ).fillna(0).astype('int64')
+        return table
+
+    def conn_stats(self, by, status='Connected'):
+        """by 별 status 쌍의 쌍 수, 평균/최소/최대 Conn_Min"""
+        cells = self.cells[(self.cells['Status'] == status).to_numpy()]
+        stats = cells.groupby(by, observed=True).agg(
+            Count=('Count', 'sum'), Sum_Conn=('Sum_Conn', 'sum'), Min_Conn=('Min_Conn', 'min'),
+            Max_Conn=('Max_Conn', 'max'))
+        stats.insert(1, 'Mean_Conn', stats.pop('Sum_Conn') / stats['Count'])
+        return stats
+
+    def histogram(self, by, status='Connected'):
+        """by 별 Conn_Min 분포 (긴 형식: by..., Bin_Start (분), Count). 빈 구간은 제외"""
+        mask = (self.cells['Status'] == status).to_numpy()
+        grouped = pd.DataFrame(self.hist[mask]).groupby(
+            [self.cells[name].to_numpy()[mask] for name in by], observed=True).sum()
+        grouped.index.names = by
+        grouped.columns = grouped.columns * self.bin_minutes
+        long = grouped.stack().rename('Count').reset_index()
+        long = long.rename(columns={long.columns[len(by)]: 'Bin_Start'})
+        return long[long['Count'] > 0].reset_index(drop=True)
@@ -0,0 +1,146 @@
+"""상세 연결 리스트 페이지 뷰
+
+필터 (Status, 방향, 연결 시간 구간, 검색어) 와 정렬을 압축 쌍 테이블의 정수 배열로 처리하고,
+화면에는 선택된 페이지의 쌍만 expand_pairs 로 펼쳐서 보낸다.
+정렬 순서는 정렬 기준마다 한 번 만들어 두고, 필터는 그 순서를 마스크로 거르기만 한다.
+"""
+import numpy as np
+import pandas as pd
+
+from .engine import expand_pairs
+
+PAGE_SIZES = [50, 100, 500, 1000]
+DEFAULT_PAGE_SIZE = 100
+# 정렬 기준 컬럼 -> (스케줄 컬럼, 쌍의 행 위치 컬럼). Direction, Conn_Min, Status 는 쌍 테이블 컬럼
+SORT_COLUMNS = {
+    'Direction': None,
+    'Conn_Min': None,
+    'Inbound_Flt_No': ('FLT_LABEL', 'In_Row'),
+    'Outbound_Flt_No': ('FLT_LABEL', 'Out_Row'),
+    'From': ('ORGN', 'In_Row'),
+    'Via': ('DEST', 'In_Row'),
+    'To': ('DEST', 'Out_Row'),
+    'Inbound_Route': ('ROUTE', 'In_Row'),
+    'Outbound_Route': ('ROUTE', 'Out_Row'),
+    'Inbound_OPS': ('OPS', 'In_Row'),
+    'Outbound_OPS': ('OPS', 'Out_Row'),
+    'Hub_Arr_Time': ('STA_MIN', 'In_Row'),
+    'Hub_Dep_Time': ('STD_MIN', 'Out_Row'),
+    'Status': None,
+}
+
+
+def page_count(n_rows, page_size):
+    """n_rows 행을 page_size 행씩 나눈 페이지 수 (빈 결과도 1 페이지)"""
+    return max(-(-n_rows // page_size), 1)
+
+
+def _rank(values):
+    """값 순위 코드 (정렬된 고유값 기준, 결측은 -1)"""
+    return pd.factorize(values, sort=True)[0].astype(np.int64)
+
+
+class DetailView:
+    """압축 쌍 테이블 (Status 포함) 의 필터/정렬/페이지 조회
+
+    select 는 조건에 맞는 쌍의 위치 배열을 정렬 순서대로 돌려주고 (마지막 조건의 결과는 보관해서
+    페이지만 바뀐 재실행에서는 다시 계산하지 않음), page 는 그중 한 페이지만 결과 컬럼으로 펼친다.
+    검색어는 스케줄 행 (편명, 출발/도착 공항, 노선, 항공사) 에서 한 번 찾고 쌍의 In_Row/Out_Row 로 옮긴다.
+    """
+
+    def __init__(self, df, pairs):
+        self.df = df
+        self.pairs = pairs
+        self.in_rows = pairs['In_Row'].to_numpy()
+        self.out_rows = pairs['Out_Row'].to_numpy()
+        self.conn = pairs['Conn_Min'].to_numpy(dtype=np.int64)
+        direction = pairs['Direction'].astype('category')
+        self.directions = list(direction.cat.categories)
+        self._direction = direction.cat.codes.to_numpy(dtype=np.int64)
+        available = set(pairs.columns) | set(df.columns) | {'FLT_LABEL'}
+        self.sort_columns = [name for name, source in SORT_COLUMNS.items()
+                             if (name if source is None else source[0]) in available]
+        self._orders = {}
+        self._search_text = None
+        self._last = (None, None)
+
+    @property
+    def conn_bounds(self):
+        """Conn_Min (최소, 최대). 쌍이 없으면 (0, 0)"""
+        return (int(self.conn.min()), int(self.conn.max())) if len(self.conn) else (0, 0)
+
+    def _sort_key(self, column):
+        source = SORT_COLUMNS[column]
+        if column == 'Direction':
+            return self._direction
+        if column == 'Conn_Min':
+            return self.conn
+        if source is None:
+            return self.pairs[column].astype('category').cat.codes.to_numpy(dtype=np.int64)
+        name, rows = source
+        if name == 'FLT_LABEL':
+            values = self.df['OPS'].astype(str) + self.df['FLT NO'].astype(str)
+        else:
+            values = self.df[name]
+        return _rank(values)[self.pairs[rows].to_numpy()]
+
+    def order(self, column='Direction', descending=False):
+        """column 순 쌍 위치 (같은 값은 방향, 연결 시간, 원래 순서). 기준별로 한 번만 정렬
+
+        (기준, 방향, 연결 시간) 을 혼합 진법 정수 하나로 묶어 안정 정렬 한 번으로 처리한다 (lexsort 보다 빠름).
+        묶은 값이 16비트에 들어가면 (기본 정렬 등) numpy 가 기수 정렬을 쓰도록 작은 타입으로 바꾼다.
+        """
+        cache_key = (column, descending)
+        if cache_key not in self._orders:
+            key = self._sort_key(column)
+            if len(key):
+                key = key.max() - key if descending else key - key.min()
+            conn = self.conn - self.conn.min() if len(self.conn) else self.conn
+            span = int(conn.max()) + 1 if len(conn) else 1
+            composite = (key * (len(self.directions) + 1) + self._direction) * span + conn
+            if len(composite) and composite.max() <= np.iinfo(np.uint16).max:
+                composite = composite.astype(np.uint16)
+            self._orders[cache_key] = np.argsort(composite, kind='stable')
+        return self._orders[cache_key]
+
+    def _search_mask(self, search):
+        """공백으로 나눈 검색어가 모두 도착편 또는 출발편 (편명/공항/노선/항공사) 에 들어 있는 쌍"""
+        if self._search_text is None:
+            df = self.df
+            self._search_text = (df['OPS'].astype(str) + df['FLT NO'].astype(str) + ' ' + df['ORGN'].astype(str)
+                                 + ' ' + df['DEST'].astype(str) + ' ' + df['ROUTE'].astype(str)).str.upper()
+        mask = np.ones(len(self.pairs), dtype=bool)
+        for term in search.upper().split():
+            hit = self._search_text.str.contains(term, regex=False).to_numpy(dtype=bool)
+            mask &= hit[self.in_rows] | hit[self.out_rows]
+        return mask
+
+    def select(self, status=None, directions=None, conn_range=None, search='', sort='Direction', descending=False):
+        """조건에 맞는 쌍 위치 배열 (sort 순). None/빈 검색어인 조건은 적용하지 않음"""
+        key = (tuple(status) if status is not None else None, tuple(directions) if directions is not None else None,
+               tuple(conn_range) if conn_range is not None else None, search.strip(), sort, descending)
+        if self._last[0] == key:
+            return self._last[1]
+
+        mask = np.ones(len(self.pairs), dtype=bool)
+        if status is not None and 'Status' in self.pairs.columns:
+            mask &= self.pairs['Status'].isin(status).to_numpy(dtype=bool)
+        if directions is not None:
+            mask &= np.isin(self._direction, [self.directions.index(d) for d in directions if d in self.directions])
+        if conn_range is not None:
+            mask &= (self.conn >= conn_range[0]) & (self.conn <= conn_range[1])
+        if search.strip():
+            mask &= self._search_mask(search)
+        order = self.order(sort, descending)
+        selection = order[mask[order]]
+        self._last = (key, selection)
+        return selection
+
+    def selected_pairs(self, selection):
+        """선택된 쌍의 압축 테이블 (내보내기용)"""
+        return self.pairs.iloc[selection]
+
+    def page(self, selection, page_no, page_size=DEFAULT_PAGE_SIZE):
+        """selection 의 page_no (1 부터) 페이지만 결과 컬럼으로 펼친 DataFrame"""
+        start = (page_no - 1) * page_size
+        return expand_pairs(self.df, self.pairs.iloc[selection[start:start + page_size]])
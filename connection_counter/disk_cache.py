@@ -0,0 +1,103 @@
+"""파일 내용(SHA-256) 기반 디스크 캐시
+
+같은 스케줄 파일을 다시 올리면 (다른 사용자, 서버 재시작 후에도) 파싱과 쌍 생성을 건너뛴다.
+결과는 Parquet 파일로 저장하며 전체 크기가 max_bytes 를 넘으면 가장 오래 사용하지 않은 파일부터 삭제한다.
+"""
+import hashlib
+import json
+import os
+import uuid
+
+import pandas as pd
+
+from .engine import DEFAULT_HUB, hub_airports
+from .loader import load_data, read_bytes
+from .ssim import SSIM_SNIFF_BYTES, is_ssim
+
+# 캐시 형식이 바뀌면 값을 올려 이전 파일을 무시
+CACHE_VERSION = 4
+DEFAULT_CACHE_DIR = os.environ.get(
+    'CONNECTION_COUNTER_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'connection_counter')
+)
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+
+class DiskCache:
+    """키 -> Parquet 파일. 읽을 때 수정 시각을 갱신하여 LRU 순서로 사용"""
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(kind, content_hash, params=()):
+        """종류(schedule/pairs) + 파일 해시 + 분석 파라미터로 캐시 키 생성"""
+        payload = json.dumps([CACHE_VERSION, kind, content_hash, params], ensure_ascii=False, default=list)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            df = pd.read_parquet(path)
+            os.utime(path)
+        except (OSError, ValueError, ImportError):
+            return None
+        return df
+
+    def put(self, key, df):
+        """저장 실패 (Parquet 엔진 없음, 변환 불가 컬럼 등) 시에는 캐시 없이 계속 진행"""
+        path = self._path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except (OSError, ValueError, TypeError, ImportError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.evict()
+
+    def evict(self):
+        """전체 크기가 max_bytes 이하가 될 때까지 가장 오래 사용하지 않은 파일부터 삭제"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.parquet'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+def cached_load_data(file, cache, hub=DEFAULT_HUB):
+    """load_data 결과를 파일 내용 해시로 캐시. 반환값은 (스케줄 DataFrame, SHA-256)
+
+    SSIM 파일은 허브 구간만 읽으므로 허브 공항도 캐시 키에 넣는다.
+    """
+    raw = read_bytes(file)
+    content_hash = hashlib.sha256(raw).hexdigest()
+    params = sorted(hub_airports(hub)) if is_ssim(raw[:SSIM_SNIFF_BYTES]) else ()
+    key = cache.make_key('schedule', content_hash, params)
+
+    df = cache.get(key)
+    if df is None:
+        df = load_data(raw, hub)
+        cache.put(key, df)
+    return df, content_hash
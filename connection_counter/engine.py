@@ -0,0 +1,399 @@
+"""연결편 분석 엔진 (Streamlit 의존성 없음)"""
+import numpy as np
+import pandas as pd
+
+from .weekly import (WEEK_MINUTES, DAY_LABELS, is_weekly, side_days, rotate_days, period_days,
+                     next_departure_days)
+from .mct import assign_mct
+
+# 허브를 지정하지 않으면 인천 기준 (hub 인자는 공항 코드 하나 또는 여러 공항 목록)
+DEFAULT_HUB = 'ICN'
+
+
+def hub_airports(hub):
+    """허브 지정 (공항 코드 또는 목록) -> 공항 코드 튜플"""
+    return (hub,) if isinstance(hub, str) else tuple(hub)
+
+
+def direction_plan(group_a_routes, group_a_ops, group_b_routes, group_b_ops):
+    """분석할 방향 목록 [(라벨, 시작 노선, 시작 항공사, 도착 노선, 도착 항공사)] (같은 그룹이면 한 방향만)"""
+    plan = [("Group A -> Group B", group_a_routes, group_a_ops, group_b_routes, group_b_ops)]
+    is_same_group = set(group_a_routes) == set(group_b_routes) and set(group_a_ops) == set(group_b_ops)
+    if not is_same_group:
+        plan.append(("Group B -> Group A", group_b_routes, group_b_ops, group_a_routes, group_a_ops))
+    return plan
+
+
+def split_direction_rows(df, start_routes, start_ops, end_routes, end_ops, hub=DEFAULT_HUB):
+    """한 방향의 허브 도착편(inbound, DEST 가 허브) / 허브 출발편(outbound, ORGN 이 허브) 행 위치 배열
+
+    시간 형식 오류 편은 제외한다. 허브가 여러 공항이면 모두 포함하므로, 같은 공항끼리만 연결하려면
+    hub_direction_rows 를 사용한다.
+    """
+    hubs = list(hub_airports(hub))
+    inbound = (
+        (df['ROUTE'].isin(start_routes)) & 
+        (df['OPS'].isin(start_ops)) & 
+        (df['DEST'].isin(hubs)) & 
+        (df['STA_MIN'].notna())
+    )
+    
+    outbound = (
+        (df['ROUTE'].isin(end_routes)) & 
+        (df['OPS'].isin(end_ops)) & 
+        (df['ORGN'].isin(hubs)) & 
+        (df['STD_MIN'].notna())
+    )
+    return np.flatnonzero(inbound.to_numpy()), np.flatnonzero(outbound.to_numpy())
+
+
+def hub_direction_rows(df, plan, hub=DEFAULT_HUB):
+    """(방향 코드, 방향 라벨, 허브 공항, 도착편 행, 출발편 행) 목록. 연결은 같은 허브 공항 안에서만 만든다"""
+    for direction_code, (direction_label, start_routes, start_ops, end_routes, end_ops) in enumerate(plan):
+        for airport in hub_airports(hub):
+            in_rows, out_rows = split_direction_rows(df, start_routes, start_ops, end_routes, end_ops, airport)
+            if len(in_rows) and len(out_rows):
+                yield direction_code, direction_label, airport, in_rows, out_rows
+
+
+def full_pair_minutes(arr, dep):
+    """전체 쌍(도착편 x 출발편)의 연결 시간을 행 우선 순서로 일괄 계산 (음수는 익일 +1440)"""
+    diff = dep[np.newaxis, :] - arr[:, np.newaxis]
+    return np.where(diff < 0, diff + 1440, diff).ravel()
+
+
+def find_window_pairs(arr, dep, min_limit, max_limit):
+    """출발 시각을 정렬해 두고 도착편마다 [Min CT, Max CT] 구간의 출발편만 찾는다.
+
+    반환값은 (도착편 위치, 출발편 위치, 연결시간) 배열이며 시간은 0~1439분 범위로 가정한다.
+    """
+    order = np.argsort(dep, kind='stable')
+    dep_sorted = dep[order]
+    n = len(dep_sorted)
+    # 0~2880 이중 타임라인: 도착 이후 출발편은 당일, 이전 출발편은 +1440 (익일)
+    timeline = np.concatenate([dep_sorted, dep_sorted + 1440])
+
+    # 도착편별 탐색 범위 [base, base + n) 안에서 연결시간 = timeline - arr
+    base = np.searchsorted(dep_sorted, arr, side='left')
+    start = np.clip(np.searchsorted(timeline, arr + min_limit, side='left'), base, base + n)
+    end = np.clip(np.searchsorted(timeline, arr + max_limit, side='right'), base, base + n)
+    counts = np.maximum(end - start, 0)
+
+    in_idx = np.repeat(np.arange(len(arr)), counts)
+    offsets = np.cumsum(counts) - counts
+    pos = np.arange(counts.sum()) - np.repeat(offsets - start, counts)
+    return in_idx, order[pos % n], timeline[pos] - arr[in_idx]
+
+
+def find_touched_window_pairs(arr, dep, min_limit, max_limit, touched_in, touched_out):
+    """find_window_pairs 중 표시된 도착편 또는 출발편이 포함된 쌍만 계산 (변경분 재계산용)"""
+    t_in = np.flatnonzero(touched_in)
+    u_in = np.flatnonzero(~touched_in)
+    t_out = np.flatnonzero(touched_out)
+    # (변경 도착편 x 전체 출발편) + (나머지 도착편 x 변경 출발편)
+    a_in, a_out, a_diff = find_window_pairs(arr[t_in], dep, min_limit, max_limit)
+    b_in, b_out, b_diff = find_window_pairs(arr[u_in], dep[t_out], min_limit, max_limit)
+    return (np.concatenate([t_in[a_in], u_in[b_in]]),
+            np.concatenate([a_out, t_out[b_out]]),
+            np.concatenate([a_diff, b_diff]))
+
+
+def weekly_pairs(arr, dep, in_week, out_week, min_limit=0, max_limit=WEEK_MINUTES - 1,
+                 window=True, touched=None):
+    """운항 요일/기간을 고려한 주간 (10080분) 타임라인 연결: 도착 요일마다 그 뒤 첫 출발편까지의 시간
+
+    in_week/out_week 는 side_days 결과 (요일 마스크, 운항 시작일, 종료일).
+    반환값은 (도착편 위치, 출발편 위치, 연결시간, 연결 요일 마스크 (허브 도착 요일)) 배열이며
+    같은 쌍도 요일에 따라 연결시간이 다르면 (예: 월요일 도착 60분, 수요일 도착 1500분) 여러 행이 된다.
+    연결시간 = 당일 기준 연결시간 (0~1439) + 1440 x step 이므로 step 별로 MCT 구간에 맞는 당일 기준 구간만
+    find_window_pairs 로 탐색한다. window=False 이면 전체 쌍을 계산한다 (matrix).
+    """
+    in_days, in_start, in_end = in_week
+    out_days, out_start, out_end = out_week
+    if not window:
+        # 전체 쌍에서 시작해 다음 출발편을 아직 못 찾은 도착 요일이 남은 쌍만 다음 step 으로 넘긴다
+        in_idx = np.repeat(np.arange(len(arr)), len(dep))
+        out_idx = np.tile(np.arange(len(dep)), len(arr))
+        diff = full_pair_minutes(arr, dep)
+        first_shift = (diff != dep[out_idx] - arr[in_idx]).astype(np.int64)
+        remaining = in_days[in_idx]
+
+    blocks = []
+    for step in range(7):
+        low = max(min_limit - 1440 * step, 0)
+        high = min(max_limit - 1440 * step, 1439)
+        if low > high:
+            continue
+        if window:
+            if touched is None:
+                in_idx, out_idx, diff = find_window_pairs(arr, dep, low, high)
+            else:
+                in_idx, out_idx, diff = find_touched_window_pairs(arr, dep, low, high, *touched)
+            first_shift = (dep[out_idx] < arr[in_idx]).astype(np.int64)
+            days = next_departure_days(in_days[in_idx], out_days[out_idx], first_shift, step)
+        else:
+            departing = rotate_days(out_days[out_idx], first_shift + step)
+            days = remaining & departing
+            remaining = remaining & ~departing
+
+        shift = first_shift + step
+        # 출발편 운항 기간을 도착일 기준으로 옮겨 도착편 기간과 겹치는 날짜의 요일만 남김
+        days = days & period_days(np.maximum(in_start[in_idx], out_start[out_idx] - shift),
+                                  np.minimum(in_end[in_idx], out_end[out_idx] - shift))
+        keep = np.flatnonzero(days)
+        blocks.append((in_idx[keep], out_idx[keep], diff[keep] + 1440 * step, days[keep]))
+
+        if not window:
+            active = np.flatnonzero(remaining)
+            in_idx, out_idx, diff = in_idx[active], out_idx[active], diff[active]
+            first_shift, remaining = first_shift[active], remaining[active]
+
+    if not blocks:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty, np.empty(0, dtype=np.uint8)
+    in_idx, out_idx, diff, days = (np.concatenate(parts) for parts in zip(*blocks))
+    if not window:
+        # 쌍 순서 (행 우선, Cross Join 과 동일) 로 정렬. 같은 쌍은 연결시간 순
+        order = np.argsort(in_idx * len(dep) + out_idx, kind='stable')
+        in_idx, out_idx, diff, days = in_idx[order], out_idx[order], diff[order], days[order]
+    return in_idx, out_idx, diff, days
+
+
+def direction_pairs(df, in_rows, out_rows, min_limit=0, max_limit=WEEK_MINUTES - 1,
+                    window=True, touched=None):
+    """한 방향의 (도착편 위치, 출발편 위치, 연결시간, 연결 요일 마스크 또는 None)
+
+    스케줄에 운항 요일/기간 컬럼 (DOW_MASK 등) 이 있으면 weekly_pairs, 없으면 매일 운항으로 보고 24시간 기준으로 계산.
+    touched 는 in_rows/out_rows 순서의 (도착편 마스크, 출발편 마스크).
+    """
+    arr = df['STA_MIN'].iloc[in_rows].to_numpy(dtype=np.int64)
+    dep = df['STD_MIN'].iloc[out_rows].to_numpy(dtype=np.int64)
+    if is_weekly(df):
+        return weekly_pairs(arr, dep, side_days(df, in_rows, arrival=True), side_days(df, out_rows, arrival=False),
+                            min_limit, max_limit, window=window, touched=touched)
+
+    if not window:
+        # 전체 쌍(도착편 x 출발편)의 연결 시간을 배열 연산으로 일괄 계산, 행 순서는 Cross Join 과 동일
+        return (np.repeat(np.arange(len(arr)), len(dep)), np.tile(np.arange(len(dep)), len(arr)),
+                full_pair_minutes(arr, dep), None)
+    if touched is None:
+        return (*find_window_pairs(arr, dep, min_limit, max_limit), None)
+    return (*find_touched_window_pairs(arr, dep, min_limit, max_limit, *touched), None)
+
+
+def connected_pairs(df, in_rows, out_rows, min_limit, max_limit, mct_rules=None, touched=None):
+    """MCT 구간 안의 연결만 (direction_pairs window) 찾고, mct_rules 가 있으면 쌍별 규칙 MCT 로 거른 결과
+
+    규칙 MCT 가 Min CT 보다 짧을 수 있으므로 가장 짧은 MCT 부터 탐색한 뒤 쌍별 MCT 미만을 뺀다.
+    """
+    search_min = min_limit
+    if mct_rules is not None and mct_rules.min_mct is not None:
+        search_min = min(min_limit, mct_rules.min_mct)
+    in_idx, out_idx, diff, days = direction_pairs(df, in_rows, out_rows, search_min, max_limit, touched=touched)
+    if mct_rules is None:
+        return in_idx, out_idx, diff, days
+    mct, _ = mct_rules.minimum_ct(df, in_rows[in_idx], out_rows[out_idx], min_limit)
+    keep = np.flatnonzero(diff >= mct)
+    return in_idx[keep], out_idx[keep], diff[keep], None if days is None else days[keep]
+
+
+def count_disconnect_pairs(inbound, outbound, in_idx, out_idx, direction_label):
+    """노선/항공사 조합별 (전체 쌍 - Connected 쌍) 으로 Disconnect 건수를 계산"""
+    keys = ['Inbound_Route', 'Inbound_OPS', 'Outbound_Route', 'Outbound_OPS']
+    in_groups = inbound.groupby(['ROUTE', 'OPS'], observed=True).size().rename('N_IN').reset_index()
+    in_groups.columns = ['Inbound_Route', 'Inbound_OPS', 'N_IN']
+    out_groups = outbound.groupby(['ROUTE', 'OPS'], observed=True).size().rename('N_OUT').reset_index()
+    out_groups.columns = ['Outbound_Route', 'Outbound_OPS', 'N_OUT']
+    totals = pd.merge(in_groups, out_groups, how='cross')
+
+    # 주간 분석에서는 한 쌍이 요일별로 여러 행일 수 있으므로 쌍 단위로 센다
+    pair_ids = np.unique(in_idx.astype(np.int64) * len(outbound) + out_idx)
+    in_idx, out_idx = pair_ids // len(outbound), pair_ids % len(outbound)
+    connected = pd.DataFrame({
+        'Inbound_Route': inbound['ROUTE'].array.take(in_idx),
+        'Inbound_OPS': inbound['OPS'].array.take(in_idx),
+        'Outbound_Route': outbound['ROUTE'].array.take(out_idx),
+        'Outbound_OPS': outbound['OPS'].array.take(out_idx),
+    }).groupby(keys, observed=True).size().rename('Connected').reset_index()
+
+    totals = totals.merge(connected, on=keys, how='left').fillna({'Connected': 0})
+    totals['Disconnect'] = (totals['N_IN'] * totals['N_OUT'] - totals['Connected']).astype(np.int64)
+    totals.insert(0, 'Direction', direction_label)
+    return totals.set_index(['Direction'] + keys)['Disconnect']
+
+
+# Status 는 두 값뿐이므로 category 로 저장 (요약 탭의 groupby 가 정수 코드로 동작)
+STATUS_DTYPE = pd.CategoricalDtype(['Connected', 'Disconnect'])
+
+RESULT_COLUMNS = ['Direction', 'Inbound_Route', 'Outbound_Route', 'Inbound_OPS', 'Outbound_OPS', 'Inbound_Flt_No', 'Outbound_Flt_No', 'From', 'Via', 'To', 'Inbound_Flight', 'Outbound_Flight', 'Hub_Arr_Time', 'Hub_Dep_Time', 'Arr_Min', 'Dep_Min', 'Arr_Hour', 'Dep_Hour', 'Conn_Min', 'Status']
+# 엔진이 만드는 압축 쌍 테이블: 방향, 스케줄 행 위치 (도착편/출발편), 연결시간 (+ Status 코드)
+# 주간 분석이면 연결 요일 마스크 (Days, 허브 도착 요일 기준 uint8) 가 추가된다
+PAIR_COLUMNS = ['Direction', 'In_Row', 'Out_Row', 'Conn_Min']
+
+
+def _pair_block(direction_code, in_rows, out_rows, diff, days=None):
+    block = pd.DataFrame({
+        'Direction': np.full(len(diff), direction_code, dtype=np.int8),
+        'In_Row': in_rows.astype(np.int32),
+        'Out_Row': out_rows.astype(np.int32),
+        'Conn_Min': diff.astype(np.int16),
+    }, columns=PAIR_COLUMNS)
+    if days is not None:
+        block['Days'] = days.astype(np.uint8)
+    return block
+
+
+def _concat_pairs(blocks, direction_labels, weekly=False):
+    empty = np.empty(0, dtype=np.int64)
+    empty_block = _pair_block(0, empty, empty, empty, np.empty(0, dtype=np.uint8) if weekly else None)
+    pairs = pd.concat(blocks or [empty_block], ignore_index=True)
+    pairs['Direction'] = pd.Categorical.from_codes(pairs['Direction'].to_numpy(), categories=direction_labels)
+    return pairs
+
+
+def build_pair_table(df, group_a_routes, group_a_ops, group_b_routes, group_b_ops, hub=DEFAULT_HUB):
+    """MCT 와 무관한 전체 쌍의 압축 테이블 (Status 제외). 임계값이 바뀌어도 재사용 가능"""
+    plan = direction_plan(group_a_routes, group_a_ops, group_b_routes, group_b_ops)
+    blocks = []
+    for direction_code, _, _, in_rows, out_rows in hub_direction_rows(df, plan, hub):
+        in_idx, out_idx, diff, days = direction_pairs(df, in_rows, out_rows, window=False)
+        blocks.append(_pair_block(direction_code, in_rows[in_idx], out_rows[out_idx], diff, days))
+    return _concat_pairs(blocks, [label for label, *_ in plan], weekly=is_weekly(df))
+
+
+def classify_status(pairs, min_limit, max_limit):
+    """Conn_Min 기준으로 Status 를 (재)분류. 쌍 테이블을 제자리에서 갱신하고 그대로 반환
+
+    min_limit 은 전체 쌍에 같은 Min CT 또는 쌍별 MCT 배열 (assign_mct 결과).
+    """
+    conn_min = pairs['Conn_Min'].to_numpy()
+    disconnected = ~((conn_min >= min_limit) & (conn_min <= max_limit))
+    pairs['Status'] = pd.Categorical.from_codes(disconnected.astype(np.int8), dtype=STATUS_DTYPE)
+    return pairs
+
+
+def find_pairs(df, min_limit, max_limit,
+               group_a_routes, group_a_ops,
+               group_b_routes, group_b_ops,
+               engine='matrix', count_disconnect=False, touched=None, hub=DEFAULT_HUB, mct_rules=None):
+    """압축 쌍 테이블 (Direction, In_Row, Out_Row, Conn_Min, Status) 을 반환.
+
+    engine='matrix' 는 전체 쌍을, engine='window' 는 MCT 구간 안의 Connected 쌍만 생성한다.
+    window 모드에서 count_disconnect=True 이면 Disconnect 쌍은 목록 대신
+    (Direction, 노선/항공사) 키별 건수 dict 로 결과의 attrs['disconnect_counts'] 에 담는다.
+    touched=(도착편 마스크, 출발편 마스크) (스케줄 행 단위 bool 배열) 를 주면 window 모드에서
+    표시된 편이 하나라도 포함된 쌍만 생성한다.
+    스케줄에 운항 요일/기간 컬럼이 있으면 주간 타임라인 (weekly_pairs) 으로 계산하고 Days 컬럼을 붙인다.
+    hub 에 여러 공항을 주면 공항별로 나누어 같은 공항의 도착편/출발편끼리만 연결한다.
+    mct_rules (MctRules) 를 주면 쌍마다 맞는 규칙의 MCT 를 Min CT 로 쓰고 (맞는 규칙이 없으면 min_limit),
+    적용 MCT 와 규칙을 MCT / MCT_Rule 컬럼으로 남긴다.
+    """
+    if engine != 'window':
+        pairs = build_pair_table(df, group_a_routes, group_a_ops, group_b_routes, group_b_ops, hub)
+        return classify_status(pairs, assign_mct(df, pairs, mct_rules, min_limit), max_limit)
+
+    plan = direction_plan(group_a_routes, group_a_ops, group_b_routes, group_b_ops)
+    blocks = []
+    disconnect_counts = []
+    for direction_code, direction_label, _, in_rows, out_rows in hub_direction_rows(df, plan, hub):
+        in_idx, out_idx, diff, days = connected_pairs(
+            df, in_rows, out_rows, min_limit, max_limit, mct_rules,
+            touched=None if touched is None else (touched[0][in_rows], touched[1][out_rows]))
+        blocks.append(_pair_block(direction_code, in_rows[in_idx], out_rows[out_idx], diff, days))
+        if count_disconnect:
+            disconnect_counts.append(count_disconnect_pairs(df.iloc[in_rows], df.iloc[out_rows],
+                                                            in_idx, out_idx, direction_label))
+
+    pairs = _concat_pairs(blocks, [label for label, *_ in plan], weekly=is_weekly(df))
+    assign_mct(df, pairs, mct_rules, min_limit)
+    pairs['Status'] = pd.Categorical.from_codes(np.zeros(len(pairs), dtype=np.int8), dtype=STATUS_DTYPE)
+    if disconnect_counts:
+        pairs.attrs['disconnect_counts'] = merge_disconnect_counts(
+            [counts.to_dict() for counts in disconnect_counts])
+    return pairs
+
+
+def merge_disconnect_counts(counts_list):
+    """disconnect_counts dict 들을 키별로 합산 (허브 공항별 결과를 합칠 때)"""
+    merged = {}
+    for counts in counts_list:
+        for key, count in counts.items():
+            merged[key] = merged.get(key, 0) + count
+    return merged
+
+
+def pair_keys(df, pairs):
+    """요약/필터용 키 컬럼 (노선, 항공사, 출발지/허브/도착지) 을 category 코드로 붙인 사본. 문자열 라벨은 만들지 않음"""
+    in_rows = pairs['In_Row'].to_numpy()
+    out_rows = pairs['Out_Row'].to_numpy()
+    keyed = pairs.copy()
+    keyed['Inbound_Route'] = df['ROUTE'].array.take(in_rows)
+    keyed['Outbound_Route'] = df['ROUTE'].array.take(out_rows)
+    keyed['Inbound_OPS'] = df['OPS'].array.take(in_rows)
+    keyed['Outbound_OPS'] = df['OPS'].array.take(out_rows)
+    keyed['From'] = df['ORGN'].array.take(in_rows)
+    keyed['Via'] = df['DEST'].array.take(in_rows)
+    keyed['To'] = df['DEST'].array.take(out_rows)
+    return keyed
+
+
+def _row_labels(df, rows):
+    """쌍에 등장하는 항공편만 편명/표시 문자열을 만들고 쌍 순서로 펼침"""
+    unique_rows, inverse = np.unique(rows, return_inverse=True)
+    flights = df.iloc[unique_rows]
+    flt_no = flights['OPS'].astype(str) + flights['FLT NO']
+    return flights, flt_no, inverse
+
+
+def expand_pairs(df, pairs):
+    """압축 쌍 테이블을 화면/CSV 용 결과 컬럼 (RESULT_COLUMNS) 으로 펼침. 보여줄 행만 골라서 호출"""
+    in_rows = pairs['In_Row'].to_numpy()
+    out_rows = pairs['Out_Row'].to_numpy()
+    inbound, flt_in, in_idx = _row_labels(df, in_rows)
+    outbound, flt_out, out_idx = _row_labels(df, out_rows)
+    flight_in = ('[' + flt_in + '] ' + inbound['ORGN'].astype(str) + '->' + inbound['DEST'].astype(str)
+                 + ' (Arr ' + inbound['STA'].astype(str) + ')')
+    flight_out = ('[' + flt_out + '] ' + outbound['ORGN'].astype(str) + '->' + outbound['DEST'].astype(str)
+                  + ' (Dep ' + outbound['STD'].astype(str) + ')')
+    arr = inbound['STA_MIN'].to_numpy(dtype=np.int64)[in_idx]
+    dep = outbound['STD_MIN'].to_numpy(dtype=np.int64)[out_idx]
+
+    result = pd.DataFrame({
+        'Direction': pairs['Direction'].array,
+        'Inbound_Route': df['ROUTE'].array.take(in_rows),
+        'Outbound_Route': df['ROUTE'].array.take(out_rows),
+        'Inbound_OPS': df['OPS'].array.take(in_rows), 'Outbound_OPS': df['OPS'].array.take(out_rows),
+        'Inbound_Flt_No': flt_in.to_numpy()[in_idx], 'Outbound_Flt_No': flt_out.to_numpy()[out_idx],
+        'From': df['ORGN'].array.take(in_rows),
+        'Via': df['DEST'].array.take(in_rows),
+        'To': df['DEST'].array.take(out_rows),
+        'Inbound_Flight': flight_in.to_numpy()[in_idx],
+        'Outbound_Flight': flight_out.to_numpy()[out_idx],
+        'Hub_Arr_Time': inbound['STA'].to_numpy()[in_idx], 'Hub_Dep_Time': outbound['STD'].to_numpy()[out_idx],
+        'Arr_Min': arr, 'Dep_Min': dep,
+        'Arr_Hour': arr / 60.0,
+        'Dep_Hour': dep / 60.0,
+        'Conn_Min': pairs['Conn_Min'].to_numpy(dtype=np.int64),
+    }, index=pairs.index)
+    if 'Days' in pairs.columns:
+        result['Days'] = DAY_LABELS[pairs['Days'].to_numpy()]
+    if 'MCT' in pairs.columns:
+        result['MCT'] = pairs['MCT'].to_numpy(dtype=np.int64)
+        result['MCT_Rule'] = pairs['MCT_Rule'].array
+    if 'Status' in pairs.columns:
+        result['Status'] = pairs['Status']
+    result.attrs = dict(pairs.attrs)
+    return result
+
+
+def analyze_connections_flexible(df, min_limit, max_limit, 
+                               group_a_routes, group_a_ops, 
+                               group_b_routes, group_b_ops,
+                               engine='matrix', count_disconnect=False, hub=DEFAULT_HUB, mct_rules=None):
+    """find_pairs 결과를 전체 결과 컬럼으로 펼친 테이블 (배치/비교용).
+
+    화면에서는 find_pairs 로 압축 테이블을 받아 요약은 pair_keys, 목록은 보여줄 행만 expand_pairs 로 만든다.
+    """
+    pairs = find_pairs(df, min_limit, max_limit, group_a_routes, group_a_ops, group_b_routes, group_b_ops,
+                       engine=engine, count_disconnect=count_disconnect, hub=hub, mct_rules=mct_rules)
+    return expand_pairs(df, pairs)
@@ -0,0 +1,151 @@
+"""결과 내보내기: DataFrame 청크를 임시 파일에 차례로 써서 다운로드 파일을 만든다
+
+전체 결과를 한 번에 문자열/바이트로 만들지 않으므로 메모리에는 청크 하나만 올라간다.
+쌍 목록은 pair_chunks 로 압축 쌍 테이블을 청크별로 펼치며 (expand_pairs), 파일은 요청할 때만 만든다.
+"""
+import gzip
+import importlib.util
+import os
+import tempfile
+import weakref
+
+from .engine import expand_pairs
+
+# 형식 -> (화면 이름, 확장자, MIME)
+EXPORT_FORMATS = {
+    'csv': ('CSV (Excel, UTF-8 BOM)', '.csv', 'text/csv'),
+    'csv.gz': ('CSV (gzip 압축)', '.csv.gz', 'application/gzip'),
+    'parquet': ('Parquet', '.parquet', 'application/vnd.apache.parquet'),
+}
+DEFAULT_CHUNK_ROWS = 200_000
+
+
+def available_formats():
+    """설치된 패키지로 만들 수 있는 형식 (Parquet 은 pyarrow 필요)"""
+    formats = ['csv', 'csv.gz']
+    if importlib.util.find_spec('pyarrow') is not None:
+        formats.append('parquet')
+    return formats
+
+
+def export_file_name(stem, fmt):
+    return stem + EXPORT_FORMATS[fmt][1]
+
+
+def format_from_path(path):
+    """파일 확장자로 형식 판별 (.parquet, .gz, 그 외는 CSV)"""
+    lowered = path.lower()
+    if lowered.endswith('.parquet'):
+        return 'parquet'
+    return 'csv.gz' if lowered.endswith('.gz') else 'csv'
+
+
+def frame_chunks(frame, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """DataFrame 을 chunk_rows 행씩 나눈 뷰 (빈 DataFrame 도 컬럼 헤더용으로 한 번 돌려줌)"""
+    for start in range(0, max(len(frame), 1), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows]
+
+
+def pair_chunks(df, pairs, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """압축 쌍 테이블을 chunk_rows 행씩 RESULT_COLUMNS 로 펼친 청크"""
+    for chunk in frame_chunks(pairs, chunk_rows):
+        yield expand_pairs(df, chunk)
+
+
+def _write_csv(chunks, handle):
+    header = True
+    for chunk in chunks:
+        chunk.to_csv(handle, index=False, header=header)
+        header = False
+
+
+def _write_parquet(chunks, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            # attrs (disconnect_counts 등) 는 파일 메타데이터로 옮기지 않음
+            chunk = chunk.copy(deep=False)
+            chunk.attrs = {}
+            table = pa.Table.from_pandas(chunk, preserve_index=False,
+                                         schema=None if writer is None else writer.schema)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_export(chunks, path, fmt):
+    """청크 (DataFrame iterable) 를 path 에 fmt 형식으로 이어 씀. CSV 는 Excel 용 UTF-8 BOM 을 붙인다"""
+    if fmt == 'csv':
+        with open(path, 'w', encoding='utf-8-sig', newline='') as handle:
+            _write_csv(chunks, handle)
+    elif fmt == 'csv.gz':
+        with gzip.open(path, 'wt', encoding='utf-8-sig', newline='') as handle:
+            _write_csv(chunks, handle)
+    elif fmt == 'parquet':
+        _write_parquet(chunks, path)
+    else:
+        raise ValueError(f"지원하지 않는 내보내기 형식: {fmt} (가능: {', '.join(EXPORT_FORMATS)})")
+    return path
+
+
+def export_to_tempfile(chunks, fmt, directory=None):
+    """청크를 임시 파일로 내보내고 경로를 반환 (다 쓰면 remove_export 로 삭제)"""
+    handle, path = tempfile.mkstemp(suffix=EXPORT_FORMATS[fmt][1], prefix='connection_counter_', dir=directory)
+    os.close(handle)
+    try:
+        return write_export(chunks, path, fmt)
+    except BaseException:
+        remove_export(path)
+        raise
+
+
+def remove_export(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _remove_files(files):
+    for _, path in files.values():
+        remove_export(path)
+    files.clear()
+
+
+class ExportFiles:
+    """키별 임시 내보내기 파일 목록 (key -> (tag, 경로))
+
+    tag 는 파일을 만든 조건 (형식, 분석 조건 등). 같은 키를 다른 tag 로 조회하면 이전 파일을 지운다.
+    객체가 정리될 때 (Streamlit 세션이 끝나 세션 상태가 사라지거나 프로세스가 종료될 때) 남은 파일도 모두 지운다.
+    """
+
+    def __init__(self):
+        self._files = {}
+        weakref.finalize(self, _remove_files, self._files)
+
+    def current(self, key, tag):
+        """key 의 파일이 tag 조건으로 만든 것이면 경로, 아니면 이전 파일을 지우고 None"""
+        entry = self._files.get(key)
+        if entry is not None and entry[0] == tag and os.path.exists(entry[1]):
+            return entry[1]
+        self.discard(key)
+        return None
+
+    def put(self, key, tag, path):
+        self.discard(key)
+        self._files[key] = (tag, path)
+        return path
+
+    def discard(self, key):
+        entry = self._files.pop(key, None)
+        if entry is not None:
+            remove_export(entry[1])
+
+    def clear(self):
+        _remove_files(self._files)
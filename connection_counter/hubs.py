@@ -0,0 +1,73 @@
+"""다중 허브 분석: 스케줄을 허브 공항별로 나누어 각 허브의 연결 뱅크를 병렬로 계산"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .engine import hub_airports, find_pairs, build_pair_table, merge_disconnect_counts
+from .weekly import WEEKLY_COLUMNS, is_weekly
+
+# 워커 프로세스로 넘길 최소 컬럼 (허브 공항의 도착/출발편 행만 전달)
+HUB_COLUMNS = ['ROUTE', 'OPS', 'ORGN', 'DEST', 'STD_MIN', 'STA_MIN']
+
+
+def partition_by_hub(df, hub):
+    """허브 공항별 (공항, 스케줄 행 위치, 그 공항에 도착/출발하는 편만 담은 최소 컬럼 스케줄) 목록"""
+    columns = HUB_COLUMNS + (WEEKLY_COLUMNS if is_weekly(df) else [])
+    partitions = []
+    for airport in hub_airports(hub):
+        rows = np.flatnonzero(((df['DEST'] == airport) | (df['ORGN'] == airport)).to_numpy())
+        partitions.append((airport, rows, df[columns].iloc[rows]))
+    return partitions
+
+
+def _hub_pairs(hub_df, airport, params):
+    """허브 공항 하나의 압축 쌍 테이블 (프로세스 풀 워커에서 실행되므로 모듈 최상위 함수)"""
+    if params['engine'] == 'table':
+        return build_pair_table(hub_df, *params['groups'], hub=airport)
+    return find_pairs(hub_df, params['min_limit'], params['max_limit'], *params['groups'],
+                      engine=params['engine'], count_disconnect=params['count_disconnect'], hub=airport,
+                      mct_rules=params['mct_rules'])
+
+
+def _run_hubs(df, hub, params, max_workers):
+    partitions = partition_by_hub(df, hub)
+    if len(partitions) == 1 or max_workers == 1:
+        results = [_hub_pairs(hub_df, airport, params) for airport, _, hub_df in partitions]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_hub_pairs, hub_df, airport, params) for airport, _, hub_df in partitions]
+            results = [future.result() for future in futures]
+
+    # 허브별 행 위치를 전체 스케줄 행 위치로 되돌려 합침
+    for (_, rows, _), pairs in zip(partitions, results):
+        pairs['In_Row'] = rows[pairs['In_Row'].to_numpy()].astype(np.int32)
+        pairs['Out_Row'] = rows[pairs['Out_Row'].to_numpy()].astype(np.int32)
+    combined = pd.concat(results, ignore_index=True)
+    counts = [pairs.attrs['disconnect_counts'] for pairs in results if 'disconnect_counts' in pairs.attrs]
+    combined.attrs = {'disconnect_counts': merge_disconnect_counts(counts)} if counts else {}
+    return combined
+
+
+def find_hub_pairs(df, hub, min_limit, max_limit,
+                   group_a_routes, group_a_ops,
+                   group_b_routes, group_b_ops,
+                   engine='matrix', count_disconnect=False, max_workers=None, mct_rules=None):
+    """find_pairs(..., hub=hub) 와 같은 쌍을 허브 공항별 프로세스로 나누어 계산 (결과는 허브 공항 순서)
+
+    각 허브의 연결은 서로 독립이므로 (같은 공항의 도착편/출발편끼리만 연결) 공항별로 스케줄을 나누어
+    ProcessPoolExecutor 로 실행한다. 허브가 하나이거나 max_workers=1 이면 순차 실행.
+    Disconnect 건수 (count_disconnect) 는 허브를 합산한 값이다.
+    """
+    params = {
+        'engine': engine, 'count_disconnect': count_disconnect,
+        'min_limit': min_limit, 'max_limit': max_limit, 'mct_rules': mct_rules,
+        'groups': (group_a_routes, group_a_ops, group_b_routes, group_b_ops),
+    }
+    return _run_hubs(df, hub, params, max_workers)
+
+
+def build_hub_pair_table(df, hub, group_a_routes, group_a_ops, group_b_routes, group_b_ops, max_workers=None):
+    """build_pair_table 의 다중 허브 병렬 버전 (Status 제외, PairTableCache 용)"""
+    params = {'engine': 'table', 'groups': (group_a_routes, group_a_ops, group_b_routes, group_b_ops)}
+    return _run_hubs(df, hub, params, max_workers)
@@ -0,0 +1,168 @@
+"""다구간 여정 (허브 환승 최대 K회) 탐색
+
+항공편을 시간 간선으로 보고, 허브 공항마다 도착편 -> [MCT, Max CT] 안의 출발편 환승 간선을 한 번만 만든 뒤
+(connected_pairs, 출발 시각 정렬 + searchsorted) 라운드 k 에서 k 회 환승 여정을 한꺼번에 한 구간씩 늘린다
+(RAPTOR 식 라운드 탐색). 여정을 늘릴 때는 마지막 편의 환승 간선 구간 (CSR) 만 펼치므로 교차 조인이 없다.
+"""
+import numpy as np
+import pandas as pd
+
+from .engine import DEFAULT_HUB, hub_airports, connected_pairs
+from .weekly import ALL_DAYS, DAY_LABELS, is_weekly, rotate_days
+
+DEFAULT_MAX_CONNECTIONS = 2
+
+
+def transfer_edges(df, hub=DEFAULT_HUB, min_limit=0, max_limit=1439, mct_rules=None):
+    """허브 공항별 환승 간선 (도착편 행, 출발편 행, 연결시간, 출발편 도착까지 넘어가는 일수, 연결 요일 마스크)
+
+    같은 공항에 도착/출발하는 편끼리만 잇는다. 일수는 다음 간선의 요일 마스크를 맞출 때 쓰며 (주간 분석),
+    매일 운항 스케줄이면 요일 마스크는 None 이다.
+    """
+    weekly = is_weekly(df)
+    arr_min = df['STA_MIN'].to_numpy(dtype=np.float64)
+    blocks = []
+    for airport in hub_airports(hub):
+        in_rows = np.flatnonzero(((df['DEST'] == airport) & df['STA_MIN'].notna()).to_numpy())
+        out_rows = np.flatnonzero(((df['ORGN'] == airport) & df['STD_MIN'].notna()).to_numpy())
+        if len(in_rows) and len(out_rows):
+            in_idx, out_idx, diff, days = connected_pairs(df, in_rows, out_rows, min_limit, max_limit, mct_rules)
+            blocks.append((in_rows[in_idx], out_rows[out_idx], diff, days))
+
+    if not blocks:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty, empty, (np.empty(0, dtype=np.uint8) if weekly else None)
+    in_rows, out_rows, diff, days = (np.concatenate(parts) if parts[0] is not None else None
+                                     for parts in zip(*blocks))
+    # 도착편 행 순으로 정렬해 두면 편별 간선이 연속 구간이 된다
+    order = np.argsort(in_rows, kind='stable')
+    in_rows, out_rows, diff = in_rows[order], out_rows[order], diff[order]
+    shift = (arr_min[in_rows].astype(np.int64) + diff) // 1440
+    if weekly:
+        days = days[order]
+        shift = shift + df['ARR_OFFSET'].to_numpy(dtype=np.int64)[out_rows]
+    return in_rows, out_rows, diff, shift, days
+
+
+def build_itineraries(df, hub=DEFAULT_HUB, max_connections=DEFAULT_MAX_CONNECTIONS, min_limit=60, max_limit=300,
+                      max_total_conn=None, mct_rules=None, origins=None, destinations=None):
+    """1 ~ max_connections 회 환승하는 여정의 압축 테이블
+
+    컬럼: Connections, Leg_1 ~ Leg_{K+1} (스케줄 행 위치, 없으면 -1), Conn_1 ~ Conn_K (환승 연결시간, 없으면 -1),
+    Total_Conn_Min (환승 대기 합계), 주간 분석이면 Days (첫 환승 허브 도착 요일 마스크).
+    환승은 hub 공항에서만 하고, 한 여정에서 같은 공항을 두 번 지나지 않는다. 스케줄에 UTC 시차가 없어
+    총 소요 시간 대신 환승 대기 합계를 max_total_conn 으로 제한한다. 출발지/도착지는 origins/destinations 로 고른다.
+    """
+    weekly = is_weekly(df)
+    e_in, e_out, e_diff, e_shift, e_days = transfer_edges(df, hub, min_limit, max_limit, mct_rules)
+    bounds = np.searchsorted(e_in, np.arange(len(df) + 1))
+    airport_codes, airports = pd.factorize(pd.concat([df['ORGN'].astype(str), df['DEST'].astype(str)]))
+    orgn_code, dest_code = airport_codes[:len(df)], airport_codes[len(df):]
+
+    valid = (df['STD_MIN'].notna() & df['STA_MIN'].notna()).to_numpy()
+    if origins is not None:
+        valid = valid & df['ORGN'].isin(origins).to_numpy()
+    legs = np.flatnonzero(valid)[:, np.newaxis]
+    visited = np.column_stack([orgn_code[legs[:, 0]], dest_code[legs[:, 0]]])
+    conns = np.empty((len(legs), 0), dtype=np.int64)
+    total = np.zeros(len(legs), dtype=np.int64)
+    # 주간: 마지막 편 도착 요일 기준 마스크, 첫 도착부터 마지막 환승 도착까지 일수, 마지막 간선이 넘긴 일수
+    current = np.full(len(legs), ALL_DAYS, dtype=np.uint8)
+    elapsed_days = np.zeros(len(legs), dtype=np.int64)
+    pending = np.zeros(len(legs), dtype=np.int64)
+
+    rounds = []
+    for _ in range(max_connections):
+        last = legs[:, -1]
+        counts = bounds[last + 1] - bounds[last]
+        path = np.repeat(np.arange(len(legs)), counts)
+        edge = np.arange(counts.sum()) + np.repeat(bounds[last] - (np.cumsum(counts) - counts), counts)
+        next_leg = e_out[edge]
+        keep = ~(visited[path] == dest_code[next_leg][:, np.newaxis]).any(axis=1)
+        new_total = total[path] + e_diff[edge]
+        if max_total_conn is not None:
+            keep &= new_total <= max_total_conn
+        if weekly:
+            new_current = rotate_days(current[path], -pending[path]) & e_days[edge]
+            keep &= new_current != 0
+            current = new_current[keep]
+            elapsed_days = (elapsed_days + pending)[path[keep]]
+            pending = e_shift[edge[keep]]
+        path, edge, next_leg = path[keep], edge[keep], next_leg[keep]
+
+        legs = np.column_stack([legs[path], next_leg])
+        visited = np.column_stack([visited[path], dest_code[next_leg]])
+        conns = np.column_stack([conns[path], e_diff[edge]])
+        total = new_total[keep]
+        if not len(legs):
+            break
+        done = np.ones(len(legs), dtype=bool) if destinations is None else \
+            airports[dest_code[next_leg]].isin(list(destinations))
+        rounds.append(_itinerary_block(legs[done], conns[done], total[done], max_connections,
+                                       rotate_days(current[done], elapsed_days[done]) if weekly else None))
+
+    if not rounds:
+        empty = np.empty((0, 1), dtype=np.int64)
+        rounds.append(_itinerary_block(empty, empty[:, :0], empty[:, 0], max_connections,
+                                       np.empty(0, dtype=np.uint8) if weekly else None))
+    return pd.concat(rounds, ignore_index=True)
+
+
+def _itinerary_block(legs, conns, total, max_connections, days):
+    connections = legs.shape[1] - 1
+    block = {'Connections': np.full(len(legs), connections, dtype=np.int8)}
+    for no in range(max_connections + 1):
+        block[f'Leg_{no + 1}'] = (legs[:, no] if no <= connections else np.full(len(legs), -1)).astype(np.int32)
+    for no in range(max_connections):
+        block[f'Conn_{no + 1}'] = (conns[:, no] if no < connections else np.full(len(legs), -1)).astype(np.int16)
+    block['Total_Conn_Min'] = total.astype(np.int32)
+    if days is not None:
+        block['Days'] = days.astype(np.uint8)
+    return pd.DataFrame(block)
+
+
+def _leg_matrix(itineraries):
+    return itineraries[[col for col in itineraries.columns if col.startswith('Leg_')]].to_numpy(dtype=np.int64)
+
+
+def itinerary_keys(df, itineraries):
+    """요약/공항 분석용 키 (From = 첫 편 출발지, To = 마지막 편 도착지, Via = 환승 공항 'ICN' / 'ICN-PUS') 를 붙인 사본"""
+    legs = _leg_matrix(itineraries)
+    connections = itineraries['Connections'].to_numpy(dtype=np.int64)
+    last = legs[np.arange(len(legs)), connections]
+    keyed = itineraries.copy()
+    keyed['From'] = df['ORGN'].array.take(legs[:, 0])
+    keyed['To'] = df['DEST'].array.take(last)
+    dest = df['DEST'].to_numpy(dtype=object)
+    via = dest[legs[:, 0]]
+    for no in range(1, legs.shape[1] - 1):
+        more = connections > no
+        via[more] = via[more] + '-' + dest[legs[more, no]]
+    keyed['Via'] = pd.Categorical(via)
+    return keyed
+
+
+def expand_itineraries(df, itineraries):
+    """압축 여정 테이블을 화면/CSV 용 문자열 컬럼으로 펼침 (보여줄 행만 골라서 호출)"""
+    keyed = itinerary_keys(df, itineraries)
+    legs = _leg_matrix(itineraries)
+    label = (df['OPS'].astype(str) + df['FLT NO'].astype(str) + ' ' + df['ORGN'].astype(str) + '->'
+             + df['DEST'].astype(str) + ' (' + df['STD'].astype(str) + '-' + df['STA'].astype(str) + ')'
+             ).to_numpy(dtype=object)
+    flights = label[legs[:, 0]]
+    conn_text = np.full(len(legs), '', dtype=object)
+    for no in range(1, legs.shape[1]):
+        more = legs[:, no] >= 0
+        minutes = itineraries[f'Conn_{no}'].to_numpy().astype(str).astype(object)
+        flights[more] = flights[more] + ' / ' + label[legs[more, no]]
+        conn_text[more] = np.where(no == 1, minutes[more], conn_text[more] + ' / ' + minutes[more])
+
+    result = pd.DataFrame({
+        'From': keyed['From'], 'Via': keyed['Via'], 'To': keyed['To'],
+        'Connections': itineraries['Connections'].to_numpy(dtype=np.int64),
+        'Flights': flights, 'Conn_Min': conn_text,
+        'Total_Conn_Min': itineraries['Total_Conn_Min'].to_numpy(dtype=np.int64),
+    }, index=itineraries.index)
+    if 'Days' in itineraries.columns:
+        result['Days'] = DAY_LABELS[itineraries['Days'].to_numpy()]
+    return result
@@ -0,0 +1,215 @@
+"""스케줄 파일 로드 및 시간 컬럼 변환"""
+import codecs
+import hashlib
+import io
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from .weekly import ALL_DAYS, parse_dow_column
+from .engine import DEFAULT_HUB
+from .ssim import SSIM_SNIFF_BYTES, is_ssim, read_ssim_legs
+from .xlsx import XLSX_SNIFF_BYTES, is_xlsx, read_xlsx_sheets
+from .mct import DOMESTIC_AIRPORTS, MctRules
+
+
+REQUIRED_COLUMNS = ['OPS', 'FLT NO', '구분', 'STD', 'STA', 'ORGN', 'DEST', 'ROUTE']
+# 값 종류가 적은 컬럼은 category (정수 코드 + 사전) 로 보관하여 필터/조인/집계를 코드 단위로 수행
+CATEGORY_COLUMNS = ['OPS', 'ROUTE', 'ORGN', 'DEST', '구분']
+# 같은 의미의 다른 컬럼 이름 -> 표준 이름
+COLUMN_ALIASES = {
+    'DESTINATION': 'DEST',
+    'FREQ': 'DOW', 'FREQUENCY': 'DOW',
+    'EFF FROM': 'EFF', 'EFFECTIVE': 'EFF',
+    'EFF TO': 'DIS', 'DISCONTINUE': 'DIS',
+}
+# 선택 컬럼: 운항 요일 ('1234567' / '1.3.5..'), 운항 시작/종료일, 도착일 변경 (출발일 기준 +1 등)
+OPTIONAL_WEEKLY_COLUMNS = ['DOW', 'EFF', 'DIS', 'ARR_OFFSET']
+ENCODINGS = ['utf-8', 'cp949', 'euc-kr']
+# 인코딩 판별에 사용할 앞부분 크기 (헤더의 '구분' 등 한글이 포함되는 범위)
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+
+def detect_encoding(raw, sample_bytes=ENCODING_SAMPLE_BYTES):
+    """BOM 확인 후 앞부분 바이트만 엄격하게 디코딩해 인코딩 판별 (전체 파싱 없이)"""
+    if raw.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+
+    sample = raw[:sample_bytes]
+    if sample.isascii():
+        # 앞부분이 모두 ASCII 이면 처음 나오는 비 ASCII 바이트가 있는 줄부터 다시 샘플링
+        match = re.search(rb'[\x80-\xff]', raw)
+        if match is None:
+            return 'utf-8'
+        line_start = raw.rfind(b'\n', 0, match.start()) + 1
+        sample = raw[line_start:line_start + sample_bytes]
+
+    for enc in ENCODINGS:
+        # 샘플 끝에서 잘린 멀티바이트 문자는 허용 (final=False)
+        decoder = codecs.getincrementaldecoder(enc)(errors='strict')
+        try:
+            decoder.decode(sample, final=False)
+        except UnicodeDecodeError:
+            continue
+        return enc
+    raise ValueError(f"파일 인코딩을 판별할 수 없습니다. 지원 인코딩: {', '.join(ENCODINGS)}")
+
+
+def load_data(file, hub=DEFAULT_HUB):
+    """스케줄 CSV (경로, bytes 또는 파일 객체) 를 읽어 컬럼 정리 및 분 단위 시간 컬럼을 추가
+
+    SSIM 파일 (헤더 레코드로 판별) 이면 load_ssim 으로 hub 에 도착/출발하는 구간만 읽는다 (CSV 는 hub 와 무관).
+    Excel (.xlsx, ZIP 시그니처로 판별) 이면 load_xlsx 로 필수 컬럼이 있는 시트를 모두 읽는다.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as f:
+            head = f.read(max(SSIM_SNIFF_BYTES, XLSX_SNIFF_BYTES))
+        if is_ssim(head):
+            return load_ssim(file, hub)
+        if is_xlsx(head):
+            return load_xlsx(file)
+    raw = read_bytes(file)
+    if is_ssim(raw[:SSIM_SNIFF_BYTES]):
+        return load_ssim(raw, hub)
+    if is_xlsx(raw[:XLSX_SNIFF_BYTES]):
+        return load_xlsx(raw)
+    encoding = detect_encoding(raw)
+    df = pd.read_csv(io.BytesIO(raw), encoding=encoding)
+
+    df.columns = df.columns.str.strip()
+    df.rename(columns={alias: name for alias, name in COLUMN_ALIASES.items() if name not in df.columns},
+              inplace=True)
+
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(
+            f"필수 컬럼이 누락되었습니다: {', '.join(missing)} "
+            f"(파일 컬럼: {', '.join(map(str, df.columns))}, 인코딩: {encoding})"
+        )
+    return prepare_schedule(df)
+
+
+def load_xlsx(file, sheets=None):
+    """Excel 스케줄 (경로, bytes 또는 파일 객체) 을 load_data 와 같은 스케줄로 변환
+
+    read-only 모드로 읽으며, 시트가 여러 개면 (시즌별 시트 등) 필수 컬럼이 있는 시트를 모두 이어 붙인다.
+    sheets 로 읽을 시트 이름을 고를 수 있다.
+    """
+    source = file if isinstance(file, (str, os.PathLike)) else io.BytesIO(read_bytes(file))
+    df, _ = read_xlsx_sheets(source, REQUIRED_COLUMNS, sheets, COLUMN_ALIASES)
+    return prepare_schedule(df)
+
+
+def load_ssim(file, hub=DEFAULT_HUB, route_map=None):
+    """SSIM 파일 (경로, bytes 또는 파일 객체) 의 허브 도착/출발 구간을 load_data 와 같은 스케줄로 변환
+
+    경로를 주면 파일을 한 줄씩 읽는다. 운항 요일/기간/도착일 변경을 유지하므로 주간 분석이 된다.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as f:
+            legs = read_ssim_legs(f, hub, route_map)
+    else:
+        legs = read_ssim_legs(io.BytesIO(read_bytes(file)), hub, route_map)
+    return prepare_schedule(legs)
+
+
+def load_mct_rules(file, domestic_airports=DOMESTIC_AIRPORTS):
+    """MCT 규칙 CSV (경로, bytes 또는 파일 객체) 를 읽어 조회 구조 (MctRules) 로 컴파일"""
+    raw = read_bytes(file)
+    rules = pd.read_csv(io.BytesIO(raw), encoding=detect_encoding(raw), dtype=str, keep_default_na=False)
+    return MctRules(rules, domestic_airports)
+
+
+def prepare_schedule(df):
+    """필수 컬럼이 있는 원본 스케줄을 분석용으로 정리 (문자열 정리, category, 분 단위 시간, 주간 컬럼)"""
+    for col in ['구분', 'FLT NO', 'ROUTE', 'OPS', 'ORGN', 'DEST']:
+        df[col] = df[col].astype(str).str.strip()
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype('category')
+
+    # 시간은 로드 시 한 번만 분 단위로 변환 (형식 오류는 <NA> 로 남겨 검증 리포트에 표시)
+    df['STD_MIN'] = parse_time_column(df['STD'])
+    df['STA_MIN'] = parse_time_column(df['STA'])
+    if any(col in df.columns for col in OPTIONAL_WEEKLY_COLUMNS):
+        add_weekly_columns(df)
+    return df
+
+
+def add_weekly_columns(df):
+    """선택 컬럼 (DOW, EFF, DIS, ARR_OFFSET) 을 주간 분석용 컬럼 (WEEKLY_COLUMNS) 으로 변환 (제자리)
+
+    없는 컬럼은 매일 운항 / 기간 제한 없음 / 도착일 변경 없음으로 채운다.
+    """
+    if 'DOW' in df.columns:
+        df['DOW_MASK'] = parse_dow_column(df['DOW']).astype(np.uint8)
+    else:
+        df['DOW_MASK'] = np.uint8(ALL_DAYS)
+    if 'ARR_OFFSET' in df.columns:
+        df['ARR_OFFSET'] = pd.to_numeric(df['ARR_OFFSET'], errors='coerce').fillna(0).astype(np.int8)
+    else:
+        df['ARR_OFFSET'] = np.int8(0)
+    for col, target in [('EFF', 'EFF_DATE'), ('DIS', 'DIS_DATE')]:
+        values = df[col] if col in df.columns else pd.Series(None, index=df.index, dtype=object)
+        df[target] = pd.to_datetime(values, errors='coerce', format='mixed').astype('datetime64[s]')
+    return df
+
+
+def unify_categories(*frames):
+    """여러 스케줄의 category 컬럼이 같은 사전(정수 코드)을 쓰도록 맞춘 사본 목록을 반환"""
+    frames = [frame.copy() for frame in frames]
+    for col in CATEGORY_COLUMNS:
+        if not all(col in frame.columns for frame in frames):
+            continue
+        categories = sorted(set().union(*(frame[col].astype('category').cat.categories for frame in frames)))
+        for frame in frames:
+            frame[col] = frame[col].astype(pd.CategoricalDtype(categories))
+    return frames
+
+
+def parse_time_column(times):
+    """'HH:MM' 시간 컬럼을 분 단위 정수(Int64)로 일괄 변환. 형식 오류는 <NA> 로 남김"""
+    parts = times.astype(str).str.extract(r'^\s*(\d{1,2}):(\d{1,2})\s*$')
+    hours = pd.to_numeric(parts[0])
+    minutes = pd.to_numeric(parts[1])
+    valid = (hours < 24) & (minutes < 60)
+    return (hours * 60 + minutes).where(valid).astype('Int64')
+
+
+def find_invalid_times(df):
+    """STD/STA 형식 오류 항공편 목록 (해당 시간은 분석에서 제외됨)"""
+    std_bad = df['STD_MIN'].isna()
+    sta_bad = df['STA_MIN'].isna()
+    bad = std_bad | sta_bad
+    report = df.loc[bad, ['OPS', 'FLT NO', 'ORGN', 'DEST', '구분', 'STD', 'STA']].copy()
+    report['오류 항목'] = np.where(std_bad[bad] & sta_bad[bad], 'STD, STA', np.where(std_bad[bad], 'STD', 'STA'))
+    return report
+
+
+def is_ssim_file(file):
+    """SSIM 파일인지 (load_data 가 허브 구간만 읽으므로 허브 공항을 로드 전에 정해야 함)"""
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as f:
+            return is_ssim(f.read(SSIM_SNIFF_BYTES))
+    return is_ssim(read_bytes(file)[:SSIM_SNIFF_BYTES])
+
+
+def read_bytes(file):
+    """경로, bytes, 업로드 파일 객체에서 원본 바이트를 읽음"""
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as f:
+            return f.read()
+    if hasattr(file, 'getvalue'):
+        return file.getvalue()
+    file.seek(0)
+    data = file.read()
+    file.seek(0)
+    return data
+
+
+def file_sha256(file):
+    """파일 내용의 SHA-256. 같은 내용이면 파일 이름과 무관하게 같은 값"""
+    return hashlib.sha256(read_bytes(file)).hexdigest()
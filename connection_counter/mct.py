@@ -0,0 +1,170 @@
+"""공항/국내·국제/항공사 조합별 최소 연결 시간 (MCT) 규칙 테이블
+
+규칙 컬럼 (MCT_RULE_COLUMNS)
+  ARPT     연결 공항 (허브)
+  STATUS   도착편/출발편의 국내(D)/국제(I) 구분: 'DD', 'DI', 'ID', 'II'
+  ARR_OPS  도착편 항공사,  DEP_OPS  출발편 항공사
+  CONN     'ON' (같은 항공사끼리, online) / 'IL' (다른 항공사끼리, interline)
+  MCT      최소 연결 시간 (분)
+빈 값과 '*' 는 모든 값에 해당한다. 한 쌍에 여러 규칙이 맞으면 지정한 필드가 많은 규칙, 같으면 MCT_FIELDS 앞쪽
+필드 (항공사 > 공항 > 국내/국제 > online 여부) 를 지정한 규칙, 그래도 같으면 테이블에서 먼저 나온 규칙을 쓴다.
+"""
+import numpy as np
+import pandas as pd
+
+# 우선순위 순서 (앞쪽 필드를 지정한 규칙이 우선)
+MCT_FIELDS = ['ARR_OPS', 'DEP_OPS', 'ARPT', 'STATUS', 'CONN']
+MCT_RULE_COLUMNS = ['ARPT', 'STATUS', 'ARR_OPS', 'DEP_OPS', 'CONN', 'MCT']
+# 쌍 테이블에 붙는 컬럼: 적용 MCT (분), 적용 규칙 라벨
+MCT_COLUMNS = ['MCT', 'MCT_Rule']
+WILDCARD = '*'
+STATUS_CODES = ['DD', 'DI', 'ID', 'II']
+CONN_CODES = ['ON', 'IL']
+# 맞는 규칙이 없는 쌍 (화면의 Min CT 를 적용)
+DEFAULT_RULE_LABEL = '기본 Min CT'
+# 출발지/도착지가 모두 이 목록에 있는 편을 국내선으로 본다
+DOMESTIC_AIRPORTS = frozenset([
+    'ICN', 'GMP', 'PUS', 'CJU', 'CJJ', 'TAE', 'KWJ', 'RSU', 'USN', 'MWX', 'YNY', 'KPO', 'WJU', 'HIN', 'KUV',
+])
+
+
+def _rule_values(rules, field):
+    values = rules[field] if field in rules.columns else pd.Series(WILDCARD, index=rules.index)
+    values = values.astype(str).str.strip().where(values.notna(), WILDCARD).replace('', WILDCARD)
+    return values.str.upper() if field in ('STATUS', 'CONN') else values
+
+
+def _indexer(vocab, values):
+    """값 배열 -> vocab 위치 (vocab 에 없으면 -1)"""
+    return pd.Index(vocab).get_indexer(np.asarray(values, dtype=object))
+
+
+class MctRules:
+    """MCT 규칙 테이블을 와일드카드 패턴별 정렬 키 배열로 컴파일한 조회 구조
+
+    패턴 (지정한 필드 조합) 마다 규칙 값을 필드별 사전 코드로 바꿔 정수 키 하나로 묶고 정렬해 두므로,
+    조회는 우선순위가 높은 패턴부터 미결정 항목만 searchsorted 로 찾는다 (규칙 수만큼 쌍을 훑지 않음).
+    규칙 필드는 도착편 (항공사, 공항, 국내/국제) 과 출발편 (항공사, 국내/국제) 값으로 정해지므로
+    편을 이 값 조합 (클래스) 으로 묶어 (도착 클래스 x 출발 클래스) 표만 조회하고 쌍에는 표를 펼친다.
+    """
+
+    def __init__(self, rules, domestic_airports=DOMESTIC_AIRPORTS):
+        rules = rules.rename(columns=lambda col: str(col).strip().upper()).reset_index(drop=True)
+        if 'MCT' not in rules.columns:
+            raise ValueError(f"MCT 규칙에 MCT 컬럼이 없습니다 (파일 컬럼: {', '.join(map(str, rules.columns))})")
+        table = pd.DataFrame({field: _rule_values(rules, field) for field in MCT_FIELDS})
+        table['MCT'] = pd.to_numeric(rules['MCT'], errors='coerce')
+        self._validate(table)
+        table['MCT'] = table['MCT'].astype(np.int64)
+
+        self.rules = table[MCT_RULE_COLUMNS]
+        self.domestic_airports = frozenset(domestic_airports)
+        self.mct = table['MCT'].to_numpy()
+        self.min_mct = int(self.mct.min()) if len(self.mct) else None
+        names = rules['RULE'].astype(str) if 'RULE' in rules.columns else (
+            table['ARPT'] + ' ' + table['STATUS'] + ' ' + table['ARR_OPS'] + '-' + table['DEP_OPS']
+            + ' ' + table['CONN'])
+        self.labels = [DEFAULT_RULE_LABEL] + [f"#{no} {name} ({mct}분)"
+                                              for no, (name, mct) in enumerate(zip(names, self.mct), start=1)]
+
+        # 필드별 사전 (와일드카드 제외) 과 패턴별 (필드, 자리값, 정렬 키, 규칙 번호)
+        self.vocab = {field: sorted(set(table[field]) - {WILDCARD}) for field in MCT_FIELDS}
+        specified = table[MCT_FIELDS].ne(WILDCARD)
+        self._index = []
+        for pattern, group in table.groupby([specified[field] for field in MCT_FIELDS], sort=False):
+            fields = [field for field, used in zip(MCT_FIELDS, pattern) if used]
+            radix = [len(self.vocab[field]) for field in fields]
+            place = np.cumprod([1] + radix[:-1]).astype(np.int64)
+            keys = np.zeros(len(group), dtype=np.int64)
+            for field, value in zip(fields, place):
+                keys += _indexer(self.vocab[field], group[field]) * value
+            # 같은 키는 먼저 나온 규칙만 남김
+            keys, first = np.unique(keys, return_index=True)
+            specificity = len(fields) * 2 ** len(MCT_FIELDS) + sum(
+                2 ** (len(MCT_FIELDS) - 1 - MCT_FIELDS.index(field)) for field in fields)
+            self._index.append((specificity, fields, place, keys, group.index.to_numpy()[first]))
+        self._index.sort(key=lambda entry: -entry[0])
+
+    @staticmethod
+    def _validate(table):
+        errors = []
+        for field, allowed in [('STATUS', STATUS_CODES), ('CONN', CONN_CODES)]:
+            bad = ~table[field].isin(allowed + [WILDCARD])
+            if bad.any():
+                errors.append(f"{field} 값 오류 {bad.sum()}건 (허용: {', '.join(allowed)}, *)")
+        bad = table['MCT'].isna() | (table['MCT'] < 0)
+        if bad.any():
+            errors.append(f"MCT 값 오류 {bad.sum()}건 (0 이상 분 단위 정수)")
+        if errors:
+            raise ValueError("MCT 규칙 " + ", ".join(errors))
+
+    def _row_classes(self, df):
+        """스케줄 행별 (도착 클래스, 출발 클래스) 와 클래스별 대표 행 (항공사 + 공항 + 국내선 여부 조합)"""
+        domestic = (df['ORGN'].isin(self.domestic_airports) & df['DEST'].isin(self.domestic_airports)).to_numpy()
+        ops = pd.factorize(df['OPS'].to_numpy(dtype=object))[0].astype(np.int64)
+        dest = pd.factorize(df['DEST'].to_numpy(dtype=object))[0].astype(np.int64)
+        _, in_first, in_class = np.unique((ops * (dest.max(initial=0) + 1) + dest) * 2 + domestic,
+                                          return_index=True, return_inverse=True)
+        _, out_first, out_class = np.unique(ops * 2 + domestic, return_index=True, return_inverse=True)
+        return in_first, out_first, in_class, out_class
+
+    def _pair_codes(self, df, in_rows, out_rows):
+        """쌍별 필드 값의 사전 코드"""
+        domestic = (df['ORGN'].isin(self.domestic_airports) & df['DEST'].isin(self.domestic_airports)).to_numpy()
+        ops = df['OPS'].to_numpy(dtype=object)
+        ops_codes = pd.factorize(ops)[0]
+        status = (~domestic[in_rows]).astype(np.int64) * 2 + (~domestic[out_rows]).astype(np.int64)
+        online = ops_codes[in_rows] == ops_codes[out_rows]
+        return {
+            'ARR_OPS': _indexer(self.vocab['ARR_OPS'], ops)[in_rows],
+            'DEP_OPS': _indexer(self.vocab['DEP_OPS'], ops)[out_rows],
+            'ARPT': _indexer(self.vocab['ARPT'], df['DEST'].to_numpy(dtype=object))[in_rows],
+            'STATUS': _indexer(self.vocab['STATUS'], STATUS_CODES)[status],
+            'CONN': _indexer(self.vocab['CONN'], CONN_CODES)[np.where(online, 0, 1)],
+        }
+
+    def lookup(self, df, in_rows, out_rows):
+        """쌍 (스케줄 행 위치 배열) 별 적용 규칙 번호 (0부터, 맞는 규칙이 없으면 -1)"""
+        in_first, out_first, in_class, out_class = self._row_classes(df)
+        # 대표 행끼리의 (도착 클래스 x 출발 클래스) 규칙 표
+        table = self._match(df, np.repeat(in_first, len(out_first)), np.tile(out_first, len(in_first)))
+        in_rows = np.asarray(in_rows, dtype=np.int64)
+        out_rows = np.asarray(out_rows, dtype=np.int64)
+        return table[in_class[in_rows] * len(out_first) + out_class[out_rows]]
+
+    def _match(self, df, in_rows, out_rows):
+        codes = self._pair_codes(df, in_rows, out_rows)
+        rule = np.full(len(in_rows), -1, dtype=np.int64)
+        for _, fields, place, keys, rule_ids in self._index:
+            pending = np.flatnonzero(rule < 0)
+            if not len(pending):
+                break
+            key = np.zeros(len(pending), dtype=np.int64)
+            valid = np.ones(len(pending), dtype=bool)
+            for field, value in zip(fields, place):
+                code = codes[field][pending]
+                valid &= code >= 0
+                key += code * value
+            pos = np.minimum(np.searchsorted(keys, key), len(keys) - 1)
+            hit = valid & (keys[pos] == key)
+            rule[pending[hit]] = rule_ids[pos[hit]]
+        return rule
+
+    def minimum_ct(self, df, in_rows, out_rows, default):
+        """쌍별 (적용 MCT, 규칙 번호). 맞는 규칙이 없는 쌍은 default (화면 Min CT)"""
+        rule = self.lookup(df, in_rows, out_rows)
+        return np.where(rule >= 0, self.mct[rule], default), rule
+
+
+def assign_mct(df, pairs, rules, min_limit):
+    """쌍 테이블에 적용 MCT (MCT) 와 규칙 라벨 (MCT_Rule, category) 을 제자리로 붙이고 쌍별 MCT 배열을 반환
+
+    rules 가 None 이면 두 컬럼을 지우고 min_limit 을 그대로 반환한다 (모든 쌍에 같은 Min CT).
+    """
+    if rules is None:
+        pairs.drop(columns=MCT_COLUMNS, errors='ignore', inplace=True)
+        return min_limit
+    mct, rule = rules.minimum_ct(df, pairs['In_Row'].to_numpy(), pairs['Out_Row'].to_numpy(), min_limit)
+    pairs['MCT'] = mct.astype(np.int16)
+    pairs['MCT_Rule'] = pd.Categorical.from_codes(rule + 1, categories=rules.labels)
+    return mct
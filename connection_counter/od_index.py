@@ -0,0 +1,84 @@
+"""출발지/도착지 (O&D) 연결 인덱스: 공항 선택 시 필터 없이 구간 슬라이스로 연결 목록을 꺼낸다"""
+import numpy as np
+import pandas as pd
+
+OD_COLUMNS = ['Direction', 'From', 'To', 'Connections', 'Min_Conn', 'Median_Conn', 'Start', 'End']
+
+
+def _codes(values):
+    categorical = values.astype('category')
+    return categorical.cat.codes.to_numpy(dtype=np.int64), categorical.cat.categories
+
+
+def _group_bounds(keys):
+    """정렬된 키 배열 -> (키, 시작 위치, 끝 위치) (이미 정렬되어 있으므로 값이 바뀌는 위치만 찾음)"""
+    start = np.flatnonzero(np.diff(keys, prepend=-1))
+    end = np.append(start[1:], len(keys)) if len(start) else start
+    return keys[start], start, end
+
+
+class ODIndex:
+    """Connected 쌍을 (방향, 출발지, 도착지, 연결시간) 순으로 정렬한 쌍 테이블과 O&D 별 구간/통계
+
+    From = 허브 도착편의 출발지, To = 허브 출발편의 도착지. 출발지 순 테이블 (by_origin) 과
+    도착지 순 테이블 (by_destination) 을 한 번 만들어 두므로 공항 선택은 (방향, 공항) -> [시작, 끝) 조회 후 슬라이스다.
+    table 은 O&D 별 연결 수, 최소/중앙 Conn_Min, by_origin 안의 구간 (Start, End) 이다.
+    """
+
+    def __init__(self, df, pairs):
+        if 'Status' in pairs.columns:
+            pairs = pairs[(pairs['Status'] == 'Connected').to_numpy()]
+        direction, self.directions = _codes(pairs['Direction'])
+        orgn_codes, airports_from = _codes(df['ORGN'])
+        dest_codes, airports_to = _codes(df['DEST'])
+        orgn = orgn_codes[pairs['In_Row'].to_numpy()]
+        dest = dest_codes[pairs['Out_Row'].to_numpy()]
+        conn = pairs['Conn_Min'].to_numpy(dtype=np.int64)
+        n_from, n_to = len(airports_from), len(airports_to)
+
+        # 출발지 순: (방향, 출발지, 도착지, 연결시간). 같은 O&D 안은 연결시간 순이라 최소/중앙값을 위치로 읽는다
+        order = np.lexsort((conn, dest, orgn, direction))
+        self.by_origin = pairs.iloc[order]
+        od_keys, start, end = _group_bounds((direction[order] * n_from + orgn[order]) * n_to + dest[order])
+        sorted_conn = conn[order]
+        self.table = pd.DataFrame({
+            'Direction': pd.Categorical.from_codes(od_keys // (n_from * n_to), categories=self.directions),
+            'From': pd.Categorical.from_codes(od_keys // n_to % n_from, categories=airports_from),
+            'To': pd.Categorical.from_codes(od_keys % n_to, categories=airports_to),
+            'Connections': end - start,
+            'Min_Conn': sorted_conn[start],
+            'Median_Conn': (sorted_conn[start + (end - start - 1) // 2] + sorted_conn[start + (end - start) // 2]) / 2,
+            'Start': start,
+            'End': end,
+        }, columns=OD_COLUMNS)
+        keys, start, end = _group_bounds(direction[order] * n_from + orgn[order])
+        self._origin_bounds = {(self.directions[key // n_from], airports_from[key % n_from]): (s, e)
+                               for key, s, e in zip(keys.tolist(), start.tolist(), end.tolist())}
+
+        # 도착지 순: (방향, 도착지, 출발지, 연결시간)
+        order = np.lexsort((conn, orgn, dest, direction))
+        self.by_destination = pairs.iloc[order]
+        keys, start, end = _group_bounds(direction[order] * n_to + dest[order])
+        self._destination_bounds = {(self.directions[key // n_to], airports_to[key % n_to]): (s, e)
+                                    for key, s, e in zip(keys.tolist(), start.tolist(), end.tolist())}
+
+    def departures(self, direction, airport):
+        """direction 방향에서 airport 를 출발지로 하는 Connected 쌍 (도착지, 연결시간 순)"""
+        start, end = self._origin_bounds.get((direction, airport), (0, 0))
+        return self.by_origin.iloc[start:end]
+
+    def arrivals(self, direction, airport):
+        """direction 방향에서 airport 를 도착지로 하는 Connected 쌍 (출발지, 연결시간 순)"""
+        start, end = self._destination_bounds.get((direction, airport), (0, 0))
+        return self.by_destination.iloc[start:end]
+
+    def origins(self, direction):
+        return [airport for key_direction, airport in self._origin_bounds if key_direction == direction]
+
+    def destinations(self, direction):
+        return [airport for key_direction, airport in self._destination_bounds if key_direction == direction]
+
+    def matrix(self, direction):
+        """히트맵용 O&D 통계 (From, To, Connections, Min_Conn, Median_Conn)"""
+        table = self.table[(self.table['Direction'] == direction).to_numpy()]
+        return table[['From', 'To', 'Connections', 'Min_Conn', 'Median_Conn']].reset_index(drop=True)
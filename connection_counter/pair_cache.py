@@ -0,0 +1,55 @@
+"""MCT 임계값과 무관한 압축 쌍 테이블 캐시 (Min/Max CT 만 바뀌면 Status 만 재분류)"""
+from collections import OrderedDict
+
+from .engine import DEFAULT_HUB, hub_airports, build_pair_table, classify_status
+from .mct import assign_mct
+from .hubs import build_hub_pair_table
+
+
+def selection_key(group_a_routes, group_a_ops, group_b_routes, group_b_ops):
+    """노선/항공사 선택을 순서와 무관한 캐시 키로 변환 (그룹 A/B 구분은 유지)"""
+    return tuple(tuple(sorted(values)) for values in (group_a_routes, group_a_ops, group_b_routes, group_b_ops))
+
+
+class PairTableCache:
+    """(스케줄 해시, 노선/항공사 선택, 허브) -> 쌍 테이블. 최근 사용 순으로 max_entries 개까지 보관
+
+    disk_cache (DiskCache) 를 주면 메모리에 없는 쌍 테이블을 디스크에서 찾고, 새로 만든 테이블도 저장한다.
+    허브가 여러 공항이면 공항별 쌍 테이블을 병렬로 만든다 (build_hub_pair_table).
+    """
+
+    def __init__(self, max_entries=4, disk_cache=None):
+        self.max_entries = max_entries
+        self.disk_cache = disk_cache
+        self._tables = OrderedDict()
+
+    def get_pairs(self, df, schedule_hash, group_a_routes, group_a_ops, group_b_routes, group_b_ops,
+                  hub=DEFAULT_HUB):
+        hubs = hub_airports(hub)
+        key = (schedule_hash, selection_key(group_a_routes, group_a_ops, group_b_routes, group_b_ops)
+               + (tuple(sorted(hubs)),))
+        if key in self._tables:
+            self._tables.move_to_end(key)
+            return self._tables[key]
+
+        pairs = None
+        if self.disk_cache is not None:
+            disk_key = self.disk_cache.make_key('pairs', schedule_hash, key[1])
+            pairs = self.disk_cache.get(disk_key)
+        if pairs is None:
+            if len(hubs) > 1:
+                pairs = build_hub_pair_table(df, hubs, group_a_routes, group_a_ops, group_b_routes, group_b_ops)
+            else:
+                pairs = build_pair_table(df, group_a_routes, group_a_ops, group_b_routes, group_b_ops, hub)
+            if self.disk_cache is not None:
+                self.disk_cache.put(disk_key, pairs)
+        self._tables[key] = pairs
+        while len(self._tables) > self.max_entries:
+            self._tables.popitem(last=False)
+        return pairs
+
+    def analyze(self, df, schedule_hash, min_limit, max_limit,
+                group_a_routes, group_a_ops, group_b_routes, group_b_ops, hub=DEFAULT_HUB, mct_rules=None):
+        """find_pairs(engine='matrix') 와 같은 압축 쌍 테이블. 캐시된 쌍은 (규칙 MCT 와) Status 만 다시 계산"""
+        pairs = self.get_pairs(df, schedule_hash, group_a_routes, group_a_ops, group_b_routes, group_b_ops, hub)
+        return classify_status(pairs, assign_mct(df, pairs, mct_rules, min_limit), max_limit)
@@ -0,0 +1,117 @@
+"""여러 요약/상세 표를 시트별로 담은 Excel (.xlsx) 보고서
+
+openpyxl write-only 모드로 청크를 한 행씩 흘려 쓰므로 상세 시트가 커도 메모리 사용량이 일정하다.
+시트 하나가 Excel 최대 행 수 (EXCEL_MAX_ROWS, 머리글 포함) 를 넘으면 '이름 (2)', '이름 (3)' 시트로 나눈다.
+"""
+import importlib.util
+import os
+import re
+import tempfile
+
+import pandas as pd
+
+from .export import frame_chunks, pair_chunks, remove_export
+
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_SHEET_TITLE_LENGTH = 31
+REPORT_MIME = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def excel_available():
+    return importlib.util.find_spec('openpyxl') is not None
+
+
+def _sheet_title(name, part):
+    """Excel 시트 이름 규칙 (31자, []:*?/\\ 불가) 에 맞춘 이름. 나뉜 시트는 ' (2)' 처럼 번호를 붙임"""
+    suffix = f" ({part})" if part > 1 else ''
+    name = re.sub(r'[\[\]:*?/\\]', '_', str(name)) or 'Sheet'
+    return name[:EXCEL_SHEET_TITLE_LENGTH - len(suffix)] + suffix
+
+
+def _table(source):
+    """DataFrame (이름 있는 인덱스는 컬럼으로) 또는 청크 iterable -> 청크 iterable"""
+    if isinstance(source, pd.DataFrame):
+        named_index = any(name is not None for name in source.index.names)
+        return frame_chunks(source.reset_index() if named_index else source)
+    return source
+
+
+def _rows(chunk):
+    """청크 -> 행 tuple (결측은 빈 셀)"""
+    values = chunk.astype(object).where(chunk.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+
+def write_excel_report(sheets, path, max_rows=EXCEL_MAX_ROWS):
+    """sheets = [(시트 이름, DataFrame 또는 DataFrame 청크 iterable), ...] 를 path 에 .xlsx 로 씀"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for name, source in sheets:
+        part, sheet, used, header = 0, None, max_rows, None
+        for chunk in _table(source):
+            header = [str(col) for col in chunk.columns]
+            start = 0
+            while start < len(chunk) or sheet is None:
+                if used >= max_rows:
+                    part += 1
+                    sheet = workbook.create_sheet(_sheet_title(name, part))
+                    sheet.append(header)
+                    used = 1
+                stop = min(len(chunk), start + max_rows - used)
+                for row in _rows(chunk.iloc[start:stop]):
+                    sheet.append(row)
+                used += stop - start
+                start = stop
+        if sheet is None:
+            workbook.create_sheet(_sheet_title(name, 1))
+    workbook.save(path)
+    return path
+
+
+def excel_report_to_tempfile(sheets, directory=None):
+    """보고서를 임시 .xlsx 파일로 만들고 경로를 반환 (다 쓰면 remove_export 로 삭제)"""
+    handle, path = tempfile.mkstemp(suffix='.xlsx', prefix='connection_counter_', dir=directory)
+    os.close(handle)
+    try:
+        return write_excel_report(sheets, path)
+    except BaseException:
+        remove_export(path)
+        raise
+
+
+def analysis_report_sheets(df, pairs, cube, status=None):
+    """단일 스케줄 분석 보고서 시트: 요약 큐브의 표 + 상세 연결 리스트 (status 로 상태 선택)"""
+    combined = cube.counts(['Inbound_Route', 'Inbound_OPS', 'Outbound_Route', 'Outbound_OPS'])
+    combined['Total'] = combined['Connected'] + combined['Disconnect']
+    sheets = [
+        ('노선항공사별 요약', combined.sort_values(by='Connected', ascending=False)),
+        ('방향별 요약', cube.counts(['Direction'])),
+        ('방향별 연결시간', cube.conn_stats(['Direction']).round(1)),
+    ]
+    hub_summary = cube.counts(['Via'])
+    if len(hub_summary) > 1:
+        sheets.append(('허브별 요약', hub_summary))
+    if 'MCT_Rule' in cube.keys:
+        sheets.append(('MCT 규칙별 요약', cube.counts(['MCT_Rule'])))
+    if status is not None:
+        pairs = pairs[pairs['Status'].isin(status).to_numpy()]
+    sheets.append(('연결 리스트', pair_chunks(df, pairs.sort_values(['Direction', 'Conn_Min'], kind='stable'))))
+    return sheets
+
+
+def comparison_report_sheets(conn_cmp, flt_cmp):
+    """두 스케줄 비교 보고서 시트: 요약 통계 + 항공편/연결 변경 상세"""
+    stats = pd.DataFrame(
+        [('항공편', key, value) for key, value in flt_cmp['stats'].items()]
+        + [('연결', key, value) for key, value in conn_cmp['stats'].items()],
+        columns=['구분', '항목', '값'])
+    return [
+        ('비교 요약', stats),
+        ('삭제 항공편', flt_cmp['removed']),
+        ('신규 항공편', flt_cmp['added']),
+        ('시간변경 항공편', flt_cmp['time_changed']),
+        ('사라진 연결', conn_cmp['lost_connections']),
+        ('새로운 연결', conn_cmp['new_connections']),
+        ('연결시간 변경', conn_cmp['time_changes']),
+    ]
@@ -0,0 +1,99 @@
+"""IATA SSIM (Chapter 7) 스케줄 파일 읽기
+
+레코드 유형 3 (항공편 구간) 중 허브에 도착/출발하는 구간만 사용한다. 파일을 한 줄씩 읽어
+chunk_records 개씩 고정 폭 바이트 배열로 잘라 컬럼 단위로 변환하므로, 파일 크기와 무관하게
+레코드별 Python 객체를 만들지 않는다.
+"""
+import numpy as np
+import pandas as pd
+
+from .engine import DEFAULT_HUB, hub_airports
+from .weekly import DAY_LABELS, parse_dow_column, rotate_days
+
+SSIM_RECORD_LENGTH = 200
+SSIM_HEADER = b'1AIRLINE STANDARD SCHEDULE DATA SET'
+# 형식 판별에 읽을 앞부분 크기 (UTF-8 BOM + 헤더)
+SSIM_SNIFF_BYTES = 3 + len(SSIM_HEADER)
+# 유형 3 레코드의 필드 위치 (SSIM 표기: 1부터 시작, 끝 포함)
+LEG_FIELDS = {
+    'OPS': (3, 5), 'FLT NO': (6, 9),
+    'EFF': (15, 21), 'DIS': (22, 28), 'DOW': (29, 35),
+    'ORGN': (37, 39), 'STD': (40, 43),
+    'DEST': (55, 57), 'STA': (62, 65),
+    'DEP_VAR': (192, 192), 'ARR_VAR': (193, 193),
+}
+LEG_COLUMNS = ['OPS', 'FLT NO', '구분', 'STD', 'STA', 'ORGN', 'DEST', 'ROUTE', 'DOW', 'EFF', 'DIS', 'ARR_OFFSET']
+DEFAULT_CHUNK_RECORDS = 100_000
+
+
+def is_ssim(head):
+    """파일 앞부분 바이트가 SSIM 헤더 레코드 (유형 1) 로 시작하는지"""
+    return head.lstrip(b'\xef\xbb\xbf').startswith(SSIM_HEADER)
+
+
+def _fixed_width(records, start, end):
+    """(레코드 수, 200) 바이트 배열에서 한 필드를 잘라 앞뒤 공백을 뺀 문자열 배열로 (numpy 벡터 연산)"""
+    width = end - start + 1
+    raw = np.ascontiguousarray(records[:, start - 1:end]).view(f'S{width}').ravel()
+    return np.char.strip(raw.astype(f'U{width}'))
+
+
+def _date_variation(values):
+    """날짜 변경 ('0'~'9' 일, 'A' = -1일, 공백 = 0)"""
+    return pd.to_numeric(values.replace({'A': '-1', '': '0'}), errors='coerce').fillna(0).astype(np.int64)
+
+
+def _hhmm(values):
+    return values.str[:2] + ':' + values.str[2:4]
+
+
+def _leg_frame(lines, hub, route_map):
+    """유형 3 레코드 묶음 -> 허브 도착/출발 구간의 LEG_COLUMNS DataFrame"""
+    records = np.frombuffer(b''.join(lines), dtype=np.uint8).reshape(-1, SSIM_RECORD_LENGTH)
+    # 허브와 무관한 구간은 문자열로 바꾸기 전에 제외
+    hubs = list(hub_airports(hub))
+    arriving = np.isin(_fixed_width(records, *LEG_FIELDS['DEST']), hubs)
+    departing = np.isin(_fixed_width(records, *LEG_FIELDS['ORGN']), hubs)
+    keep = arriving | departing
+    records, arriving = records[keep], arriving[keep]
+    fields = {name: pd.Series(_fixed_width(records, start, end)) for name, (start, end) in LEG_FIELDS.items()}
+
+    # SSIM 운항 기간/요일은 항공편 첫 구간 출발일 기준이므로 구간 출발일 (DEP_VAR) 로 옮긴다
+    dep_var = _date_variation(fields['DEP_VAR'])
+    dow_mask = rotate_days(parse_dow_column(fields['DOW']).to_numpy(), -dep_var.to_numpy())
+    shift = pd.to_timedelta(dep_var, unit='D')
+    outstation = fields['ORGN'].where(arriving, fields['DEST'])
+    route = outstation if route_map is None else outstation.map(route_map).fillna(outstation)
+
+    return pd.DataFrame({
+        'OPS': fields['OPS'], 'FLT NO': fields['FLT NO'],
+        '구분': np.where(arriving, 'To ' + fields['DEST'], 'From ' + fields['ORGN']),
+        'STD': _hhmm(fields['STD']), 'STA': _hhmm(fields['STA']),
+        'ORGN': fields['ORGN'], 'DEST': fields['DEST'], 'ROUTE': route,
+        'DOW': DAY_LABELS[dow_mask],
+        'EFF': pd.to_datetime(fields['EFF'], format='%d%b%y', errors='coerce') + shift,
+        'DIS': pd.to_datetime(fields['DIS'], format='%d%b%y', errors='coerce') + shift,
+        'ARR_OFFSET': _date_variation(fields['ARR_VAR']) - dep_var,
+    }, columns=LEG_COLUMNS)
+
+
+def read_ssim_legs(stream, hub=DEFAULT_HUB, route_map=None, chunk_records=DEFAULT_CHUNK_RECORDS):
+    """바이너리 스트림에서 허브 도착/출발 구간을 LEG_COLUMNS 문자열 DataFrame 으로 읽음 (loader.load_ssim 이 정리)
+
+    hub 는 공항 코드 하나 또는 목록이다. 구분은 도착지가 허브이면 'To {허브}', 출발지가 허브이면 'From {허브}' 이고
+    ROUTE 는 route_map (상대 공항 -> 노선 그룹) 으로 정하며 없는 공항은 공항 코드를 그대로 쓴다.
+    """
+    frames = []
+    lines = []
+    for line in stream:
+        if not line.startswith(b'3'):
+            continue
+        lines.append(line.rstrip(b'\r\n').ljust(SSIM_RECORD_LENGTH)[:SSIM_RECORD_LENGTH])
+        if len(lines) >= chunk_records:
+            frames.append(_leg_frame(lines, hub, route_map))
+            lines = []
+    if lines:
+        frames.append(_leg_frame(lines, hub, route_map))
+    if not frames:
+        return pd.DataFrame(columns=LEG_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,81 @@
+"""MCT 민감도 분석: 여러 (Min CT, Max CT) 조합과 노선 그룹 시나리오를 한 번에 평가"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .engine import DEFAULT_HUB, direction_plan, hub_direction_rows, full_pair_minutes, direction_pairs
+from .weekly import WEEKLY_COLUMNS, is_weekly
+
+# 워커 프로세스로 넘길 최소 컬럼 (전체 스케줄 대신 전달하여 직렬화 비용 절감)
+SWEEP_COLUMNS = ['ROUTE', 'OPS', 'ORGN', 'DEST', 'STD_MIN', 'STA_MIN']
+
+
+def scenario_conn_minutes(df, group_a_routes, group_a_ops, group_b_routes, group_b_ops, hub=DEFAULT_HUB):
+    """시나리오의 방향별 전체 쌍 연결시간(정렬됨). MCT 와 무관하므로 한 번만 계산 (허브 공항별 쌍을 합침)"""
+    plan = direction_plan(group_a_routes, group_a_ops, group_b_routes, group_b_ops)
+    parts = {direction_label: [] for direction_label, *_ in plan}
+    for _, direction_label, _, in_rows, out_rows in hub_direction_rows(df, plan, hub):
+        if is_weekly(df):
+            # 운항 요일/기간이 있으면 주간 타임라인의 (쌍, 연결 요일) 별 연결시간
+            parts[direction_label].append(direction_pairs(df, in_rows, out_rows, window=False)[2])
+            continue
+        arr = df['STA_MIN'].iloc[in_rows].to_numpy(dtype=np.int64)
+        dep = df['STD_MIN'].iloc[out_rows].to_numpy(dtype=np.int64)
+        parts[direction_label].append(full_pair_minutes(arr, dep))
+    return {direction_label: np.sort(np.concatenate(chunks)) if chunks else np.empty(0, dtype=np.int64)
+            for direction_label, chunks in parts.items()}
+
+
+def count_connected(sorted_minutes, ct_grid):
+    """정렬된 연결시간에서 (Min CT, Max CT) 조합별 Connected 건수 (조합당 이진 탐색 2회)"""
+    min_cts = np.array([min_ct for min_ct, _ in ct_grid])
+    max_cts = np.array([max_ct for _, max_ct in ct_grid])
+    return (np.searchsorted(sorted_minutes, max_cts, side='right')
+            - np.searchsorted(sorted_minutes, min_cts, side='left'))
+
+
+def _evaluate_scenario(df, scenario, ct_grid, hub):
+    """시나리오 하나의 결과 행 목록 (프로세스 풀 워커에서 실행되므로 모듈 최상위 함수)"""
+    minutes = scenario_conn_minutes(df, scenario['routes_a'], scenario['ops_a'],
+                                    scenario['routes_b'], scenario['ops_b'], scenario.get('hub', hub))
+    rows = []
+    for direction_label, sorted_minutes in minutes.items():
+        connected = count_connected(sorted_minutes, ct_grid)
+        for (min_ct, max_ct), count in zip(ct_grid, connected):
+            rows.append({
+                'Scenario': scenario['name'], 'Direction': direction_label,
+                'Min_CT': min_ct, 'Max_CT': max_ct,
+                'Connected': int(count), 'Total_Pairs': len(sorted_minutes),
+            })
+    return rows
+
+
+def sweep_connections(df, scenarios, ct_grid, max_workers=None, hub=DEFAULT_HUB):
+    """시나리오 x (Min CT, Max CT) 조합별 Connected 건수를 하나의 DataFrame 으로 반환
+
+    scenarios 는 name, routes_a, ops_a, routes_b, ops_b (선택: hub) 키를 가진 dict 목록이며
+    시나리오가 여러 개이면 ProcessPoolExecutor 로 나누어 계산한다 (max_workers=1 이면 순차 실행).
+    """
+    ct_grid = [(int(min_ct), int(max_ct)) for min_ct, max_ct in ct_grid]
+    cols = ['Scenario', 'Direction', 'Min_CT', 'Max_CT', 'Connected', 'Total_Pairs']
+    if not scenarios or not ct_grid:
+        return pd.DataFrame(columns=cols)
+
+    sweep_df = df[SWEEP_COLUMNS + (WEEKLY_COLUMNS if is_weekly(df) else [])]
+    if len(scenarios) == 1 or max_workers == 1:
+        results = [_evaluate_scenario(sweep_df, scenario, ct_grid, hub) for scenario in scenarios]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_evaluate_scenario, sweep_df, scenario, ct_grid, hub) for scenario in scenarios]
+            results = [future.result() for future in futures]
+
+    rows = [row for scenario_rows in results for row in scenario_rows]
+    if not rows:
+        return pd.DataFrame(columns=cols)
+    return pd.DataFrame(rows)[cols]
+
+
+def ct_range(start, stop, step):
+    """start~stop (포함) 을 step 간격으로 나눈 MCT 값 목록"""
+    return list(range(int(start), int(stop) + 1, max(int(step), 1)))
@@ -0,0 +1,63 @@
+"""여러 스케줄 버전 (주간 개정 등) 의 연결 변경 타임라인"""
+import pandas as pd
+
+from .compare import compare_schedules
+from .engine import DEFAULT_HUB
+
+TIMELINE_COLUMNS = ['Step', 'Version_From', 'Version_To', 'Conn_From', 'Conn_To', 'Lost', 'New', 'Retimed', 'Common']
+
+
+class ScheduleTimeline:
+    """순서가 있는 스케줄 버전 목록을 인접 버전끼리 비교
+
+    버전별 압축 쌍 테이블 (파일 해시 키) 과 인접 비교 결과를 보관하므로, 버전을 하나 추가하면
+    마지막 버전과의 변경분 분석 한 번만 새로 계산한다. 분석 조건 (MCT/MCT 규칙, 노선/항공사, 허브) 이 바뀌면 새로 만든다.
+    """
+
+    def __init__(self, min_limit, max_limit, group_a_routes, group_a_ops, group_b_routes, group_b_ops,
+                 hub=DEFAULT_HUB, mct_rules=None):
+        self.params = (min_limit, max_limit, group_a_routes, group_a_ops, group_b_routes, group_b_ops)
+        self.hub = hub
+        self.mct_rules = mct_rules
+        self._pairs = {}
+        self._steps = {}
+
+    def step(self, df_from, hash_from, df_to, hash_to):
+        """두 버전의 compare_schedules 결과 (캐시)"""
+        key = (hash_from, hash_to)
+        if key not in self._steps:
+            result = compare_schedules(df_from, df_to, *self.params, pairs1=self._pairs.get(hash_from),
+                                       hub=self.hub, mct_rules=self.mct_rules)
+            self._pairs.setdefault(hash_from, result['pairs1'])
+            self._pairs[hash_to] = result['pairs2']
+            self._steps[key] = result
+        return self._steps[key]
+
+    def compare(self, versions):
+        """versions: [(라벨, 스케줄 DataFrame, 파일 해시)] (오래된 순)
+
+        반환 dict: summary (단계별 건수, TIMELINE_COLUMNS), changes (사라진/새로운 연결),
+        time_changes (연결 시간 변경), steps (단계별 compare_schedules 결과)
+        """
+        rows, changes, time_changes, steps = [], [], [], []
+        for step_no, ((label_from, df_from, hash_from), (label_to, df_to, hash_to)) in enumerate(
+                zip(versions, versions[1:]), start=1):
+            result = self.step(df_from, hash_from, df_to, hash_to)
+            stats = result['stats']
+            rows.append({
+                'Step': step_no, 'Version_From': label_from, 'Version_To': label_to,
+                'Conn_From': stats['total_conn_1'], 'Conn_To': stats['total_conn_2'],
+                'Lost': stats['lost'], 'New': stats['new'],
+                'Retimed': stats['time_changed'], 'Common': stats['common'],
+            })
+            for frame in (result['lost_connections'], result['new_connections']):
+                changes.append(frame.assign(Step=step_no, Version_From=label_from, Version_To=label_to))
+            time_changes.append(result['time_changes'].assign(Step=step_no, Version_From=label_from, Version_To=label_to))
+            steps.append(result)
+
+        return {
+            'summary': pd.DataFrame(rows, columns=TIMELINE_COLUMNS),
+            'changes': pd.concat(changes, ignore_index=True) if changes else pd.DataFrame(),
+            'time_changes': pd.concat(time_changes, ignore_index=True) if time_changes else pd.DataFrame(),
+            'steps': steps,
+        }
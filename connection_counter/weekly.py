@@ -0,0 +1,78 @@
+"""운항 요일 (DOW) / 운항 기간 비트마스크 연산 (주간 10080분 타임라인)
+
+요일 마스크는 bit0 = 월요일 ... bit6 = 일요일 (SSIM 요일 번호 1~7) 인 uint8 값이다.
+"""
+import numpy as np
+import pandas as pd
+
+ALL_DAYS = 0x7F
+WEEK_MINUTES = 7 * 1440
+# 로더가 선택 컬럼 (DOW, EFF, DIS, ARR_OFFSET) 에서 만드는 컬럼. DOW_MASK 가 있으면 주간 분석
+WEEKLY_COLUMNS = ['DOW_MASK', 'ARR_OFFSET', 'EFF_DATE', 'DIS_DATE']
+# 0~127 마스크 -> SSIM 형식 요일 문자열 (예: 0b0010101 -> '1.3.5..')
+DAY_LABELS = np.array([''.join(str(day + 1) if mask >> day & 1 else '.' for day in range(7))
+                       for mask in range(128)], dtype=object)
+# 운항 기간이 비어 있으면 아주 이른/늦은 날짜로 취급 (1970-01-01 기준 일수)
+_OPEN_START = -(1 << 40)
+_OPEN_END = 1 << 40
+
+
+def parse_dow_column(values):
+    """'1234567', '1.3.5..', '1 3 5' 형식 운항 요일을 uint8 마스크로 변환 (빈 값은 매일 운항)"""
+    text = values.astype(str).where(values.notna(), '1234567')
+    mask = np.zeros(len(values), dtype=np.uint8)
+    for day in range(7):
+        mask |= text.str.contains(str(day + 1), regex=False).to_numpy(dtype=np.uint8) << day
+    return pd.Series(mask, index=values.index)
+
+
+def is_weekly(df):
+    return 'DOW_MASK' in df.columns
+
+
+def rotate_days(mask, shift):
+    """요일 마스크를 shift 일 당김: 결과의 x 요일 비트 = 원래 마스크의 (x + shift) 요일 비트 (shift 는 배열 가능)"""
+    mask = np.asarray(mask, dtype=np.uint8)
+    shift = (np.asarray(shift) % 7).astype(np.uint8)
+    return ((mask >> shift) | (mask << (7 - shift))) & np.uint8(ALL_DAYS)
+
+
+def _day_numbers(dates, fill):
+    """날짜 컬럼 -> 1970-01-01 기준 일수 (int64), 빈 값은 fill"""
+    days = dates.to_numpy(dtype='datetime64[D]').astype(np.int64)
+    return np.where(pd.isna(dates).to_numpy(), fill, days)
+
+
+def side_days(df, rows, arrival):
+    """선택 행의 (허브 기준 운항 요일 마스크, 운항 시작일, 운항 종료일) 배열
+
+    DOW/기간은 출발지 출발일 기준이므로 도착편 (arrival=True) 은 ARR_OFFSET 만큼 허브 도착일로 옮긴다.
+    """
+    flights = df.iloc[rows]
+    days = flights['DOW_MASK'].to_numpy(dtype=np.uint8)
+    start = _day_numbers(flights['EFF_DATE'], _OPEN_START)
+    end = _day_numbers(flights['DIS_DATE'], _OPEN_END)
+    if arrival:
+        offset = flights['ARR_OFFSET'].to_numpy(dtype=np.int64)
+        days = rotate_days(days, -offset)
+        start, end = start + offset, end + offset
+    return days, start, end
+
+
+def period_days(start, end):
+    """기간 [start, end] (일수) 에 들어 있는 요일 마스크. 7일 이상이면 전체, 비어 있으면 0"""
+    length = np.clip(end - start + 1, 0, 7)
+    weekday = (start + 3) % 7  # 1970-01-01 은 목요일 (월요일 = 0)
+    partial = rotate_days((np.left_shift(1, length) - 1).astype(np.uint8), -weekday)
+    return np.where(length >= 7, np.uint8(ALL_DAYS), partial).astype(np.uint8)
+
+
+def next_departure_days(arr_days, dep_days, first_shift, step):
+    """도착 요일 중 (first_shift + step) 일 뒤 출발편이 그 도착 이후 첫 출발편인 요일 마스크
+
+    first_shift 는 같은 날 출발이 가능하면 0, 출발 시각이 도착 시각보다 이르면 1 (익일부터 탐색).
+    """
+    earlier = np.zeros_like(dep_days)
+    for prior in range(step):
+        earlier |= rotate_days(dep_days, first_shift + prior)
+    return arr_days & rotate_days(dep_days, first_shift + step) & ~earlier
@@ -0,0 +1,93 @@
+"""Excel (.xlsx) 스케줄 파일 읽기
+
+openpyxl read-only 모드로 시트를 한 행씩 읽고 chunk_rows 행씩 컬럼 단위 DataFrame 으로 바꾼다.
+시트가 여러 개면 (예: 시즌별 시트) 머리글에 필수 컬럼이 있는 시트를 모두 이어 붙인다.
+파싱 결과는 loader.load_data -> disk_cache.cached_load_data 에서 파일 해시로 Parquet 캐시되므로
+같은 통합 문서를 다시 열면 XML 을 다시 읽지 않는다.
+"""
+import datetime
+
+import pandas as pd
+
+# ZIP 로컬 파일 헤더 (xlsx 는 ZIP 컨테이너)
+XLSX_MAGIC = b'PK\x03\x04'
+XLSX_SNIFF_BYTES = len(XLSX_MAGIC)
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+def is_xlsx(head):
+    """파일 앞부분 바이트가 ZIP (xlsx) 시그니처로 시작하는지"""
+    return head.startswith(XLSX_MAGIC)
+
+
+def _cell_column(values):
+    """한 컬럼의 셀 값 목록 -> Series. Excel 시간 셀은 'HH:MM' 문자열, 형식이 섞인 컬럼은 문자열로 맞춤"""
+    column = pd.Series(values, dtype=object).reset_index(drop=True)
+    present = column.dropna()
+    types = set(map(type, present))
+    if datetime.time in types:
+        column = column.map(lambda value: value.strftime('%H:%M') if isinstance(value, datetime.time) else value)
+        types = set(map(type, column.dropna()))
+    # 정수/실수 셀은 같은 숫자 컬럼으로 봄
+    if len(types - {float} if int in types else types) > 1:
+        column = column.where(column.isna(), column.astype(str))
+    return column.infer_objects()
+
+
+def _sheet_rows(rows, header, chunk_rows):
+    width = len(header)
+    chunk = []
+    for row in rows:
+        if all(value is None for value in row):
+            continue
+        chunk.append(row[:width] + (None,) * (width - len(row)))
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def read_xlsx_sheets(stream, required_columns, sheets=None, column_aliases=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """필수 컬럼이 있는 시트를 읽어 이어 붙인 DataFrame 과 읽은 시트 이름 목록
+
+    머리글은 시트의 첫 번째 비어 있지 않은 행이다. sheets 로 읽을 시트를 고를 수 있고,
+    column_aliases (다른 이름 -> 표준 이름) 를 적용한 뒤 required_columns 가 모두 있는 시트만 사용한다.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        frames, used, skipped = [], [], []
+        for sheet in workbook.worksheets:
+            if sheets is not None and sheet.title not in sheets:
+                continue
+            rows = sheet.iter_rows(values_only=True)
+            header = next((row for row in rows if any(value is not None for value in row)), None)
+            if header is None:
+                continue
+            # 머리글 뒤쪽의 빈 칸은 버림
+            while header and header[-1] is None:
+                header = header[:-1]
+            columns = [str(value).strip() if value is not None else f'Unnamed: {no}'
+                       for no, value in enumerate(header)]
+            aliases = {alias: name for alias, name in (column_aliases or {}).items() if name not in columns}
+            columns = [aliases.get(column, column) for column in columns]
+            if any(column not in columns for column in required_columns):
+                skipped.append(f"{sheet.title} ({', '.join(columns)})")
+                continue
+            frames.append(pd.DataFrame(columns=columns, dtype=object))
+            for chunk in _sheet_rows(rows, tuple(header), chunk_rows):
+                frames.append(pd.DataFrame(chunk, columns=columns, dtype=object))
+            used.append(sheet.title)
+    finally:
+        workbook.close()
+
+    if not used:
+        raise ValueError(
+            f"필수 컬럼 ({', '.join(required_columns)}) 이 있는 시트가 없습니다"
+            + (f" (시트 컬럼: {'; '.join(skipped)})" if skipped else '')
+        )
+    # 셀 값 정리는 시트를 모두 이은 뒤 컬럼별로 한 번 (청크마다 다른 타입이 되지 않도록)
+    df = pd.concat(frames, ignore_index=True)
+    return pd.DataFrame({column: _cell_column(df[column]) for column in df.columns}), used
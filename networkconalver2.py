@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import altair as alt
 
 # 페이지 기본 설정
@@ -56,18 +57,32 @@ def load_data(file):
             for col in ['구분', 'FLT NO', 'ROUTE', 'OPS', 'ORGN', 'DEST']:
                 if col in df.columns:
                     df[col] = df[col].astype(str).str.strip()
+
+            # 시간은 로드 시 한 번만 분 단위로 변환 (형식 오류는 <NA> 로 남겨 검증 리포트에 표시)
+            df['STD_MIN'] = parse_time_column(df['STD'])
+            df['STA_MIN'] = parse_time_column(df['STA'])
                     
             return df
         except:
             continue
     raise ValueError("파일을 읽을 수 없습니다. 인코딩 문제이거나 필수 컬럼이 누락되었습니다.")
 
-def time_to_minutes(t_str):
-    try:
-        h, m = map(int, t_str.split(':'))
-        return h * 60 + m
-    except:
-        return None
+def parse_time_column(times):
+    """'HH:MM' 시간 컬럼을 분 단위 정수(Int64)로 일괄 변환. 형식 오류는 <NA> 로 남김"""
+    parts = times.astype(str).str.extract(r'^\s*(\d{1,2}):(\d{1,2})\s*$')
+    hours = pd.to_numeric(parts[0])
+    minutes = pd.to_numeric(parts[1])
+    valid = (hours < 24) & (minutes < 60)
+    return (hours * 60 + minutes).where(valid).astype('Int64')
+
+def find_invalid_times(df):
+    """STD/STA 형식 오류 항공편 목록 (해당 시간은 분석에서 제외됨)"""
+    std_bad = df['STD_MIN'].isna()
+    sta_bad = df['STA_MIN'].isna()
+    bad = std_bad | sta_bad
+    report = df.loc[bad, ['OPS', 'FLT NO', 'ORGN', 'DEST', '구분', 'STD', 'STA']].copy()
+    report['오류 항목'] = np.where(std_bad[bad] & sta_bad[bad], 'STD, STA', np.where(std_bad[bad], 'STD', 'STA'))
+    return report
 
 # --- 분석 로직 ---
 def analyze_connections_flexible(df, min_limit, max_limit, 
@@ -79,48 +94,52 @@ def analyze_connections_flexible(df, min_limit, max_limit,
         inbound = df[
             (df['ROUTE'].isin(start_routes)) & 
             (df['OPS'].isin(start_ops)) & 
-            (df['구분'] == 'To ICN')
+            (df['구분'] == 'To ICN') & 
+            (df['STA_MIN'].notna())
         ].copy()
         
         outbound = df[
             (df['ROUTE'].isin(end_routes)) & 
             (df['OPS'].isin(end_ops)) & 
-            (df['구분'] == 'From ICN')
+            (df['구분'] == 'From ICN') & 
+            (df['STD_MIN'].notna())
         ].copy()
 
         if inbound.empty or outbound.empty:
             return []
 
-        local_results = []
-        merged = pd.merge(inbound.assign(k=1), outbound.assign(k=1), on='k', suffixes=('_IN', '_OUT'))
-        
-        for _, row in merged.iterrows():
-            arr = time_to_minutes(row['STA_IN'])
-            dep = time_to_minutes(row['STD_OUT'])
-            
-            if arr is not None and dep is not None:
-                diff = dep - arr
-                if diff < 0: diff += 1440
-                status = 'Connected' if min_limit <= diff <= max_limit else 'Disconnect'
-                
-                flt_in = f"{row['OPS_IN']}{row['FLT NO_IN']}"
-                flt_out = f"{row['OPS_OUT']}{row['FLT NO_OUT']}"
+        # 시간은 load_data 에서 변환해 둔 분 단위 컬럼을 그대로 사용
+        arr = inbound['STA_MIN'].to_numpy(dtype=np.int64)
+        dep = outbound['STD_MIN'].to_numpy(dtype=np.int64)
+
+        # 전체 쌍(도착편 x 출발편)의 연결 시간을 배열 연산으로 일괄 계산
+        diff = dep[np.newaxis, :] - arr[:, np.newaxis]
+        diff = np.where(diff < 0, diff + 1440, diff).ravel()
+        is_connected = (diff >= min_limit) & (diff <= max_limit)
+
+        # 쌍별 도착편/출발편 위치 (Cross Join 행 순서와 동일)
+        in_idx = np.repeat(np.arange(len(inbound)), len(outbound))
+        out_idx = np.tile(np.arange(len(outbound)), len(inbound))
+
+        flt_in = inbound['OPS'] + inbound['FLT NO']
+        flt_out = outbound['OPS'] + outbound['FLT NO']
+        flight_in = '[' + flt_in + '] ' + inbound['ORGN'] + '->' + inbound['DEST'] + ' (Arr ' + inbound['STA'].astype(str) + ')'
+        flight_out = '[' + flt_out + '] ' + outbound['ORGN'] + '->' + outbound['DEST'] + ' (Dep ' + outbound['STD'].astype(str) + ')'
 
-                local_results.append({
-                    'Direction': direction_label,
-                    'Inbound_Route': row['ROUTE_IN'],
-                    'Outbound_Route': row['ROUTE_OUT'],
-                    'Inbound_OPS': row['OPS_IN'], 'Outbound_OPS': row['OPS_OUT'],
-                    'Inbound_Flt_No': flt_in, 'Outbound_Flt_No': flt_out,
-                    'From': row['ORGN_IN'], 
-                    'Via': 'ICN', 
-                    'To': row['DEST_OUT'],
-                    'Inbound_Flight': f"[{flt_in}] {row['ORGN_IN']}->{row['DEST_IN']} (Arr {row['STA_IN']})",
-                    'Outbound_Flight': f"[{flt_out}] {row['ORGN_OUT']}->{row['DEST_OUT']} (Dep {row['STD_OUT']})",
-                    'Hub_Arr_Time': row['STA_IN'], 'Hub_Dep_Time': row['STD_OUT'],
-                    'Conn_Min': diff, 'Status': status
-                })
-        return local_results
+        return [pd.DataFrame({
+            'Direction': direction_label,
+            'Inbound_Route': inbound['ROUTE'].to_numpy()[in_idx],
+            'Outbound_Route': outbound['ROUTE'].to_numpy()[out_idx],
+            'Inbound_OPS': inbound['OPS'].to_numpy()[in_idx], 'Outbound_OPS': outbound['OPS'].to_numpy()[out_idx],
+            'Inbound_Flt_No': flt_in.to_numpy()[in_idx], 'Outbound_Flt_No': flt_out.to_numpy()[out_idx],
+            'From': inbound['ORGN'].to_numpy()[in_idx],
+            'Via': 'ICN',
+            'To': outbound['DEST'].to_numpy()[out_idx],
+            'Inbound_Flight': flight_in.to_numpy()[in_idx],
+            'Outbound_Flight': flight_out.to_numpy()[out_idx],
+            'Hub_Arr_Time': inbound['STA'].to_numpy()[in_idx], 'Hub_Dep_Time': outbound['STD'].to_numpy()[out_idx],
+            'Conn_Min': diff, 'Status': np.where(is_connected, 'Connected', 'Disconnect')
+        })]
 
     # 1. A -> B
     results.extend(analyze_one_direction(group_a_routes, group_a_ops, group_b_routes, group_b_ops, "Group A -> Group B"))
@@ -132,7 +151,7 @@ def analyze_connections_flexible(df, min_limit, max_limit,
 
     cols = ['Direction', 'Inbound_Route', 'Outbound_Route', 'Inbound_OPS', 'Outbound_OPS', 'Inbound_Flt_No', 'Outbound_Flt_No', 'From', 'Via', 'To', 'Inbound_Flight', 'Outbound_Flight', 'Hub_Arr_Time', 'Hub_Dep_Time', 'Conn_Min', 'Status']
     if not results: return pd.DataFrame(columns=cols)
-    return pd.DataFrame(results)[cols]
+    return pd.concat(results, ignore_index=True)[cols]
 
 # --- 메인 화면 로직 ---
 st.sidebar.header("⚙️ 분석 설정")
@@ -142,6 +161,11 @@ if uploaded_file is not None:
     try:
         df = load_data(uploaded_file)
         st.sidebar.success(f"✅ 파일 로드: {len(df)}건")
+        invalid_times = find_invalid_times(df)
+        if not invalid_times.empty:
+            st.sidebar.warning(f"⚠️ 시간 형식 오류 {len(invalid_times)}건 (분석 제외)")
+            with st.expander(f"⚠️ 시간 형식 오류 항공편 ({len(invalid_times)}건)", expanded=False):
+                st.dataframe(invalid_times, hide_index=True, use_container_width=True)
         
         all_routes = sorted(df['ROUTE'].unique().tolist())
         all_ops = sorted(df['OPS'].unique().tolist())
@@ -2,6 +2,23 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 
+from connection_counter import (
+    find_invalid_times, DiskCache, cached_load_data, is_ssim_file, DEFAULT_HUB,
+    expand_pairs, pair_keys,
+    PairTableCache, file_sha256, selection_key, find_hub_pairs, load_mct_rules, ODIndex, SummaryCube,
+    DetailView, PAGE_SIZES, DEFAULT_PAGE_SIZE, page_count,
+    EXPORT_FORMATS, available_formats, export_file_name, export_to_tempfile, ExportFiles,
+    frame_chunks, pair_chunks,
+    CHART_MAX_ROWS, CONN_BIN_MINUTES, scatter_points, hour_grid, histogram_bins,
+    REPORT_MIME, excel_available, excel_report_to_tempfile, analysis_report_sheets, comparison_report_sheets,
+    build_itineraries, itinerary_keys, expand_itineraries, DEFAULT_MAX_CONNECTIONS,
+    compare_schedules, compare_flights, ScheduleTimeline,
+    sweep_connections, ct_range, is_weekly,
+)
+
+# 업로드 가능한 스케줄 파일 (CSV, SSIM 또는 Excel. SSIM 은 헤더 레코드, Excel 은 ZIP 시그니처로 판별)
+SCHEDULE_FILE_TYPES = ["csv", "ssim", "txt", "dat", "xlsx"]
+
 # 페이지 기본 설정
 st.set_page_config(page_title="여객노선부 연결 분석기", layout="wide")
 
@@ -10,12 +27,12 @@ st.title("연결 스케줄 확인 앱 VER.2")
 # --- 모드 선택 ---
 analysis_mode = st.radio(
     "분석 모드 선택",
-    ["단일 스케줄 분석", "두 스케줄 비교 분석"],
+    ["단일 스케줄 분석", "두 스케줄 비교 분석", "다중 버전 타임라인", "MCT 민감도 분석"],
     horizontal=True
 )
 
 # --- [NOTICE] 데이터 작성 가이드 ---
-with st.expander("📢 [필독] 데이터 파일(CSV) 작성 양식 가이드", expanded=False):
+with st.expander("📢 [필독] 데이터 파일(CSV/XLSX) 작성 양식 가이드", expanded=False):
     st.markdown("""
     ##### 1. 필수 컬럼
     * **SEASON**: 시즌 (예: S26)
@@ -26,6 +43,8 @@ with st.expander("📢 [필독] 데이터 파일(CSV) 작성 양식 가이드",
     * **OPS**: 항공사 코드
     * **ROUTE**: 노선 구분 (예: 미주노선, 동남아노선) -> **그룹핑 기준 (필수)**
     * **구분**: `To ICN` (도착) / `From ICN` (출발)
+
+    Excel(.xlsx) 파일은 같은 컬럼이 있는 시트를 모두 읽습니다 (예: 시즌별 시트). 시간 셀은 HH:MM 형식이면 됩니다.
     """)
     
     example_data = pd.DataFrame({
@@ -38,256 +57,180 @@ with st.expander("📢 [필독] 데이터 파일(CSV) 작성 양식 가이드",
     st.dataframe(example_data, hide_index=True)
 
 # --- 데이터 로드 함수 ---
+@st.cache_resource
+def get_disk_cache():
+    """세션/서버 재시작과 무관하게 공유되는 디스크 캐시 (CONNECTION_COUNTER_CACHE_DIR 로 위치 지정)"""
+    return DiskCache()
+
 @st.cache_data
-def load_data(file):
-    encodings = ['utf-8', 'utf-8-sig', 'cp949', 'euc-kr']
-    for enc in encodings:
-        try:
-            file.seek(0)
-            df = pd.read_csv(file, encoding=enc)
-            
-            df.columns = df.columns.str.strip()
-            if 'DESTINATION' in df.columns:
-                df.rename(columns={'DESTINATION': 'DEST'}, inplace=True)
+def load_data(file, hub=DEFAULT_HUB):
+    """hub 는 SSIM 파일에서 읽을 허브 공항 (CSV/XLSX 는 무관, 디스크 캐시 키에 포함)"""
+    return cached_load_data(file, get_disk_cache(), hub)[0]
 
-            required = ['OPS', 'FLT NO', '구분', 'STD', 'STA', 'ORGN', 'DEST', 'ROUTE']
-            if not all(col in df.columns for col in required):
-                continue
-            
-            for col in ['구분', 'FLT NO', 'ROUTE', 'OPS', 'ORGN', 'DEST']:
-                if col in df.columns:
-                    df[col] = df[col].astype(str).str.strip()
-                    
-            return df
-        except:
-            continue
-    raise ValueError("파일을 읽을 수 없습니다. 인코딩 문제이거나 필수 컬럼이 누락되었습니다.")
-
-def time_to_minutes(t_str):
-    try:
-        h, m = map(int, t_str.split(':'))
-        return h * 60 + m
-    except:
+@st.cache_data
+def load_rules(file):
+    return load_mct_rules(file)
+
+def mct_rules_input(key):
+    """사이드바 MCT 규칙 CSV 업로드. (MctRules, 파일 해시), 업로드하지 않으면 (None, None)"""
+    mct_file = st.sidebar.file_uploader("📏 MCT 규칙 CSV (선택)", type=["csv"], key=key,
+                                        help="ARPT, STATUS(DD/DI/ID/II), ARR_OPS, DEP_OPS, CONN(ON/IL), MCT 컬럼. "
+                                             "빈 값/* 은 전체, 맞는 규칙이 없는 연결은 Min CT 를 적용합니다.")
+    if mct_file is None:
+        return None, None
+    mct_rules = load_rules(mct_file)
+    st.sidebar.info(f"📏 MCT 규칙 {len(mct_rules.rules)}건 적용")
+    return mct_rules, file_sha256(mct_file)
+
+def ssim_hubs(files, key):
+    """SSIM 파일은 허브 공항에 도착/출발하는 구간만 읽으므로 로드 전에 사이드바에서 허브를 입력받음
+
+    SSIM 파일이 없으면 None (CSV/XLSX 는 전체를 읽은 뒤 select_hubs 로 고름).
+    """
+    if not any(is_ssim_file(file) for file in files):
         return None
+    text = st.sidebar.text_input("🏢 허브 공항 (SSIM, 쉼표로 구분)", DEFAULT_HUB, key=key,
+                                 help="SSIM 파일은 입력한 공항에 도착/출발하는 구간만 읽습니다. 여러 개면 공항별로 병렬 분석합니다.")
+    return tuple(sorted({airport.strip().upper() for airport in text.split(',') if airport.strip()})) or (DEFAULT_HUB,)
 
-# --- 분석 로직 ---
-def analyze_connections_flexible(df, min_limit, max_limit, 
-                               group_a_routes, group_a_ops, 
-                               group_b_routes, group_b_ops):
-    results = []
-    
-    def analyze_one_direction(start_routes, start_ops, end_routes, end_ops, direction_label):
-        inbound = df[
-            (df['ROUTE'].isin(start_routes)) & 
-            (df['OPS'].isin(start_ops)) & 
-            (df['구분'] == 'To ICN')
-        ].copy()
-        
-        outbound = df[
-            (df['ROUTE'].isin(end_routes)) & 
-            (df['OPS'].isin(end_ops)) & 
-            (df['구분'] == 'From ICN')
-        ].copy()
+def select_hubs(frames, key, fixed=None):
+    """사이드바 허브 공항 선택 (도착/출발은 DEST/ORGN 이 허브인지로 판별, 여러 개면 공항별로 병렬 분석)
 
-        if inbound.empty or outbound.empty:
-            return []
+    fixed (ssim_hubs 로 로드 전에 정한 허브) 가 있으면 그 공항들을 그대로 사용한다.
+    """
+    if fixed:
+        return list(fixed)
+    airports = sorted(set().union(*(set(frame['DEST'].unique().tolist()) | set(frame['ORGN'].unique().tolist())
+                                    for frame in frames)))
+    default = ['ICN'] if 'ICN' in airports else airports[:1]
+    return st.sidebar.multiselect("🏢 허브 공항", airports, default=default, key=key,
+                                  help="여러 공항을 고르면 공항별로 같은 공항의 도착편/출발편끼리 연결합니다.")
 
-        local_results = []
-        merged = pd.merge(inbound.assign(k=1), outbound.assign(k=1), on='k', suffixes=('_IN', '_OUT'))
-        
-        for _, row in merged.iterrows():
-            arr = time_to_minutes(row['STA_IN'])
-            dep = time_to_minutes(row['STD_OUT'])
-            
-            if arr is not None and dep is not None:
-                diff = dep - arr
-                if diff < 0: diff += 1440
-                status = 'Connected' if min_limit <= diff <= max_limit else 'Disconnect'
-                
-                flt_in = f"{row['OPS_IN']}{row['FLT NO_IN']}"
-                flt_out = f"{row['OPS_OUT']}{row['FLT NO_OUT']}"
-
-                local_results.append({
-                    'Direction': direction_label,
-                    'Inbound_Route': row['ROUTE_IN'],
-                    'Outbound_Route': row['ROUTE_OUT'],
-                    'Inbound_OPS': row['OPS_IN'], 'Outbound_OPS': row['OPS_OUT'],
-                    'Inbound_Flt_No': flt_in, 'Outbound_Flt_No': flt_out,
-                    'From': row['ORGN_IN'], 
-                    'Via': 'ICN', 
-                    'To': row['DEST_OUT'],
-                    'Inbound_Flight': f"[{flt_in}] {row['ORGN_IN']}->{row['DEST_IN']} (Arr {row['STA_IN']})",
-                    'Outbound_Flight': f"[{flt_out}] {row['ORGN_OUT']}->{row['DEST_OUT']} (Dep {row['STD_OUT']})",
-                    'Hub_Arr_Time': row['STA_IN'], 'Hub_Dep_Time': row['STD_OUT'],
-                    'Arr_Min': arr, 'Dep_Min': dep,
-                    'Arr_Hour': arr / 60.0, 
-                    'Dep_Hour': dep / 60.0,
-                    'Conn_Min': diff, 'Status': status
-                })
-        return local_results
-
-    results.extend(analyze_one_direction(group_a_routes, group_a_ops, group_b_routes, group_b_ops, "Group A -> Group B"))
-
-    is_same_group = set(group_a_routes) == set(group_b_routes) and set(group_a_ops) == set(group_b_ops)
-    if not is_same_group:
-        results.extend(analyze_one_direction(group_b_routes, group_b_ops, group_a_routes, group_a_ops, "Group B -> Group A"))
-
-    cols = ['Direction', 'Inbound_Route', 'Outbound_Route', 'Inbound_OPS', 'Outbound_OPS', 'Inbound_Flt_No', 'Outbound_Flt_No', 'From', 'Via', 'To', 'Inbound_Flight', 'Outbound_Flight', 'Hub_Arr_Time', 'Hub_Dep_Time', 'Arr_Min', 'Dep_Min', 'Arr_Hour', 'Dep_Hour', 'Conn_Min', 'Status']
-    if not results: return pd.DataFrame(columns=cols)
-    return pd.DataFrame(results)[cols]
-
-
-# --- 비교 분석 함수 ---
-def compare_schedules(df1, df2, min_limit, max_limit, 
-                      group_a_routes, group_a_ops, 
-                      group_b_routes, group_b_ops):
-    """두 스케줄의 연결 분석 결과를 비교"""
-    
-    # 각 스케줄 분석
-    result1 = analyze_connections_flexible(df1, min_limit, max_limit, 
-                                           group_a_routes, group_a_ops, 
-                                           group_b_routes, group_b_ops)
-    result2 = analyze_connections_flexible(df2, min_limit, max_limit, 
-                                           group_a_routes, group_a_ops, 
-                                           group_b_routes, group_b_ops)
-    
-    # 연결 쌍 식별을 위한 키 생성
-    def create_connection_key(row):
-        return f"{row['Inbound_Flt_No']}_{row['Outbound_Flt_No']}_{row['From']}_{row['To']}"
-    
-    if not result1.empty:
-        result1['Connection_Key'] = result1.apply(create_connection_key, axis=1)
+
+def export_files():
+    """세션별 임시 내보내기 파일 (세션이 끝나 세션 상태가 정리되면 남은 파일도 삭제됨)"""
+    if 'export_files' not in st.session_state:
+        st.session_state['export_files'] = ExportFiles()
+    return st.session_state['export_files']
+
+
+def export_download(label, make_chunks, file_stem, key, data_key):
+    """내보내기 파일은 버튼을 눌렀을 때만 임시 파일에 청크 단위로 만들고, 그 실행에서만 다운로드 버튼으로 제공
+
+    make_chunks() 는 DataFrame 청크 iterable 을 돌려주는 함수. data_key 는 내보낼 데이터를 정하는 분석 조건으로,
+    형식/data_key 가 같으면 이미 만든 파일을 다시 쓰고 바뀌면 이전 파일을 바로 지운다.
+    """
+    fmt_col, make_col, download_col = st.columns([2, 2, 2])
+    fmt = fmt_col.selectbox(f"{label} 형식", available_formats(), format_func=lambda f: EXPORT_FORMATS[f][0],
+                            key=f"{key}_fmt", label_visibility="collapsed")
+    files = export_files()
+    path = files.current(key, (fmt, data_key))
+    if make_col.button(f"📦 {label} 파일 만들기", key=f"{key}_make"):
+        if path is None:
+            with st.spinner("파일 생성 중..."):
+                path = files.put(key, (fmt, data_key), export_to_tempfile(make_chunks(), fmt))
+        with open(path, 'rb') as handle:
+            download_col.download_button(f"💾 {label} 다운로드", handle, export_file_name(file_stem, fmt),
+                                         EXPORT_FORMATS[fmt][2], key=f"{key}_download")
+
+
+def report_download(make_sheets, file_stem, key, data_key):
+    """요약/상세 표를 시트별로 담은 Excel 보고서 (버튼을 눌렀을 때만 임시 파일로 만들어 그 실행에서만 제공)
+
+    make_sheets() 는 [(시트 이름, DataFrame 또는 청크 iterable), ...] 을 돌려주는 함수. data_key 는 export_download 와 같다.
+    """
+    if not excel_available():
+        return
+    make_col, download_col = st.columns(2)
+    files = export_files()
+    path = files.current(key, ('xlsx', data_key))
+    if make_col.button("📑 Excel 보고서 만들기", key=f"{key}_make"):
+        if path is None:
+            with st.spinner("보고서 생성 중..."):
+                path = files.put(key, ('xlsx', data_key), excel_report_to_tempfile(make_sheets()))
+        with open(path, 'rb') as handle:
+            download_col.download_button("💾 Excel 보고서 다운로드", handle, f"{file_stem}.xlsx", REPORT_MIME,
+                                         key=f"{key}_download")
+
+
+# 공항별 심층 분석 차트의 상세 툴팁 컬럼
+FLIGHT_TOOLTIP = ['Inbound_Flt_No', 'Outbound_Flt_No', 'Hub_Arr_Time', 'Hub_Dep_Time']
+
+def conn_scatter(data, place, place_title, flight, flight_title, title):
+    """공항별 연결 시간 분포. 행이 많으면 서버에서 (공항, 연결 시간 구간, 편명) 별 건수로 묶어 원 크기로 표시"""
+    points, aggregated = scatter_points(data, place, 'Conn_Min', flight, FLIGHT_TOOLTIP)
+    color = alt.Color('Color', title=flight_title, legend=alt.Legend(orient='bottom'))
+    if aggregated:
+        chart = alt.Chart(points).mark_circle().encode(
+            x=alt.X(place, title=place_title),
+            y=alt.Y('Conn_Min', title=f'연결 시간(분, {CONN_BIN_MINUTES}분 구간)'),
+            size=alt.Size('Count', title='연결 수'),
+            color=color,
+            tooltip=[place, 'Conn_Min', alt.Tooltip('Color', title=flight_title), 'Count']
+        )
     else:
-        result1['Connection_Key'] = []
-        
-    if not result2.empty:
-        result2['Connection_Key'] = result2.apply(create_connection_key, axis=1)
+        chart = alt.Chart(points).mark_circle(size=120).encode(
+            x=alt.X(place, title=place_title),
+            y=alt.Y('Conn_Min', title='연결 시간(분)'),
+            color=color,
+            tooltip=[place, 'Conn_Min'] + FLIGHT_TOOLTIP
+        )
+    return chart.properties(height=350, title=title).interactive()
+
+def hour_chart(data, place, place_title, flight):
+    """허브 도착 x 출발 시각 분포. 행이 많으면 서버에서 30분 격자별 건수로 묶어 히트맵으로 표시"""
+    hour_scale = alt.Scale(domain=[0, 24], nice=False)
+    grid, aggregated = hour_grid(data, flight, [place, 'Conn_Min'] + FLIGHT_TOOLTIP)
+    if aggregated:
+        chart = alt.Chart(grid).mark_rect().encode(
+            x=alt.X('Arr_Hour:Q', title='허브 도착 시간 (시)', scale=hour_scale, bin='binned'),
+            x2='Arr_Hour_End',
+            y=alt.Y('Dep_Hour:Q', title='허브 출발 시간 (시)', scale=hour_scale, bin='binned'),
+            y2='Dep_Hour_End',
+            color=alt.Color('Count:Q', title='연결 수'),
+            tooltip=[alt.Tooltip('Arr_Hour', title='허브 도착 (시)'), alt.Tooltip('Dep_Hour', title='허브 출발 (시)'),
+                     alt.Tooltip('Count', title='연결 수')]
+        )
     else:
-        result2['Connection_Key'] = []
-    
-    # Connected 상태만 추출
-    conn1 = set(result1[result1['Status'] == 'Connected']['Connection_Key'].tolist())
-    conn2 = set(result2[result2['Status'] == 'Connected']['Connection_Key'].tolist())
-    
-    # 차이 분석
-    only_in_1 = conn1 - conn2  # 스케줄1에만 있는 연결
-    only_in_2 = conn2 - conn1  # 스케줄2에만 있는 연결
-    common = conn1 & conn2     # 공통 연결
-    
-    # 상세 데이터프레임 생성
-    lost_connections = result1[
-        (result1['Connection_Key'].isin(only_in_1)) & 
-        (result1['Status'] == 'Connected')
-    ].copy()
-    lost_connections['Change_Type'] = '🔴 스케줄2에서 사라짐'
-    
-    new_connections = result2[
-        (result2['Connection_Key'].isin(only_in_2)) & 
-        (result2['Status'] == 'Connected')
-    ].copy()
-    new_connections['Change_Type'] = '🟢 스케줄2에서 새로 생김'
-    
-    # 공통 연결의 시간 변화 분석
-    common_df1 = result1[
-        (result1['Connection_Key'].isin(common)) & 
-        (result1['Status'] == 'Connected')
-    ][['Connection_Key', 'Conn_Min', 'Hub_Arr_Time', 'Hub_Dep_Time']].copy()
-    common_df1.columns = ['Connection_Key', 'Conn_Min_1', 'Arr_Time_1', 'Dep_Time_1']
-    
-    common_df2 = result2[
-        (result2['Connection_Key'].isin(common)) & 
-        (result2['Status'] == 'Connected')
-    ][['Connection_Key', 'Conn_Min', 'Hub_Arr_Time', 'Hub_Dep_Time']].copy()
-    common_df2.columns = ['Connection_Key', 'Conn_Min_2', 'Arr_Time_2', 'Dep_Time_2']
-    
-    time_changes = pd.merge(common_df1, common_df2, on='Connection_Key')
-    time_changes['Time_Diff'] = time_changes['Conn_Min_2'] - time_changes['Conn_Min_1']
-    time_changes = time_changes[time_changes['Time_Diff'] != 0]  # 변화 있는 것만
-    
-    return {
-        'result1': result1,
-        'result2': result2,
-        'lost_connections': lost_connections,
-        'new_connections': new_connections,
-        'time_changes': time_changes,
-        'stats': {
-            'total_conn_1': len(conn1),
-            'total_conn_2': len(conn2),
-            'lost': len(only_in_1),
-            'new': len(only_in_2),
-            'common': len(common),
-            'time_changed': len(time_changes)
-        }
-    }
-
-
-def compare_flights(df1, df2):
-    """두 스케줄의 항공편 자체를 비교"""
-    
-    def create_flight_key(row):
-        return f"{row['OPS']}{row['FLT NO']}_{row['ORGN']}_{row['DEST']}"
-    
-    df1_copy = df1.copy()
-    df2_copy = df2.copy()
-    
-    df1_copy['Flight_Key'] = df1_copy.apply(create_flight_key, axis=1)
-    df2_copy['Flight_Key'] = df2_copy.apply(create_flight_key, axis=1)
-    
-    flights1 = set(df1_copy['Flight_Key'].tolist())
-    flights2 = set(df2_copy['Flight_Key'].tolist())
-    
-    only_in_1 = flights1 - flights2
-    only_in_2 = flights2 - flights1
-    common = flights1 & flights2
-    
-    # 삭제된 항공편
-    removed_flights = df1_copy[df1_copy['Flight_Key'].isin(only_in_1)].copy()
-    removed_flights['Change_Type'] = '🔴 삭제됨'
-    
-    # 신규 항공편
-    added_flights = df2_copy[df2_copy['Flight_Key'].isin(only_in_2)].copy()
-    added_flights['Change_Type'] = '🟢 신규'
-    
-    # 시간 변경된 항공편
-    common_df1 = df1_copy[df1_copy['Flight_Key'].isin(common)][['Flight_Key', 'STD', 'STA', 'OPS', 'FLT NO', 'ORGN', 'DEST', 'ROUTE', '구분']].copy()
-    common_df2 = df2_copy[df2_copy['Flight_Key'].isin(common)][['Flight_Key', 'STD', 'STA']].copy()
-    
-    merged = pd.merge(common_df1, common_df2, on='Flight_Key', suffixes=('_OLD', '_NEW'))
-    time_changed = merged[
-        (merged['STD_OLD'] != merged['STD_NEW']) | 
-        (merged['STA_OLD'] != merged['STA_NEW'])
-    ].copy()
-    time_changed['Change_Type'] = '🟡 시간 변경'
-    
-    return {
-        'removed': removed_flights,
-        'added': added_flights,
-        'time_changed': time_changed,
-        'stats': {
-            'total_1': len(flights1),
-            'total_2': len(flights2),
-            'removed': len(only_in_1),
-            'added': len(only_in_2),
-            'common': len(common),
-            'time_changed': len(time_changed)
-        }
-    }
+        chart = alt.Chart(grid).mark_circle(size=100).encode(
+            x=alt.X('Arr_Hour', title='허브 도착 시간 (시)', scale=hour_scale),
+            y=alt.Y('Dep_Hour', title='허브 출발 시간 (시)', scale=hour_scale),
+            color=alt.Color('Color', legend=None),
+            tooltip=[
+                alt.Tooltip(place, title=place_title),
+                alt.Tooltip('Inbound_Flt_No', title='허브 도착편명'),
+                alt.Tooltip('Hub_Arr_Time', title='허브 도착시간'),
+                alt.Tooltip('Outbound_Flt_No', title='허브 출발편명'),
+                alt.Tooltip('Hub_Dep_Time', title='허브 출발시간'),
+                alt.Tooltip('Conn_Min', title='연결시간(분)')
+            ]
+        )
+    return chart.properties(height=350).interactive()
 
 
 # ==================== 단일 스케줄 분석 모드 ====================
 if analysis_mode == "단일 스케줄 분석":
     st.sidebar.header("⚙️ 분석 설정")
-    uploaded_file = st.sidebar.file_uploader("📂 데이터 파일 (CSV)", type="csv")
+    uploaded_file = st.sidebar.file_uploader("📂 데이터 파일 (CSV/SSIM/XLSX)", type=SCHEDULE_FILE_TYPES)
 
     if uploaded_file is not None:
         try:
-            df = load_data(uploaded_file)
+            pre_hubs = ssim_hubs([uploaded_file], 'ssim_hub')
+            df = load_data(uploaded_file, pre_hubs or DEFAULT_HUB)
             st.sidebar.success(f"✅ 파일 로드: {len(df)}건")
+            if is_weekly(df):
+                st.sidebar.info("📅 운항 요일/기간 컬럼 감지: 요일별 (주간) 기준으로 연결을 계산합니다.")
+            invalid_times = find_invalid_times(df)
+            if not invalid_times.empty:
+                st.sidebar.warning(f"⚠️ 시간 형식 오류 {len(invalid_times)}건 (분석 제외)")
+                with st.expander(f"⚠️ 시간 형식 오류 항공편 ({len(invalid_times)}건)", expanded=False):
+                    st.dataframe(invalid_times, hide_index=True, use_container_width=True)
             
             all_routes = sorted(df['ROUTE'].unique().tolist())
             all_ops = sorted(df['OPS'].unique().tolist())
             
             st.sidebar.markdown("---")
+            hubs = select_hubs([df], 'hub', pre_hubs)
             st.sidebar.subheader("📌 노선 그룹 매칭")
             
             default_route_a = [all_routes[0]] if all_routes else None
@@ -309,20 +252,58 @@ if analysis_mode == "단일 스케줄 분석":
             st.sidebar.markdown("---")
             min_mct = st.sidebar.number_input("Min CT (분)", 0, 300, 60, 5)
             max_ct = st.sidebar.number_input("Max CT (분)", 60, 2880, 300, 60)
+            mct_rules, rules_hash = mct_rules_input('mct_file')
+            
+            engine_mode = st.sidebar.radio("연결 탐색 방식", ["전체 쌍", "MCT 구간만"], horizontal=True,
+                                           help="MCT 구간만: Connected 쌍만 생성하여 대용량 스케줄에서도 메모리 사용이 적습니다.")
+            count_disconnect = False
+            if engine_mode == "MCT 구간만":
+                count_disconnect = st.sidebar.checkbox("Disconnect 건수 집계", value=True,
+                                                       help="Disconnect 쌍은 목록 없이 건수만 요약에 표시합니다.")
+            
+            # 같은 파일/노선 선택이면 Conn_Min 쌍 테이블을 재사용 (세션별 캐시)
+            pair_cache = st.session_state.setdefault('pair_cache', PairTableCache(disk_cache=get_disk_cache()))
+            schedule_hash = file_sha256(uploaded_file)
+            analysis_key = (schedule_hash, selection_key(routes_a, ops_a, routes_b, ops_b), tuple(sorted(hubs)), engine_mode,
+                            rules_hash)
             
             if st.button("🚀 분석 시작", type="primary"):
                 if not routes_a or not routes_b:
                     st.error("그룹 노선을 선택해주세요.")
+                elif not hubs:
+                    st.error("허브 공항을 선택해주세요.")
                 else:
                     with st.spinner("분석 중..."):
-                        result_df = analyze_connections_flexible(df, min_mct, max_ct, routes_a, ops_a, routes_b, ops_b)
-                        st.session_state['analysis_result'] = result_df
+                        if engine_mode == "MCT 구간만":
+                            # 허브 공항별로 나누어 병렬 계산 (허브가 하나면 그대로 순차 실행)
+                            pairs = find_hub_pairs(
+                                df, hubs, min_mct, max_ct, routes_a, ops_a, routes_b, ops_b,
+                                engine='window', count_disconnect=count_disconnect, mct_rules=mct_rules
+                            )
+                        else:
+                            pairs = pair_cache.analyze(df, schedule_hash, min_mct, max_ct,
+                                                       routes_a, ops_a, routes_b, ops_b, hub=hubs, mct_rules=mct_rules)
+                        st.session_state['analysis_result'] = pairs
+                        st.session_state['analysis_hubs'] = hubs
+                        st.session_state['analysis_schedule'] = df
                         st.session_state['analysis_done'] = True
+                        st.session_state['analysis_key'] = (analysis_key, min_mct, max_ct)
                         st.session_state['group_names'] = (", ".join(routes_a), ", ".join(routes_b))
+            elif st.session_state.get('analysis_done') and engine_mode == "전체 쌍":
+                # Min/Max CT 만 바뀐 경우: 캐시된 쌍의 Status 만 재분류 (버튼 없이 즉시 반영)
+                prev_key, prev_min, prev_max = st.session_state.get('analysis_key', (None, None, None))
+                if prev_key == analysis_key and (prev_min, prev_max) != (min_mct, max_ct):
+                    st.session_state['analysis_result'] = pair_cache.analyze(df, schedule_hash, min_mct, max_ct,
+                                                                             routes_a, ops_a, routes_b, ops_b, hub=hubs,
+                                                                             mct_rules=mct_rules)
+                    st.session_state['analysis_key'] = (analysis_key, min_mct, max_ct)
 
             if 'analysis_done' in st.session_state and st.session_state['analysis_done']:
-                result_df = st.session_state['analysis_result']
+                # 압축 쌍 테이블에 요약용 키 컬럼만 붙이고, 표시 문자열은 목록/차트에 보여줄 행만 생성
+                schedule = st.session_state.get('analysis_schedule', df)
+                result_df = pair_keys(schedule, st.session_state['analysis_result'])
                 g_name_a, g_name_b = st.session_state.get('group_names', ("A", "B"))
+                analysis_hubs = st.session_state.get('analysis_hubs', ['ICN'])
                 
                 if result_df.empty:
                     st.warning("조건에 맞는 연결편이 없습니다.")
@@ -332,18 +313,16 @@ if analysis_mode == "단일 스케줄 분석":
                     with tab1:
                         st.info(f"💡 **분석 기준**: [{g_name_a}] ↔ [{g_name_b}]")
                         
-                        st.markdown("#### 1️⃣ 노선/항공사별 통합 연결 상세")
+                        # 요약 표/차트는 분석 결과마다 한 번 만든 요약 큐브에서 계산 (상세 쌍을 다시 묶지 않음)
+                        if st.session_state.get('summary_cube_key') != st.session_state['analysis_key']:
+                            st.session_state['summary_cube'] = SummaryCube(schedule, st.session_state['analysis_result'])
+                            st.session_state['summary_cube_key'] = st.session_state['analysis_key']
+                        cube = st.session_state['summary_cube']
                         
-                        combined_summary = result_df.groupby([
-                            'Inbound_Route', 'Inbound_OPS', 
-                            'Outbound_Route', 'Outbound_OPS', 
-                            'Status'
-                        ]).size().unstack(fill_value=0)
+                        st.markdown("#### 1️⃣ 노선/항공사별 통합 연결 상세")
                         
-                        if 'Connected' not in combined_summary.columns:
-                            combined_summary['Connected'] = 0
-                        if 'Disconnect' not in combined_summary.columns:
-                            combined_summary['Disconnect'] = 0
+                        # MCT 구간만 모드의 Disconnect 는 집계된 건수
+                        combined_summary = cube.counts(['Inbound_Route', 'Inbound_OPS', 'Outbound_Route', 'Outbound_OPS'])
                             
                         combined_summary['Total'] = combined_summary['Connected'] + combined_summary['Disconnect']
                         combined_summary = combined_summary.sort_values(by='Connected', ascending=False)
@@ -355,29 +334,93 @@ if analysis_mode == "단일 스케줄 분석":
                         col1, col2 = st.columns(2)
                         with col1:
                             st.markdown("##### 2️⃣ 전체 방향별 합계")
-                            st.dataframe(result_df.groupby(['Direction', 'Status']).size().unstack(fill_value=0), use_container_width=True)
+                            st.dataframe(cube.counts(['Direction']), use_container_width=True)
+                            if len(analysis_hubs) > 1:
+                                st.markdown("##### 허브 공항별 합계")
+                                st.dataframe(cube.counts(['Via']), use_container_width=True)
+                            if 'MCT_Rule' in cube.keys:
+                                st.markdown("##### 적용 MCT 규칙별 합계")
+                                st.dataframe(cube.counts(['MCT_Rule']), use_container_width=True)
                         with col2:
                             st.markdown("##### 3️⃣ 평균 연결 시간 (Connected 기준)")
-                            connected = result_df[result_df['Status']=='Connected']
-                            if not connected.empty:
-                                st.dataframe(connected.groupby('Direction')['Conn_Min'].mean().round(1), use_container_width=True)
+                            conn_stats = cube.conn_stats(['Direction'])
+                            if not conn_stats.empty:
+                                st.dataframe(conn_stats.round(1), use_container_width=True)
+                                conn_hist = alt.Chart(cube.histogram(['Direction'])).mark_bar().encode(
+                                    x=alt.X('Bin_Start:Q', title=f'연결 시간 (분, {cube.bin_minutes}분 단위)', bin='binned'),
+                                    x2=alt.X2('Bin_End:Q'),
+                                    y=alt.Y('Count:Q', title='연결 수', stack=None),
+                                    color=alt.Color('Direction:N', title='방향', legend=alt.Legend(orient='bottom')),
+                                    tooltip=['Direction', 'Bin_Start', 'Count']
+                                ).transform_calculate(Bin_End=f'datum.Bin_Start + {cube.bin_minutes}').properties(height=250)
+                                st.altair_chart(conn_hist, use_container_width=True)
+
+                        st.markdown("---")
+                        st.markdown("##### 📑 분석 보고서 (요약 표 + 연결 리스트)")
+                        report_disconnect = st.checkbox("보고서에 Disconnect 목록 포함", key='report_disconnect')
+                        report_download(lambda: analysis_report_sheets(schedule, st.session_state['analysis_result'], cube,
+                                                                       None if report_disconnect else ['Connected']),
+                                        "connection_report", 'report_analysis',
+                                        (st.session_state['analysis_key'], report_disconnect))
 
                     with tab2:
                         st.markdown("#### 상세 연결 리스트")
-                        status_filter = st.multiselect("상태 필터", ['Connected', 'Disconnect'], default=['Connected'], key='sf')
-                        view_df = result_df[result_df['Status'].isin(status_filter)].sort_values(['Direction', 'Conn_Min'])
-                        st.dataframe(view_df, use_container_width=True, hide_index=True)
-                        csv = view_df.to_csv(index=False).encode('utf-8-sig')
-                        st.download_button("💾 CSV 다운로드", csv, "connection_analysis.csv", "text/csv")
+
+                        # 필터/검색/정렬은 압축 쌍 테이블에서 처리하고, 화면에는 현재 페이지의 쌍만 펼쳐서 보냄
+                        if st.session_state.get('detail_view_key') != st.session_state['analysis_key']:
+                            st.session_state['detail_view'] = DetailView(schedule, st.session_state['analysis_result'])
+                            st.session_state['detail_view_key'] = st.session_state['analysis_key']
+                        detail_view = st.session_state['detail_view']
+
+                        f1, f2, f3 = st.columns([2, 2, 3])
+                        status_filter = f1.multiselect("상태 필터", ['Connected', 'Disconnect'], default=['Connected'], key='sf')
+                        direction_filter = f2.multiselect("방향", detail_view.directions, default=detail_view.directions,
+                                                          key='detail_dir')
+                        search = f3.text_input("검색 (편명/공항/노선/항공사, 공백으로 여러 단어)", key='detail_search')
+                        conn_low, conn_high = detail_view.conn_bounds
+                        conn_high = max(conn_high, conn_low + 1)
+                        conn_range = st.slider("연결 시간 (분)", conn_low, conn_high, (conn_low, conn_high))
+                        s1, s2, s3 = st.columns([3, 1, 2])
+                        sort_column = s1.selectbox("정렬 기준", detail_view.sort_columns, key='detail_sort')
+                        descending = s2.checkbox("내림차순", key='detail_desc')
+                        page_size = s3.selectbox("페이지 크기", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE),
+                                                 key='detail_page_size')
+
+                        selection = detail_view.select(status_filter, direction_filter, conn_range, search, sort_column, descending)
+                        n_pages = page_count(len(selection), page_size)
+                        page_no = st.number_input(f"페이지 (전체 {n_pages:,})", min_value=1, max_value=n_pages, value=1, step=1)
+                        first = (page_no - 1) * page_size
+                        st.caption(f"{len(selection):,}건 중 {min(first + 1, len(selection)):,} - {min(first + page_size, len(selection)):,}")
+                        st.dataframe(detail_view.page(selection, page_no, page_size), use_container_width=True, hide_index=True)
+                        export_download("연결 리스트", lambda: pair_chunks(schedule, detail_view.selected_pairs(selection)),
+                                        "connection_analysis", 'export_pairs',
+                                        (st.session_state['analysis_key'], tuple(status_filter), tuple(direction_filter),
+                                         conn_range, search.strip(), sort_column, descending))
 
                     with tab3:
                         st.markdown("### 🏙️ 공항 기준 연결성 분석")
                         
-                        src_a = result_df[result_df['Direction'] == 'Group A -> Group B']['From'].unique()
-                        dst_a = result_df[result_df['Direction'] == 'Group B -> Group A']['To'].unique()
+                        # O&D 인덱스는 분석 결과마다 한 번만 만들고, 공항 선택은 인덱스 구간 슬라이스로 처리
+                        if st.session_state.get('od_index_key') != st.session_state['analysis_key']:
+                            st.session_state['od_index'] = ODIndex(schedule, st.session_state['analysis_result'])
+                            st.session_state['od_index_key'] = st.session_state['analysis_key']
+                        od_index = st.session_state['od_index']
                         
-                        candidates = set(src_a) | set(dst_a)
-                        if 'ICN' in candidates: candidates.remove('ICN')
+                        if len(od_index.table):
+                            st.markdown("#### 🗺️ 출발지 × 도착지 연결 히트맵")
+                            od_direction = st.radio("방향", list(od_index.directions), horizontal=True, key='od_dir')
+                            # O&D 칸이 차트 행 한도를 넘으면 연결이 많은 O&D 만 표시
+                            od_matrix = od_index.matrix(od_direction).nlargest(CHART_MAX_ROWS, 'Connections')
+                            heatmap = alt.Chart(od_matrix).mark_rect().encode(
+                                x=alt.X('To:N', title='도착지'),
+                                y=alt.Y('From:N', title='출발지'),
+                                color=alt.Color('Connections:Q', title='연결 수'),
+                                tooltip=['From', 'To', 'Connections', 'Min_Conn', 'Median_Conn']
+                            ).properties(height=400)
+                            st.altair_chart(heatmap, use_container_width=True)
+                        
+                        candidates = set(od_index.origins('Group A -> Group B')) | set(od_index.destinations('Group B -> Group A'))
+                        candidates -= set(analysis_hubs)
                         airport_list = sorted(list(candidates))
                         
                         if not airport_list:
@@ -385,77 +428,71 @@ if analysis_mode == "단일 스케줄 분석":
                         else:
                             st.markdown(f"**그룹 A ({g_name_a}) 소속 공항 선택**")
                             selected_airport = st.selectbox("📍 공항 선택", airport_list)
-                            connected_data = result_df[result_df['Status']=='Connected']
                             
                             c1, c2 = st.columns(2)
                             
                             with c1:
                                 st.markdown(f"#### 🛫 {selected_airport} → 그룹 B")
-                                out_df = connected_data[
-                                    (connected_data['Direction'] == 'Group A -> Group B') & 
-                                    (connected_data['From'] == selected_airport)
-                                ].sort_values('Conn_Min')
+                                out_df = od_index.departures('Group A -> Group B', selected_airport).sort_values('Conn_Min', kind='stable')
+                                out_df = expand_pairs(schedule, out_df)
                                 
                                 if out_df.empty:
                                     st.info("연결편 없음")
                                 else:
-                                    base_chart = alt.Chart(out_df).mark_circle(size=120).encode(
-                                        x=alt.X('To', title='도착지 (그룹 B)'),
-                                        y=alt.Y('Conn_Min', title='연결 시간(분)'),
-                                        color=alt.Color('Inbound_Flt_No', title='ICN 도착편명', legend=alt.Legend(orient='bottom')),
-                                        tooltip=['To', 'Conn_Min', 'Inbound_Flt_No', 'Outbound_Flt_No', 'Hub_Arr_Time', 'Hub_Dep_Time']
-                                    ).properties(height=350, title="목적지별 연결 시간 분포").interactive()
-                                    st.altair_chart(base_chart, use_container_width=True)
+                                    st.altair_chart(conn_scatter(out_df, 'To', '도착지 (그룹 B)', 'Inbound_Flt_No', '허브 도착편명', "목적지별 연결 시간 분포"),
+                                                    use_container_width=True)
                                     
                                     st.markdown("##### ⏱️ Hub 출/도착 시간 분포 (24h)")
-                                    time_chart = alt.Chart(out_df).mark_circle(size=100).encode(
-                                        x=alt.X('Arr_Hour', title='ICN 도착 시간 (시)', scale=alt.Scale(domain=[0, 24], nice=False)),
-                                        y=alt.Y('Dep_Hour', title='ICN 출발 시간 (시)', scale=alt.Scale(domain=[0, 24], nice=False)),
-                                        color=alt.Color('Inbound_Flt_No', legend=None),
-                                        tooltip=[
-                                            alt.Tooltip('To', title='도착지'),
-                                            alt.Tooltip('Inbound_Flt_No', title='ICN 도착편명'),
-                                            alt.Tooltip('Hub_Arr_Time', title='ICN 도착시간'),
-                                            alt.Tooltip('Outbound_Flt_No', title='ICN 출발편명'),
-                                            alt.Tooltip('Hub_Dep_Time', title='ICN 출발시간'),
-                                            alt.Tooltip('Conn_Min', title='연결시간(분)')
-                                        ]
-                                    ).properties(height=350).interactive()
-                                    st.altair_chart(time_chart, use_container_width=True)
+                                    st.altair_chart(hour_chart(out_df, 'To', '도착지', 'Inbound_Flt_No'), use_container_width=True)
 
                             with c2:
                                 st.markdown(f"#### 🛬 그룹 B → {selected_airport}")
-                                in_df = connected_data[
-                                    (connected_data['Direction'] == 'Group B -> Group A') & 
-                                    (connected_data['To'] == selected_airport)
-                                ].sort_values('Conn_Min')
+                                in_df = od_index.arrivals('Group B -> Group A', selected_airport).sort_values('Conn_Min', kind='stable')
+                                in_df = expand_pairs(schedule, in_df)
                                 
                                 if in_df.empty:
                                     st.info("연결편 없음")
                                 else:
-                                    base_chart = alt.Chart(in_df).mark_circle(size=120).encode(
-                                        x=alt.X('From', title='출발지 (그룹 B)'),
-                                        y=alt.Y('Conn_Min', title='연결 시간(분)'),
-                                        color=alt.Color('Outbound_Flt_No', title='ICN 출발편명', legend=alt.Legend(orient='bottom')),
-                                        tooltip=['From', 'Conn_Min', 'Inbound_Flt_No', 'Outbound_Flt_No', 'Hub_Arr_Time', 'Hub_Dep_Time']
-                                    ).properties(height=350, title="출발지별 연결 시간 분포").interactive()
-                                    st.altair_chart(base_chart, use_container_width=True)
+                                    st.altair_chart(conn_scatter(in_df, 'From', '출발지 (그룹 B)', 'Outbound_Flt_No', '허브 출발편명', "출발지별 연결 시간 분포"),
+                                                    use_container_width=True)
                                     
                                     st.markdown("##### ⏱️ Hub 출/도착 시간 분포 (24h)")
-                                    time_chart = alt.Chart(in_df).mark_circle(size=100).encode(
-                                        x=alt.X('Arr_Hour', title='ICN 도착 시간 (시)', scale=alt.Scale(domain=[0, 24], nice=False)),
-                                        y=alt.Y('Dep_Hour', title='ICN 출발 시간 (시)', scale=alt.Scale(domain=[0, 24], nice=False)),
-                                        color=alt.Color('Outbound_Flt_No', legend=None),
-                                        tooltip=[
-                                            alt.Tooltip('From', title='출발지'),
-                                            alt.Tooltip('Inbound_Flt_No', title='ICN 도착편명'),
-                                            alt.Tooltip('Hub_Arr_Time', title='ICN 도착시간'),
-                                            alt.Tooltip('Outbound_Flt_No', title='ICN 출발편명'),
-                                            alt.Tooltip('Hub_Dep_Time', title='ICN 출발시간'),
-                                            alt.Tooltip('Conn_Min', title='연결시간(분)')
-                                        ]
-                                    ).properties(height=350).interactive()
-                                    st.altair_chart(time_chart, use_container_width=True)
+                                    st.altair_chart(hour_chart(in_df, 'From', '출발지', 'Outbound_Flt_No'), use_container_width=True)
+
+                            st.markdown("---")
+                            st.markdown(f"#### 🧭 {selected_airport} 출발 다구간 여정 (허브 환승)")
+                            ic1, ic2 = st.columns(2)
+                            max_connections = ic1.slider("최대 환승 횟수", 1, 3, DEFAULT_MAX_CONNECTIONS, key='itin_k')
+                            max_total_conn = ic2.number_input("환승 대기 합계 상한 (분)", 60, 4320, 600, 60, key='itin_total')
+                            # 같은 분석/공항/조건이면 탐색 결과를 재사용 (세션별)
+                            itinerary_key = (st.session_state.get('analysis_key'), min_mct, max_ct, rules_hash,
+                                             selected_airport, max_connections, max_total_conn)
+                            if st.session_state.get('itinerary_key') != itinerary_key:
+                                with st.spinner("여정 탐색 중..."):
+                                    st.session_state['itineraries'] = itinerary_keys(schedule, build_itineraries(
+                                        schedule, analysis_hubs, max_connections, min_mct, max_ct,
+                                        max_total_conn=max_total_conn, mct_rules=mct_rules, origins=[selected_airport]))
+                                st.session_state['itinerary_key'] = itinerary_key
+                            itineraries = st.session_state['itineraries']
+
+                            if itineraries.empty:
+                                st.info("여정 없음")
+                            else:
+                                reach = itineraries.groupby(['To', 'Connections'], observed=True).agg(
+                                    Itineraries=('Total_Conn_Min', 'size'), Min_Total_Conn=('Total_Conn_Min', 'min')
+                                ).reset_index()
+                                reach_chart = alt.Chart(reach).mark_bar().encode(
+                                    x=alt.X('To', title='최종 도착지', sort='-y'),
+                                    y=alt.Y('Itineraries', title='여정 수'),
+                                    color=alt.Color('Connections:N', title='환승 횟수'),
+                                    tooltip=['To', 'Connections', 'Itineraries', 'Min_Total_Conn']
+                                ).properties(height=350, title="도착지별 여정 수").interactive()
+                                st.altair_chart(reach_chart, use_container_width=True)
+
+                                st.markdown("##### 도착지/환승 공항별 환승 대기가 짧은 여정 (최대 5개)")
+                                shortest = itineraries.sort_values('Total_Conn_Min').groupby(['To', 'Via'], observed=True).head(5)
+                                st.dataframe(expand_itineraries(schedule, shortest.sort_values(['To', 'Total_Conn_Min'])),
+                                             use_container_width=True, hide_index=True)
 
         except Exception as e:
             st.error(f"오류가 발생했습니다: {e}")
@@ -471,22 +508,33 @@ elif analysis_mode == "두 스케줄 비교 분석":
     st.sidebar.header("⚙️ 비교 분석 설정")
     
     st.sidebar.markdown("### 📁 스케줄 파일 업로드")
-    file1 = st.sidebar.file_uploader("📂 스케줄 1 (기준/Before)", type="csv", key="file1")
-    file2 = st.sidebar.file_uploader("📂 스케줄 2 (비교/After)", type="csv", key="file2")
+    file1 = st.sidebar.file_uploader("📂 스케줄 1 (기준/Before)", type=SCHEDULE_FILE_TYPES, key="file1")
+    file2 = st.sidebar.file_uploader("📂 스케줄 2 (비교/After)", type=SCHEDULE_FILE_TYPES, key="file2")
     
     if file1 is not None and file2 is not None:
         try:
-            df1 = load_data(file1)
-            df2 = load_data(file2)
+            pre_hubs = ssim_hubs([file1, file2], 'cmp_ssim_hub')
+            df1 = load_data(file1, pre_hubs or DEFAULT_HUB)
+            df2 = load_data(file2, pre_hubs or DEFAULT_HUB)
             
             st.sidebar.success(f"✅ 스케줄 1: {len(df1)}건")
             st.sidebar.success(f"✅ 스케줄 2: {len(df2)}건")
             
+            for label, sched_df in [("스케줄 1", df1), ("스케줄 2", df2)]:
+                if is_weekly(sched_df):
+                    st.sidebar.info(f"📅 {label}: 운항 요일/기간 컬럼 감지 (요일별 기준으로 비교)")
+                invalid_times = find_invalid_times(sched_df)
+                if not invalid_times.empty:
+                    st.sidebar.warning(f"⚠️ {label} 시간 형식 오류 {len(invalid_times)}건 (분석 제외)")
+                    with st.expander(f"⚠️ {label} 시간 형식 오류 항공편 ({len(invalid_times)}건)", expanded=False):
+                        st.dataframe(invalid_times, hide_index=True, use_container_width=True)
+            
             # 두 파일의 노선/항공사 통합
             all_routes = sorted(set(df1['ROUTE'].unique().tolist() + df2['ROUTE'].unique().tolist()))
             all_ops = sorted(set(df1['OPS'].unique().tolist() + df2['OPS'].unique().tolist()))
             
             st.sidebar.markdown("---")
+            hubs = select_hubs([df1, df2], 'cmp_hub', pre_hubs)
             st.sidebar.subheader("📌 노선 그룹 매칭")
             
             default_route_a = [all_routes[0]] if all_routes else None
@@ -508,28 +556,36 @@ elif analysis_mode == "두 스케줄 비교 분석":
             st.sidebar.markdown("---")
             min_mct = st.sidebar.number_input("Min CT (분)", 0, 300, 60, 5, key='cmp_min')
             max_ct = st.sidebar.number_input("Max CT (분)", 60, 2880, 300, 60, key='cmp_max')
+            mct_rules, rules_hash = mct_rules_input('cmp_mct_file')
             
             if st.button("🔍 비교 분석 시작", type="primary"):
                 if not routes_a or not routes_b:
                     st.error("그룹 노선을 선택해주세요.")
+                elif not hubs:
+                    st.error("허브 공항을 선택해주세요.")
                 else:
                     with st.spinner("비교 분석 중..."):
                         # 연결 비교
                         conn_comparison = compare_schedules(
                             df1, df2, min_mct, max_ct,
-                            routes_a, ops_a, routes_b, ops_b
+                            routes_a, ops_a, routes_b, ops_b, hub=hubs, mct_rules=mct_rules
                         )
                         # 항공편 비교
                         flight_comparison = compare_flights(df1, df2)
                         
                         st.session_state['conn_comparison'] = conn_comparison
                         st.session_state['flight_comparison'] = flight_comparison
+                        # 내보내기 파일 캐시 키: 비교한 두 파일 내용과 분석 조건
+                        st.session_state['comparison_key'] = (file_sha256(file1), file_sha256(file2), min_mct, max_ct,
+                                                              selection_key(routes_a, ops_a, routes_b, ops_b),
+                                                              tuple(sorted(hubs)), rules_hash)
                         st.session_state['comparison_done'] = True
                         st.session_state['cmp_group_names'] = (", ".join(routes_a), ", ".join(routes_b))
             
             if 'comparison_done' in st.session_state and st.session_state['comparison_done']:
                 conn_cmp = st.session_state['conn_comparison']
                 flt_cmp = st.session_state['flight_comparison']
+                comparison_key = st.session_state['comparison_key']
                 g_name_a, g_name_b = st.session_state.get('cmp_group_names', ("A", "B"))
                 
                 tab1, tab2, tab3, tab4 = st.tabs([
@@ -620,6 +676,11 @@ elif analysis_mode == "두 스케줄 비교 분석":
                             ), legend=None)
                         ).properties(title='연결 변경', height=250)
                         st.altair_chart(chart, use_container_width=True)
+                    
+                    st.markdown("---")
+                    st.markdown("##### 📑 비교 보고서 (요약 + 항공편/연결 변경 상세)")
+                    report_download(lambda: comparison_report_sheets(conn_cmp, flt_cmp), "schedule_comparison",
+                                    'report_compare', comparison_key)
                 
                 with tab2:
                     st.markdown("## ✈️ 항공편 변경 상세")
@@ -634,8 +695,8 @@ elif analysis_mode == "두 스케줄 비교 분석":
                                 flt_cmp['removed'][['OPS', 'FLT NO', 'ORGN', 'DEST', 'STD', 'STA', 'ROUTE', '구분']],
                                 hide_index=True, use_container_width=True
                             )
-                            csv = flt_cmp['removed'].to_csv(index=False).encode('utf-8-sig')
-                            st.download_button("💾 삭제 항공편 CSV", csv, "removed_flights.csv", "text/csv")
+                            export_download("삭제 항공편", lambda: frame_chunks(flt_cmp['removed']), "removed_flights",
+                                            'export_removed_flights', comparison_key)
                     
                     with sub_tab2:
                         if flt_cmp['added'].empty:
@@ -645,8 +706,8 @@ elif analysis_mode == "두 스케줄 비교 분석":
                                 flt_cmp['added'][['OPS', 'FLT NO', 'ORGN', 'DEST', 'STD', 'STA', 'ROUTE', '구분']],
                                 hide_index=True, use_container_width=True
                             )
-                            csv = flt_cmp['added'].to_csv(index=False).encode('utf-8-sig')
-                            st.download_button("💾 신규 항공편 CSV", csv, "added_flights.csv", "text/csv")
+                            export_download("신규 항공편", lambda: frame_chunks(flt_cmp['added']), "added_flights",
+                                            'export_added_flights', comparison_key)
                     
                     with sub_tab3:
                         if flt_cmp['time_changed'].empty:
@@ -658,8 +719,8 @@ elif analysis_mode == "두 스케줄 비교 분석":
                                 flt_cmp['time_changed'][display_cols],
                                 hide_index=True, use_container_width=True
                             )
-                            csv = flt_cmp['time_changed'].to_csv(index=False).encode('utf-8-sig')
-                            st.download_button("💾 시간변경 항공편 CSV", csv, "time_changed_flights.csv", "text/csv")
+                            export_download("시간변경 항공편", lambda: frame_chunks(flt_cmp['time_changed']), "time_changed_flights",
+                                            'export_time_changed_flights', comparison_key)
                 
                 with tab3:
                     st.markdown("## 🔗 연결 변경 상세")
@@ -676,8 +737,8 @@ elif analysis_mode == "두 스케줄 비교 분석":
                                           'Inbound_Flt_No', 'Outbound_Flt_No',
                                           'Hub_Arr_Time', 'Hub_Dep_Time', 'Conn_Min']
                             st.dataframe(lost[display_cols], hide_index=True, use_container_width=True)
-                            csv = lost.to_csv(index=False).encode('utf-8-sig')
-                            st.download_button("💾 사라진 연결 CSV", csv, "lost_connections.csv", "text/csv")
+                            export_download("사라진 연결", lambda: frame_chunks(lost), "lost_connections",
+                                            'export_lost_connections', comparison_key)
                     
                     with sub_tab2:
                         new = conn_cmp['new_connections']
@@ -689,8 +750,8 @@ elif analysis_mode == "두 스케줄 비교 분석":
                                           'Inbound_Flt_No', 'Outbound_Flt_No',
                                           'Hub_Arr_Time', 'Hub_Dep_Time', 'Conn_Min']
                             st.dataframe(new[display_cols], hide_index=True, use_container_width=True)
-                            csv = new.to_csv(index=False).encode('utf-8-sig')
-                            st.download_button("💾 새로운 연결 CSV", csv, "new_connections.csv", "text/csv")
+                            export_download("새로운 연결", lambda: frame_chunks(new), "new_connections",
+                                            'export_new_connections', comparison_key)
                 
                 with tab4:
                     st.markdown("## ⏱️ 연결 시간 변경 상세")
@@ -733,19 +794,23 @@ elif analysis_mode == "두 스케줄 비교 분석":
                         # 시각화
                         st.markdown("### 📈 연결 시간 변화 분포")
                         
-                        hist_chart = alt.Chart(time_changes).mark_bar().encode(
-                            x=alt.X('Time_Diff:Q', bin=alt.Bin(maxbins=20), title='시간 변화 (분)'),
-                            y=alt.Y('count()', title='건수'),
+                        # 구간별 건수는 서버에서 계산 (변경 건수와 무관하게 최대 20개 막대만 전송)
+                        hist_chart = alt.Chart(histogram_bins(time_changes['Time_Diff'], max_bins=20)).mark_bar().encode(
+                            x=alt.X('Bin_Start:Q', bin='binned', title='시간 변화 (분)'),
+                            x2='Bin_End',
+                            y=alt.Y('Count:Q', title='건수'),
+                            tooltip=[alt.Tooltip('Bin_Start', title='시작 (분)'), alt.Tooltip('Bin_End', title='끝 (분)'),
+                                     alt.Tooltip('Count', title='건수')],
                             color=alt.condition(
-                                alt.datum.Time_Diff > 0,
+                                alt.datum.Bin_Start >= 0,
                                 alt.value('#51cf66'),  # 증가: 녹색
                                 alt.value('#ff6b6b')   # 감소: 빨강
                             )
                         ).properties(height=300, title='연결 시간 변화 분포')
                         st.altair_chart(hist_chart, use_container_width=True)
                         
-                        csv = time_changes.to_csv(index=False).encode('utf-8-sig')
-                        st.download_button("💾 시간 변경 CSV", csv, "time_changes.csv", "text/csv")
+                        export_download("시간 변경", lambda: frame_chunks(time_changes), "time_changes",
+                                        'export_time_changes', comparison_key)
                         
         except Exception as e:
             st.error(f"오류가 발생했습니다: {e}")
@@ -774,4 +839,195 @@ elif analysis_mode == "두 스케줄 비교 분석":
         3. **시각화**
            - 변경 요약 차트
            - 연결 시간 변화 분포
-        """)
\ No newline at end of file
+        """)
+
+# ==================== 다중 버전 타임라인 모드 ====================
+elif analysis_mode == "다중 버전 타임라인":
+    st.sidebar.header("⚙️ 타임라인 설정")
+    version_files = st.sidebar.file_uploader("📂 스케줄 버전 파일 (CSV/SSIM/XLSX, 여러 개)", type=SCHEDULE_FILE_TYPES,
+                                             accept_multiple_files=True, key="tl_files")
+
+    if version_files and len(version_files) >= 2:
+        try:
+            sort_by_name = st.sidebar.checkbox("파일 이름 순으로 정렬", value=True, key='tl_sort',
+                                               help="해제하면 업로드한 순서를 버전 순서로 사용합니다.")
+            if sort_by_name:
+                version_files = sorted(version_files, key=lambda f: f.name)
+            pre_hubs = ssim_hubs(version_files, 'tl_ssim_hub')
+            versions = [(f.name, load_data(f, pre_hubs or DEFAULT_HUB), file_sha256(f)) for f in version_files]
+            st.sidebar.success(f"✅ {len(versions)}개 버전: " + " → ".join(name for name, _, _ in versions))
+
+            all_routes = sorted(set().union(*(v_df['ROUTE'].unique().tolist() for _, v_df, _ in versions)))
+            all_ops = sorted(set().union(*(v_df['OPS'].unique().tolist() for _, v_df, _ in versions)))
+            
+            st.sidebar.markdown("---")
+            hubs = select_hubs([v_df for _, v_df, _ in versions], 'tl_hub', pre_hubs)
+            st.sidebar.subheader("📌 노선 그룹 매칭")
+            
+            default_route_a = [all_routes[0]] if all_routes else None
+            if "미주노선" in all_routes:
+                default_route_a = ["미주노선"]
+            
+            routes_a = st.sidebar.multiselect("그룹 A 노선 선택", all_routes, default=default_route_a, key='tl_ra')
+            ops_a = st.sidebar.multiselect("그룹 A 항공사 선택", all_ops, default=all_ops, key='tl_oa')
+            
+            st.sidebar.markdown("⬇️ ⬆️")
+            
+            default_route_b = [all_routes[1]] if len(all_routes) > 1 else all_routes
+            if "동남아노선" in all_routes and "미주노선" in all_routes:
+                default_route_b = ["동남아노선"]
+
+            routes_b = st.sidebar.multiselect("그룹 B 노선 선택", all_routes, default=default_route_b, key='tl_rb')
+            ops_b = st.sidebar.multiselect("그룹 B 항공사 선택", all_ops, default=all_ops, key='tl_ob')
+            
+            st.sidebar.markdown("---")
+            min_mct = st.sidebar.number_input("Min CT (분)", 0, 300, 60, 5, key='tl_min')
+            max_ct = st.sidebar.number_input("Max CT (분)", 60, 2880, 300, 60, key='tl_max')
+            mct_rules, rules_hash = mct_rules_input('tl_mct_file')
+            
+            if st.button("🗓️ 타임라인 분석 시작", type="primary"):
+                if not routes_a or not routes_b:
+                    st.error("그룹 노선을 선택해주세요.")
+                elif not hubs:
+                    st.error("허브 공항을 선택해주세요.")
+                else:
+                    # 분석 조건별 타임라인 (버전별 쌍 테이블 캐시) 을 세션에 보관: 버전을 추가하면 마지막 단계만 계산
+                    timelines = st.session_state.setdefault('timelines', {})
+                    timeline_key = (min_mct, max_ct, selection_key(routes_a, ops_a, routes_b, ops_b), tuple(sorted(hubs)),
+                                    rules_hash)
+                    timeline = timelines.setdefault(
+                        timeline_key, ScheduleTimeline(min_mct, max_ct, routes_a, ops_a, routes_b, ops_b,
+                                                       hub=hubs, mct_rules=mct_rules))
+                    with st.spinner(f"{len(versions) - 1}개 단계 비교 중..."):
+                        st.session_state['timeline_result'] = timeline.compare(versions)
+                    st.session_state['timeline_result_key'] = (tuple((name, v_hash) for name, _, v_hash in versions),
+                                                               timeline_key)
+            
+            if 'timeline_result' in st.session_state:
+                timeline_result = st.session_state['timeline_result']
+                timeline_result_key = st.session_state['timeline_result_key']
+                summary = timeline_result['summary']
+                
+                st.markdown("#### 🗓️ 버전별 연결 변경 타임라인")
+                st.dataframe(summary, hide_index=True, use_container_width=True)
+                
+                chart_data = summary.melt(id_vars=['Step', 'Version_To'], value_vars=['Lost', 'New', 'Retimed'],
+                                          var_name='Change', value_name='Count')
+                chart = alt.Chart(chart_data).mark_bar().encode(
+                    x=alt.X('Version_To:N', title='버전', sort=summary['Version_To'].tolist()),
+                    y=alt.Y('Count:Q', title='건수'),
+                    color=alt.Color('Change:N', title='변경 유형', scale=alt.Scale(
+                        domain=['Lost', 'New', 'Retimed'], range=['#ff6b6b', '#51cf66', '#ffd43b']
+                    )),
+                    tooltip=['Version_To', 'Change', 'Count']
+                ).properties(height=300)
+                st.altair_chart(chart, use_container_width=True)
+                
+                st.markdown("#### 📋 단계별 변경 상세")
+                for row, step in zip(summary.itertuples(index=False), timeline_result['steps']):
+                    with st.expander(f"{row.Step}. {row.Version_From} → {row.Version_To} "
+                                     f"(사라짐 {row.Lost} / 새로 생김 {row.New} / 시간 변경 {row.Retimed})"):
+                        display_cols = ['Direction', 'From', 'Via', 'To', 
+                                        'Inbound_Flt_No', 'Outbound_Flt_No',
+                                        'Hub_Arr_Time', 'Hub_Dep_Time', 'Conn_Min', 'Change_Type']
+                        step_changes = pd.concat([step['lost_connections'], step['new_connections']], ignore_index=True)
+                        if not step_changes.empty:
+                            st.dataframe(step_changes[display_cols], hide_index=True, use_container_width=True)
+                        if not step['time_changes'].empty:
+                            st.dataframe(step['time_changes'], hide_index=True, use_container_width=True)
+                
+                export_download("연결 변경 (전체 단계)", lambda: frame_chunks(timeline_result['changes']), "timeline_changes",
+                                'export_timeline_changes', timeline_result_key)
+                export_download("시간 변경 (전체 단계)", lambda: frame_chunks(timeline_result['time_changes']), "timeline_time_changes",
+                                'export_timeline_time_changes', timeline_result_key)
+
+        except Exception as e:
+            st.error(f"오류가 발생했습니다: {e}")
+    else:
+        if 'timeline_result' in st.session_state:
+            del st.session_state['timeline_result']
+        st.info("👈 비교할 스케줄 버전 파일을 2개 이상 업로드하세요.")
+
+# ==================== MCT 민감도 분석 모드 ====================
+elif analysis_mode == "MCT 민감도 분석":
+    st.sidebar.header("⚙️ 민감도 분석 설정")
+    uploaded_file = st.sidebar.file_uploader("📂 데이터 파일 (CSV/SSIM/XLSX)", type=SCHEDULE_FILE_TYPES, key="sweep_file")
+
+    if uploaded_file is not None:
+        try:
+            pre_hubs = ssim_hubs([uploaded_file], 'sw_ssim_hub')
+            df = load_data(uploaded_file, pre_hubs or DEFAULT_HUB)
+            st.sidebar.success(f"✅ 파일 로드: {len(df)}건")
+            
+            all_routes = sorted(df['ROUTE'].unique().tolist())
+            all_ops = sorted(df['OPS'].unique().tolist())
+            
+            st.sidebar.markdown("---")
+            hubs = select_hubs([df], 'sw_hub', pre_hubs)
+            st.sidebar.subheader("📌 시나리오 (그룹 A ↔ 노선별 그룹 B)")
+            
+            default_route_a = [all_routes[0]] if all_routes else None
+            if "미주노선" in all_routes:
+                default_route_a = ["미주노선"]
+            
+            routes_a = st.sidebar.multiselect("그룹 A 노선 선택", all_routes, default=default_route_a, key='sw_ra')
+            ops_a = st.sidebar.multiselect("그룹 A 항공사 선택", all_ops, default=all_ops, key='sw_oa')
+            scenario_routes = st.sidebar.multiselect("그룹 B 시나리오 노선 (노선별 1개 시나리오)", all_routes,
+                                                     default=[r for r in all_routes if r not in (routes_a or [])], key='sw_rb')
+            ops_b = st.sidebar.multiselect("그룹 B 항공사 선택", all_ops, default=all_ops, key='sw_ob')
+            
+            st.sidebar.markdown("---")
+            min_range = st.sidebar.slider("Min CT 범위 (분)", 0, 300, (30, 120), 5, key='sw_min')
+            min_step = st.sidebar.number_input("Min CT 간격 (분)", 5, 60, 15, 5, key='sw_min_step')
+            max_range = st.sidebar.slider("Max CT 범위 (분)", 60, 2880, (240, 480), 60, key='sw_max')
+            max_step = st.sidebar.number_input("Max CT 간격 (분)", 30, 1440, 60, 30, key='sw_max_step')
+            
+            if st.button("📈 민감도 분석 시작", type="primary"):
+                if not routes_a or not scenario_routes:
+                    st.error("그룹 A 노선과 시나리오 노선을 선택해주세요.")
+                elif not hubs:
+                    st.error("허브 공항을 선택해주세요.")
+                else:
+                    ct_grid = [(min_ct, max_ct)
+                               for min_ct in ct_range(*min_range, min_step)
+                               for max_ct in ct_range(*max_range, max_step)]
+                    scenarios = [
+                        {'name': f"{', '.join(routes_a)} ↔ {route_b}",
+                         'routes_a': routes_a, 'ops_a': ops_a, 'routes_b': [route_b], 'ops_b': ops_b}
+                        for route_b in scenario_routes
+                    ]
+                    with st.spinner(f"{len(scenarios)}개 시나리오 x {len(ct_grid)}개 MCT 조합 분석 중..."):
+                        st.session_state['sweep_result'] = sweep_connections(df, scenarios, ct_grid, hub=hubs)
+                    st.session_state['sweep_key'] = (file_sha256(uploaded_file), tuple(sorted(hubs)), tuple(ct_grid),
+                                                     tuple((s['name'], tuple(s['ops_a']), tuple(s['ops_b'])) for s in scenarios))
+            
+            if 'sweep_result' in st.session_state:
+                sweep_df = st.session_state['sweep_result']
+                sweep_key = st.session_state['sweep_key']
+                if sweep_df.empty:
+                    st.warning("조건에 맞는 연결편이 없습니다.")
+                else:
+                    totals = sweep_df.groupby(['Scenario', 'Min_CT', 'Max_CT'], as_index=False)[['Connected', 'Total_Pairs']].sum()
+                    
+                    st.markdown("#### 📈 Min CT 별 Connected 추이")
+                    max_options = sorted(totals['Max_CT'].unique().tolist())
+                    selected_max = st.select_slider("Max CT (분)", options=max_options, value=max_options[0], key='sw_view_max')
+                    chart = alt.Chart(totals[totals['Max_CT'] == selected_max]).mark_line(point=True).encode(
+                        x=alt.X('Min_CT:Q', title='Min CT (분)'),
+                        y=alt.Y('Connected:Q', title='Connected 건수'),
+                        color=alt.Color('Scenario:N', title='시나리오', legend=alt.Legend(orient='bottom')),
+                        tooltip=['Scenario', 'Min_CT', 'Max_CT', 'Connected', 'Total_Pairs']
+                    ).properties(height=350).interactive()
+                    st.altair_chart(chart, use_container_width=True)
+                    
+                    st.markdown("#### 📋 시나리오별 상세 (방향 포함)")
+                    st.dataframe(sweep_df, use_container_width=True, hide_index=True)
+                    export_download("민감도 분석", lambda: frame_chunks(sweep_df), "mct_sweep",
+                                    'export_mct_sweep', sweep_key)
+
+        except Exception as e:
+            st.error(f"오류가 발생했습니다: {e}")
+    else:
+        if 'sweep_result' in st.session_state:
+            del st.session_state['sweep_result']
+        st.info("👈 파일을 업로드하고 Min/Max CT 범위와 시나리오를 선택하세요.")
\ No newline at end of file
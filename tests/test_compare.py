@@ -0,0 +1,102 @@
+"""스케줄 비교: 변경 항공편만 재계산하는 경로 (schedule_delta) 와 전체 재계산 결과 비교"""
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from connection_counter import ScheduleTimeline, compare_schedules, find_pairs, load_data
+from connection_counter.compare import connection_hash, connection_key
+from connection_counter.loader import unify_categories
+
+ROUTES = ['미주노선', '동남아노선', '일본노선']
+OPS = ['KE', 'DL', 'OZ']
+AIRPORTS = ['JFK', 'LAX', 'BKK', 'NRT', 'SGN']
+ARGUMENTS = (60, 2880, ROUTES, OPS, ROUTES, OPS)
+
+
+def weekly_schedule(n_flights, seed):
+    """요일 (DOW) 이 있는 주간 스케줄. 한 쌍이 여러 요일에 서로 다른 연결시간으로 나와 같은 연결 키가 여러 행이 됨"""
+    rng = np.random.default_rng(seed)
+
+    def clock():
+        minute = int(rng.integers(0, 96)) * 15
+        return f'{minute // 60:02d}:{minute % 60:02d}'
+
+    def days():
+        return ''.join(str(day + 1) if rng.random() < 0.5 else '.' for day in range(7))
+
+    rows = [{'FLT NO': f'{no:03d}', 'ORGN': AIRPORTS[no % 5], 'DEST': 'ICN', 'STD': '00:00', 'STA': clock(),
+             'OPS': OPS[no % 3], '구분': 'To ICN', 'ROUTE': ROUTES[no % 3], 'DOW': days()}
+            for no in range(n_flights)]
+    rows += [{'FLT NO': f'{500 + no:03d}', 'ORGN': 'ICN', 'DEST': AIRPORTS[(no + 2) % 5], 'STD': clock(), 'STA': '00:00',
+              'OPS': OPS[(no + 1) % 3], '구분': 'From ICN', 'ROUTE': ROUTES[(no + 1) % 3], 'DOW': days()}
+             for no in range(n_flights)]
+    return pd.DataFrame(rows)
+
+
+def edited_schedule(raw, seed):
+    """시간 변경 + 신규 편 추가 + 행 순서 섞기 (스케줄2 가 더 길고 행 위치가 스케줄1 과 다름)"""
+    edited = raw.copy()
+    edited.loc[:5, 'STA'] = '05:05'
+    added = raw.head(30).assign(**{'FLT NO': '777'})
+    return pd.concat([added, edited], ignore_index=True).sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def loaded(raw):
+    buffer = io.BytesIO()
+    raw.to_csv(buffer, index=False)
+    return load_data(buffer.getvalue())
+
+
+def full_recompute(df1, df2):
+    """두 스케줄을 모두 분석한 연결 집합 (lost, new) 과 시간 변경 (키, 스케줄1 연결시간, 스케줄2 연결시간) 목록"""
+    df1, df2 = unify_categories(df1, df2)
+    tables = []
+    for df, suffix in [(df1, 1), (df2, 2)]:
+        pairs = find_pairs(df, *ARGUMENTS, engine='window')
+        tables.append(pd.DataFrame({
+            'Connection_Hash': connection_hash(df, pairs),
+            'Connection_Key': connection_key(df, pairs).to_numpy(),
+            f'Conn_Min_{suffix}': pairs['Conn_Min'].to_numpy(),
+        }))
+    keys1, keys2 = set(tables[0]['Connection_Key']), set(tables[1]['Connection_Key'])
+    merged = tables[0].merge(tables[1], on=['Connection_Hash', 'Connection_Key'])
+    merged = merged[merged['Conn_Min_1'] != merged['Conn_Min_2']]
+    return keys1 - keys2, keys2 - keys1, sorted(zip(merged['Connection_Key'], merged['Conn_Min_1'], merged['Conn_Min_2']))
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_delta_compare_matches_full_recompute_on_weekly_schedule(seed):
+    raw = weekly_schedule(60, seed)
+    df1, df2 = loaded(raw), loaded(edited_schedule(raw, seed))
+    assert len(df2) > len(df1)
+
+    result = compare_schedules(df1, df2, *ARGUMENTS)
+    lost, new, time_changes = full_recompute(df1, df2)
+
+    assert set(result['lost_connections']['Connection_Key']) == lost
+    assert set(result['new_connections']['Connection_Key']) == new
+    changes = result['time_changes']
+    assert sorted(zip(changes['Connection_Key'], changes['Conn_Min_1'], changes['Conn_Min_2'])) == time_changes
+    assert result['stats']['time_changed'] == len(time_changes)
+
+
+@pytest.mark.parametrize('kinds', ['weekly daily daily daily', 'daily daily weekly'])
+def test_timeline_mixes_weekly_and_daily_versions(kinds):
+    """이전 비교의 pairs2 를 재사용하는 단계에서 주간/매일 운항 버전이 섞여도 주간 기준으로 비교"""
+    raw = weekly_schedule(40, 0)
+    versions = []
+    for no, kind in enumerate(kinds.split()):
+        schedule = edited_schedule(raw, no) if no else raw
+        if kind == 'daily':
+            schedule = schedule.drop(columns='DOW')
+        versions.append((f'{kind}{no}', loaded(schedule), f'hash{no}'))
+
+    result = ScheduleTimeline(*ARGUMENTS).compare(versions)
+
+    assert len(result['summary']) == len(versions) - 1
+    # 주간 버전이 나온 뒤의 마지막 비교는 주간 기준, 요일 마스크는 결측 없는 정수로 유지
+    assert 'Days' in result['steps'][-1]['pairs2'].columns
+    for step in result['steps']:
+        assert 'Days' not in step['pairs2'].columns or step['pairs2']['Days'].dtype == np.uint8
@@ -0,0 +1,166 @@
+"""벡터화 연결 엔진과 원래 구현 (cross join + iterrows) 의 결과 비교"""
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from connection_counter import analyze_connections_flexible, load_data
+
+ROUTES = ['미주노선', '동남아노선', '일본노선']
+OPS = ['KE', 'DL', 'OZ']
+AIRPORTS = ['JFK', 'LAX', 'BKK', 'NRT', 'SGN']
+INVALID_TIMES = ['xx', '12:00:00', '', None]
+
+
+def time_to_minutes(t_str):
+    try:
+        h, m = map(int, t_str.split(':'))
+        return h * 60 + m
+    except:
+        return None
+
+
+def reference_analyze(df, min_limit, max_limit,
+                      group_a_routes, group_a_ops,
+                      group_b_routes, group_b_ops):
+    """최초 버전 (networkconalver*.py) 의 analyze_connections_flexible"""
+    results = []
+
+    def analyze_one_direction(start_routes, start_ops, end_routes, end_ops, direction_label):
+        inbound = df[
+            (df['ROUTE'].isin(start_routes)) &
+            (df['OPS'].isin(start_ops)) &
+            (df['구분'] == 'To ICN')
+        ].copy()
+
+        outbound = df[
+            (df['ROUTE'].isin(end_routes)) &
+            (df['OPS'].isin(end_ops)) &
+            (df['구분'] == 'From ICN')
+        ].copy()
+
+        if inbound.empty or outbound.empty:
+            return []
+
+        local_results = []
+        merged = pd.merge(inbound.assign(k=1), outbound.assign(k=1), on='k', suffixes=('_IN', '_OUT'))
+
+        for _, row in merged.iterrows():
+            arr = time_to_minutes(row['STA_IN'])
+            dep = time_to_minutes(row['STD_OUT'])
+
+            if arr is not None and dep is not None:
+                diff = dep - arr
+                if diff < 0: diff += 1440
+                status = 'Connected' if min_limit <= diff <= max_limit else 'Disconnect'
+
+                flt_in = f"{row['OPS_IN']}{row['FLT NO_IN']}"
+                flt_out = f"{row['OPS_OUT']}{row['FLT NO_OUT']}"
+
+                local_results.append({
+                    'Direction': direction_label,
+                    'Inbound_Route': row['ROUTE_IN'],
+                    'Outbound_Route': row['ROUTE_OUT'],
+                    'Inbound_OPS': row['OPS_IN'], 'Outbound_OPS': row['OPS_OUT'],
+                    'Inbound_Flt_No': flt_in, 'Outbound_Flt_No': flt_out,
+                    'From': row['ORGN_IN'],
+                    'Via': 'ICN',
+                    'To': row['DEST_OUT'],
+                    'Inbound_Flight': f"[{flt_in}] {row['ORGN_IN']}->{row['DEST_IN']} (Arr {row['STA_IN']})",
+                    'Outbound_Flight': f"[{flt_out}] {row['ORGN_OUT']}->{row['DEST_OUT']} (Dep {row['STD_OUT']})",
+                    'Hub_Arr_Time': row['STA_IN'], 'Hub_Dep_Time': row['STD_OUT'],
+                    'Arr_Min': arr, 'Dep_Min': dep,
+                    'Arr_Hour': arr / 60.0,
+                    'Dep_Hour': dep / 60.0,
+                    'Conn_Min': diff, 'Status': status
+                })
+        return local_results
+
+    results.extend(analyze_one_direction(group_a_routes, group_a_ops, group_b_routes, group_b_ops, "Group A -> Group B"))
+
+    is_same_group = set(group_a_routes) == set(group_b_routes) and set(group_a_ops) == set(group_b_ops)
+    if not is_same_group:
+        results.extend(analyze_one_direction(group_b_routes, group_b_ops, group_a_routes, group_a_ops, "Group B -> Group A"))
+
+    cols = ['Direction', 'Inbound_Route', 'Outbound_Route', 'Inbound_OPS', 'Outbound_OPS', 'Inbound_Flt_No', 'Outbound_Flt_No', 'From', 'Via', 'To', 'Inbound_Flight', 'Outbound_Flight', 'Hub_Arr_Time', 'Hub_Dep_Time', 'Arr_Min', 'Dep_Min', 'Arr_Hour', 'Dep_Hour', 'Conn_Min', 'Status']
+    if not results: return pd.DataFrame(columns=cols)
+    return pd.DataFrame(results)[cols]
+
+
+def random_schedule(n_in, n_out, seed):
+    """15분 단위 시각 (MCT 경계값과 같은 연결시간이 나오도록), 자정 전후 편, 형식 오류 시간이 섞인 스케줄"""
+    rng = np.random.default_rng(seed)
+
+    def clock(minute):
+        return f'{minute // 60:02d}:{minute % 60:02d}'
+
+    # 절반은 자정 전후 (22:00 ~ 02:00) 에 몰아서 날짜를 넘는 연결이 충분히 나오게 함
+    def times(n):
+        minutes = np.where(rng.random(n) < 0.5, rng.integers(0, 96, n) * 15, (1320 + rng.integers(0, 16, n) * 15) % 1440)
+        return [clock(int(minute)) for minute in minutes]
+
+    rows = [{'SEASON': 'S26', 'FLT NO': f'{no:03d}', 'ORGN': AIRPORTS[no % 5], 'DEST': 'ICN', 'STD': '00:00',
+             'STA': sta, 'OPS': OPS[no % 3], '구분': 'To ICN', 'ROUTE': ROUTES[no % 3]}
+            for no, sta in enumerate(times(n_in))]
+    rows += [{'SEASON': 'S26', 'FLT NO': f'{500 + no:03d}', 'ORGN': 'ICN', 'DEST': AIRPORTS[(no + 2) % 5],
+              'STD': std, 'STA': '00:00', 'OPS': OPS[(no + 1) % 3], '구분': 'From ICN', 'ROUTE': ROUTES[(no + 1) % 3]}
+             for no, std in enumerate(times(n_out))]
+    for row in rng.choice(len(rows), 4, replace=False):
+        rows[row]['STA' if rows[row]['구분'] == 'To ICN' else 'STD'] = INVALID_TIMES[row % len(INVALID_TIMES)]
+    return pd.DataFrame(rows)
+
+
+def csv_bytes(raw):
+    buffer = io.BytesIO()
+    raw.to_csv(buffer, index=False)
+    return buffer.getvalue()
+
+
+def original_frame(raw):
+    """최초 버전 load_data 와 같이 CSV 를 읽고 문자열 컬럼만 정리한 DataFrame"""
+    df = pd.read_csv(io.BytesIO(csv_bytes(raw)))
+    for col in ['구분', 'FLT NO', 'ROUTE', 'OPS', 'ORGN', 'DEST']:
+        df[col] = df[col].astype(str).str.strip()
+    return df
+
+
+def loaded_frame(raw):
+    return load_data(csv_bytes(raw))
+
+
+def plain(frame):
+    """category/str 컬럼을 object 로 맞춘 비교용 사본"""
+    frame = frame.reset_index(drop=True)
+    return frame.astype({col: object for col in frame.columns if not pd.api.types.is_numeric_dtype(frame[col])})
+
+
+ARGUMENTS = [
+    (60, 300, ['미주노선'], OPS, ['동남아노선', '일본노선'], OPS),
+    (90, 90, ROUTES, OPS, ROUTES, OPS),
+    (0, 1439, ['미주노선', '일본노선'], ['KE'], ['미주노선', '일본노선'], ['KE']),
+    (60, 300, ['없음'], ['KE'], ['동남아노선'], ['KE']),
+]
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('args', ARGUMENTS)
+@pytest.mark.parametrize('engine', ['matrix', 'window'])
+def test_engine_matches_iterrows_implementation(seed, args, engine):
+    raw = random_schedule(40, 50, seed)
+    expected = reference_analyze(original_frame(raw), *args)
+    result = analyze_connections_flexible(loaded_frame(raw), *args, engine=engine)
+    if engine == 'window':
+        # MCT 구간 탐색은 Connected 쌍만 만듦
+        expected = expected[expected['Status'] == 'Connected']
+    sort = ['Direction', 'Inbound_Flt_No', 'Outbound_Flt_No']
+    pd.testing.assert_frame_equal(plain(result).sort_values(sort, kind='stable').reset_index(drop=True),
+                                  plain(expected).sort_values(sort, kind='stable').reset_index(drop=True),
+                                  check_dtype=False)
+
+
+def test_mct_edges_are_connected():
+    raw = random_schedule(40, 50, 0)
+    result = analyze_connections_flexible(loaded_frame(raw), 90, 90, ROUTES, OPS, ROUTES, OPS)
+    assert (result['Status'] == 'Connected').any()
+    assert (result.loc[result['Status'] == 'Connected', 'Conn_Min'] == 90).all()
@@ -0,0 +1,37 @@
+"""내보내기 임시 파일 관리 (ExportFiles)"""
+import gc
+import os
+
+import pandas as pd
+
+from connection_counter import ExportFiles, export_to_tempfile, frame_chunks
+
+
+def make_file(tmp_path):
+    return export_to_tempfile(frame_chunks(pd.DataFrame({'A': [1, 2]})), 'csv', directory=tmp_path)
+
+
+def test_current_reuses_file_for_same_tag_and_removes_stale_file(tmp_path):
+    files = ExportFiles()
+    path = files.put('pairs', ('csv', 'analysis-1'), make_file(tmp_path))
+    assert files.current('pairs', ('csv', 'analysis-1')) == path
+
+    assert files.current('pairs', ('csv', 'analysis-2')) is None
+    assert not os.path.exists(path)
+
+
+def test_put_replaces_previous_file(tmp_path):
+    files = ExportFiles()
+    first = files.put('pairs', ('csv', 1), make_file(tmp_path))
+    second = files.put('pairs', ('csv', 2), make_file(tmp_path))
+    assert not os.path.exists(first) and os.path.exists(second)
+    files.clear()
+    assert not os.path.exists(second)
+
+
+def test_files_are_removed_when_registry_is_collected(tmp_path):
+    files = ExportFiles()
+    paths = [files.put(key, ('csv', 1), make_file(tmp_path)) for key in ['a', 'b']]
+    del files
+    gc.collect()
+    assert not any(os.path.exists(path) for path in paths)
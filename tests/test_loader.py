@@ -0,0 +1,42 @@
+"""스케줄 로드: SSIM 허브 구간 읽기와 디스크 캐시 키"""
+from connection_counter import DiskCache, cached_load_data, is_ssim_file, load_data
+
+
+def ssim_record(ops, flt, orgn, std, dest, sta):
+    record = [' '] * 200
+
+    def put(text, start):
+        record[start - 1:start - 1 + len(text)] = text
+
+    put('3', 1); put(ops.ljust(3), 3); put(flt.rjust(4), 6); put('01', 12); put('J', 14)
+    put('29MAR26', 15); put('24OCT26', 22); put('1234567', 29)
+    put(orgn, 37); put(std, 40); put(std, 44); put('+0900', 48)
+    put(dest, 55); put(sta, 58); put(sta, 62); put('+0900', 66); put('77W', 73); put('000001', 195)
+    return ''.join(record).rstrip()
+
+
+def ssim_bytes():
+    """ICN, GMP, PUS 에 각각 도착/출발 구간이 하나씩 있는 SSIM"""
+    lines = ['1AIRLINE STANDARD SCHEDULE DATA SET'.ljust(200), '2LKE  ' + ' ' * 194]
+    for no, hub in enumerate(['ICN', 'GMP', 'PUS']):
+        lines.append(ssim_record('KE', str(10 + no), 'NRT', '0900', hub, '1100'))
+        lines.append(ssim_record('KE', str(20 + no), hub, '1300', 'LAX', '0800'))
+    lines.append('5 KE ' + ' ' * 195)
+    return ('\r\n'.join(lines) + '\r\n').encode('ascii')
+
+
+def test_ssim_reads_legs_of_every_selected_hub():
+    df = load_data(ssim_bytes(), ('GMP', 'ICN'))
+    assert sorted(df['구분'].astype(str)) == ['From GMP', 'From ICN', 'To GMP', 'To ICN']
+
+
+def test_disk_cache_key_includes_ssim_hubs(tmp_path):
+    cache = DiskCache(tmp_path)
+    raw = ssim_bytes()
+    assert is_ssim_file(raw)
+    icn, _ = cached_load_data(raw, cache, 'ICN')
+    pus, _ = cached_load_data(raw, cache, ('PUS',))
+    both, _ = cached_load_data(raw, cache, ('ICN', 'PUS'))
+    assert set(icn['구분'].astype(str)) == {'To ICN', 'From ICN'}
+    assert set(pus['구분'].astype(str)) == {'To PUS', 'From PUS'}
+    assert len(both) == 4